@@ -0,0 +1,31 @@
+# Benchmarks of response processing in ArgosPlatformInfo and ArgosProgramInfo
+
+import xml.etree.ElementTree as ET
+
+from argos import argosClient
+from argos import argosTesting
+from argos.argosMessage import PayloadCache
+
+
+def test_get_info(benchmark, platform_info, number_of_passes):
+    info = benchmark(platform_info.get_info, minimum_quality_flag=0)
+    assert len(info) == number_of_passes
+
+
+def test_select_best_payload(benchmark, response, number_of_passes):
+    # Without a payload cache, each round checks the CRCs again, instead of
+    # finding the results of the first round.
+    api = argosClient.ArgosPlatformInfo(service=lambda **kwds: response, payload_cache=PayloadCache(maxsize=0))
+    satellitePasses = ET.fromstring(response).find("program").find("platform").findall("satellitePass")
+    passes = [(sp.findall("message"), sp.find("bestMsgDate")) for sp in satellitePasses]
+    benchmark(lambda: [api._select_best_payload(m, d) for m, d in passes])
+
+
+def test_ArgosProgramInfo_info(benchmark, number_of_passes):
+    # number_of_passes is used as the number of platforms here.
+    platforms = [str(100000 + i) for i in range(number_of_passes)]
+    platform_list = argosTesting.synthetic_platform_list({"3932": platforms[::2], "4000": platforms[1::2]})
+    api = argosClient.ArgosProgramInfo(service=lambda **kwds: platform_list)
+    api.retrieve()
+    info_dict = benchmark(api._info)
+    assert sum(len(v) for v in info_dict.values()) == number_of_passes
@@ -0,0 +1,39 @@
+# Benchmarks of ArgosMessageDecoder
+
+import random
+
+import pytest
+
+from argos.argosMessage import ArgosMessageDecoder
+from argos import argosTesting
+
+
+@pytest.fixture(scope="module")
+def payloads():
+    rng = random.Random(0)
+    return [argosTesting.encode_payload(dict(present_time=1.7e9 + i, lat=rng.uniform(-9000, 9000),
+                                             lon=rng.uniform(-18000, 18000), U=0.1, V=-0.1),
+                                        valid_crc=rng.random() > 0.2)
+            for i in range(100000)]
+
+
+def test_parseHex(benchmark, payloads):
+    decoder = ArgosMessageDecoder()
+    benchmark(lambda: [decoder.parseHex(p) for p in payloads[:10000]])
+
+
+def test_decode_batch(benchmark, payloads):
+    decoder = ArgosMessageDecoder()
+    result = benchmark(decoder.decode_batch, payloads)
+    assert len(result) == len(payloads)
+
+
+def test_checksum_8bit(benchmark, payloads):
+    decoder = ArgosMessageDecoder()
+    benchmark(lambda: [decoder.checksum_8bit(p) for p in payloads[:10000]])
+
+
+def test_checksum_batch(benchmark, payloads):
+    decoder = ArgosMessageDecoder()
+    mask = benchmark(decoder.checksum_batch, payloads)
+    assert 0 < mask.sum() < len(payloads)
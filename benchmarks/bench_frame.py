@@ -0,0 +1,56 @@
+# Benchmarks of data frames of fixes
+#
+# test_get_frame builds the frame from column buffers filled while the
+# response is parsed; test_via_dicts is what analysts did before:
+# get_info(), flattened rows, then a frame from the rows. Besides the
+# time, extra_info["peak_bytes_per_fix"] reports the peak memory
+# allocated while making the frame, as measured by tracemalloc with the
+# payload cache disabled.
+
+import tracemalloc
+
+import pytest
+
+from argos import argosExport
+
+LIBRARIES = {"pandas": "pandas", "arrow": "pyarrow"}
+
+
+def via_dicts(platform_info, library):
+    fields = argosExport.gps_fields()
+    rows = [argosExport.flatten(info, fields, "260603")
+            for info in platform_info.get_info(minimum_quality_flag=0)]
+    if library == "arrow":
+        import pyarrow as pa
+        return pa.Table.from_pylist(rows)
+    import pandas as pd
+    return pd.DataFrame.from_records(rows)
+
+
+def measure_peak_bytes_per_fix(make_frame, number_of_passes):
+    make_frame()
+    tracemalloc.start()
+    try:
+        make_frame()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return peak/number_of_passes
+
+
+@pytest.mark.parametrize("library", LIBRARIES)
+def test_get_frame(benchmark, uncached_platform_info, number_of_passes, library):
+    pytest.importorskip(LIBRARIES[library])
+    make_frame = lambda: uncached_platform_info.get_frame(minimum_quality_flag=0, library=library)
+    frame = benchmark(make_frame)
+    assert len(frame) == number_of_passes
+    benchmark.extra_info["peak_bytes_per_fix"] = measure_peak_bytes_per_fix(make_frame, number_of_passes)
+
+
+@pytest.mark.parametrize("library", LIBRARIES)
+def test_via_dicts(benchmark, uncached_platform_info, number_of_passes, library):
+    pytest.importorskip(LIBRARIES[library])
+    make_frame = lambda: via_dicts(uncached_platform_info, library)
+    frame = benchmark(make_frame)
+    assert len(frame) == number_of_passes
+    benchmark.extra_info["peak_bytes_per_fix"] = measure_peak_bytes_per_fix(make_frame, number_of_passes)
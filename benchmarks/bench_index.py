@@ -0,0 +1,80 @@
+# Benchmarks of the time and spatial index of fixes
+#
+# The index holds 10 fixes per satellite pass of the parametrization
+# (up to a million), spread over NUMBER_OF_PLATFORMS platforms drifting
+# through the North Sea, one fix per hour each. Building is measured with
+# the fixes added in time order, and latest first, as responses list
+# them; both include the first queries, which sort what was added out of
+# order.
+
+import functools
+import random
+
+import pytest
+
+from argos.argosIndex import FixIndex
+
+NUMBER_OF_PLATFORMS = 100
+START = 1.7e9
+
+
+@functools.lru_cache(maxsize=1)
+def make_fixes(number_of_fixes):
+    rng = random.Random(0)
+    fixes = []
+    per_platform = number_of_fixes // NUMBER_OF_PLATFORMS
+    for p in range(NUMBER_OF_PLATFORMS):
+        lat, lon = rng.uniform(5300, 5800), rng.uniform(0, 800)
+        for i in range(per_platform):
+            lat += rng.uniform(-2, 2)
+            lon += rng.uniform(-2, 2)
+            fixes.append((str(100000 + p),
+                          dict(argos_location=None, gps_location=dict(present_time=START + 3600*i, lat=lat, lon=lon),
+                               gps_location_qf=3)))
+    return fixes
+
+
+def build_index(number_of_fixes, reverse=False):
+    fixes = make_fixes(number_of_fixes)
+    index = FixIndex(cell_size=0.5)
+    for platformId, info in (reversed(fixes) if reverse else fixes):
+        index.add(info, platformId)
+    return index
+
+
+def query_all(index):
+    for platformId in index.platforms():
+        index.latest(platformId)
+    index.within(-90., 90., -180., 180.)
+    return index
+
+
+@functools.lru_cache(maxsize=1)
+def built_index(number_of_fixes):
+    return query_all(build_index(number_of_fixes))
+
+
+@pytest.fixture
+def index(number_of_passes):
+    return built_index(10*number_of_passes)
+
+
+@pytest.mark.parametrize("reverse", [False, True], ids=["in_order", "latest_first"])
+def test_build(benchmark, number_of_passes, reverse):
+    if number_of_passes > 1000:
+        pytest.skip("building large indexes is measured once, by the fixture")
+    index = benchmark(lambda: query_all(build_index(10*number_of_passes, reverse)))
+    assert len(index) == 10*number_of_passes
+
+
+def test_between(benchmark, index, number_of_passes):
+    t0, t1 = START + 3600*10, START + 3600*(10 + 24*7)
+    fixes = benchmark(index.between, "100050", t0, t1)
+    assert len(fixes) <= 24*7
+
+
+def test_platforms_within(benchmark, index, number_of_passes):
+    per_platform = 10*number_of_passes // NUMBER_OF_PLATFORMS
+    t0 = START + 3600*max(per_platform - 24*7, 0)
+    platforms = benchmark(index.platforms_within, 54.0, 55.0, 3.0, 5.0, t0, None)
+    assert len(platforms) <= NUMBER_OF_PLATFORMS
@@ -0,0 +1,48 @@
+# Benchmarks of the selection of fields (projection pushdown)
+#
+# The offline service of conftest honours displayRawData and
+# displayLocation, so that the response shrinks with the selection as it
+# would from the webservice. Besides the time, extra_info reports the size
+# of the response and the memory held by the result per fix, as measured
+# by tracemalloc with the payload cache disabled.
+
+import tracemalloc
+
+import pytest
+
+SELECTIONS = {"all": None,
+              "lat_lon": ("lat", "lon"),
+              "lat_lon_qf": ("lat", "lon", "gps_location_qf"),
+              "argos_location": ("argos_location",)}
+
+
+def retrieve_latest(platform_info, fields):
+    platform_info.retrieve("260603", username="user", password="secret", fields=fields)
+    return platform_info.get_info(latest_only=True, minimum_quality_flag=0)
+
+
+def measure_bytes_per_fix(platform_info):
+    platform_info.get_info(minimum_quality_flag=0)
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        info = platform_info.get_info(minimum_quality_flag=0)
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return (after - before)/max(len(info), 1)
+
+
+@pytest.mark.parametrize("selection", SELECTIONS)
+def test_retrieve_latest(benchmark, uncached_platform_info, selection):
+    info = benchmark(retrieve_latest, uncached_platform_info, SELECTIONS[selection])
+    assert "gps_location" in info
+    benchmark.extra_info["response_bytes"] = len(uncached_platform_info.response)
+
+
+@pytest.mark.parametrize("selection", SELECTIONS)
+def test_get_info(benchmark, uncached_platform_info, number_of_passes, selection):
+    uncached_platform_info.retrieve("260603", username="user", password="secret", fields=SELECTIONS[selection])
+    info = benchmark(uncached_platform_info.get_info, minimum_quality_flag=0)
+    assert len(info) == number_of_passes
+    benchmark.extra_info["bytes_per_fix"] = measure_bytes_per_fix(uncached_platform_info)
@@ -0,0 +1,41 @@
+# Benchmarks of the output forms of ArgosPlatformInfo.get_info()
+#
+# Besides the time, the memory held by the result is reported per fix in
+# extra_info["bytes_per_fix"], as measured by tracemalloc. The payload
+# cache is disabled for the measurement, so that only the result counts.
+
+import tracemalloc
+
+import pytest
+
+from argos.argosMessage import PayloadCache
+
+OUTPUTS = ["dict", "records", "columns"]
+
+
+def measure_bytes_per_fix(platform_info, output):
+    payload_cache, platform_info.payload_cache = platform_info.payload_cache, PayloadCache(maxsize=0)
+    # A first call takes care of lazy imports and one-off allocations.
+    platform_info.get_info(minimum_quality_flag=0, output=output)
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        info = platform_info.get_info(minimum_quality_flag=0, output=output)
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+        platform_info.payload_cache = payload_cache
+    return (after - before)/len(info)
+
+
+@pytest.mark.parametrize("output", OUTPUTS)
+def test_get_info_output(benchmark, platform_info, number_of_passes, output):
+    info = benchmark(platform_info.get_info, minimum_quality_flag=0, output=output)
+    assert len(info) == number_of_passes
+    benchmark.extra_info["bytes_per_fix"] = measure_bytes_per_fix(platform_info, output)
+
+
+def test_to_dicts(benchmark, platform_info, number_of_passes):
+    columns = platform_info.get_info(minimum_quality_flag=0, output="columns")
+    info = benchmark(columns.to_dicts)
+    assert len(info) == number_of_passes
@@ -0,0 +1,47 @@
+# End-to-end benchmarks against the local stand-in of the webservice
+#
+# The stand-in answers each request after LATENCY seconds, so that the
+# throughput of sequential and concurrent retrieval can be compared.
+
+import pytest
+
+from argos import argosClient
+from argos import argosTesting
+
+LATENCY = 0.05
+NUMBER_OF_PLATFORMS = 16
+
+
+@pytest.fixture(scope="module")
+def standin():
+    responses = dict((str(260000 + i), argosTesting.synthetic_response(str(260000 + i), 50, seed=i))
+                     for i in range(NUMBER_OF_PLATFORMS))
+    with argosTesting.SoapStandin(responses=responses, latency=LATENCY) as standin:
+        yield standin
+
+
+def test_retrieve(benchmark, standin):
+    api = argosClient.ArgosPlatformInfo(wsdl=standin.wsdl_url)
+    def retrieve():
+        api.retrieve("260000", username="user", password="secret")
+        return api.get_info()
+    info = benchmark(retrieve)
+    assert info
+
+
+@pytest.mark.parametrize("max_workers", [1, 4, 16])
+def test_retrieve_many(benchmark, standin, max_workers):
+    fleet = argosClient.ArgosFleetClient(wsdl=standin.wsdl_url, max_workers=max_workers)
+    platform_ids = list(standin.responses)
+    results = benchmark.pedantic(fleet.retrieve_many, args=(platform_ids, "user", "secret"),
+                                 rounds=3, iterations=1)
+    assert all(r.error is None for r in results.values())
+    if benchmark.stats is not None:
+        # There are no statistics when run with --benchmark-disable.
+        benchmark.extra_info["platforms_per_second"] = len(platform_ids)/benchmark.stats.stats.mean
+
+
+def test_ArgosProgramInfo_retrieve(benchmark, standin):
+    api = argosClient.ArgosProgramInfo(wsdl=standin.wsdl_url)
+    benchmark(api.retrieve, "user", "secret")
+    assert len(api.get_platforms("3932")) == NUMBER_OF_PLATFORMS
@@ -0,0 +1,63 @@
+# Benchmarks of the trajectory analytics
+#
+# The fleet consists of NUMBER_OF_PLATFORMS platforms, which share the
+# fixes of the synthetic response. test_python_loop is the per-fix loop
+# the trajectory module replaces, computing speeds and bearings only.
+
+import math
+
+import pytest
+
+from argos import argosMessage
+from argos import argosTrajectory
+from argos.argosClient import CRC
+
+NUMBER_OF_PLATFORMS = 10
+
+
+@pytest.fixture
+def columns(platform_info):
+    return platform_info.get_info(minimum_quality_flag=0, output="columns")
+
+
+@pytest.fixture
+def fleet(columns):
+    return dict((str(100000 + p), columns) for p in range(NUMBER_OF_PLATFORMS))
+
+
+def python_loop(fleet):
+    result = dict()
+    for platformId, columns in fleet.items():
+        fixes = sorted((f.gps_location for f in columns if f.gps_location_qf >= CRC),
+                       key=lambda r: r.present_time)
+        steps = []
+        for r0, r1 in zip(fixes[:-1], fixes[1:]):
+            lat0, lon0 = argosMessage.ddmm_to_degrees(r0.lat), argosMessage.ddmm_to_degrees(r0.lon)
+            lat1, lon1 = argosMessage.ddmm_to_degrees(r1.lat), argosMessage.ddmm_to_degrees(r1.lon)
+            phi0, phi1, dlambda = math.radians(lat0), math.radians(lat1), math.radians(lon1 - lon0)
+            a = math.sin((phi1 - phi0)/2)**2 + math.cos(phi0)*math.cos(phi1)*math.sin(dlambda/2)**2
+            d = 2*argosTrajectory.EARTH_RADIUS*math.asin(math.sqrt(min(a, 1.)))
+            dt = r1.present_time - r0.present_time
+            b = math.degrees(math.atan2(math.sin(dlambda)*math.cos(phi1),
+                                        math.cos(phi0)*math.sin(phi1)
+                                        - math.sin(phi0)*math.cos(phi1)*math.cos(dlambda))) % 360
+            steps.append((d/dt if dt > 0 else math.nan, b))
+        result[platformId] = steps
+    return result
+
+
+def test_analyse(benchmark, columns, number_of_passes):
+    trajectory = benchmark(argosTrajectory.analyse, columns, "260603")
+    assert 0 < len(trajectory) <= number_of_passes
+
+
+def test_analyse_fleet(benchmark, fleet, number_of_passes):
+    trajectory = benchmark(argosTrajectory.analyse_fleet, fleet)
+    assert 0 < len(trajectory) <= NUMBER_OF_PLATFORMS*number_of_passes
+
+
+def test_python_loop(benchmark, fleet, number_of_passes):
+    if number_of_passes > 10000:
+        pytest.skip("the loop is measured up to 10000 satellite passes")
+    result = benchmark(python_loop, fleet)
+    assert len(result) == NUMBER_OF_PLATFORMS
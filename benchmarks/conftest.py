@@ -0,0 +1,77 @@
+# Fixtures for the benchmark suite
+#
+# The benchmarks use pytest-benchmark and run offline: responses are
+# generated by argos.argosTesting, and the webservice is replaced by the
+# local SoapStandin server. Run them with
+#
+#     python -m pytest benchmarks
+#
+# The largest synthetic responses (100k satellite passes) take a while
+# to generate and process; use --max-passes to leave them out.
+
+import functools
+
+import pytest
+
+from argos import argosClient
+from argos import argosTesting
+from argos.argosMessage import PayloadCache
+
+PASSES = [10, 1000, 10000, 100000]
+
+
+def pytest_addoption(parser):
+    parser.addoption("--max-passes", type=int, default=max(PASSES),
+                     help="largest number of satellite passes of the synthetic responses")
+
+
+def pytest_generate_tests(metafunc):
+    if "number_of_passes" in metafunc.fixturenames:
+        max_passes = metafunc.config.getoption("--max-passes")
+        metafunc.parametrize("number_of_passes", [n for n in PASSES if n <= max_passes])
+
+
+@functools.lru_cache(maxsize=None)
+def synthetic_response(number_of_passes, platformId="260603", displayRawData=True, displayLocation=True):
+    return argosTesting.synthetic_response(platformId, number_of_passes, displayRawData=displayRawData,
+                                           displayLocation=displayLocation)
+
+
+class ArgosPlatformInfoOffline(argosClient.ArgosPlatformInfo):
+    # The offline service honours displayRawData and displayLocation, so
+    # that the response shrinks with a selection of fields as it would
+    # from the webservice.
+    def service_factory(self, wsdl):
+        return self._service
+
+    def _service(self, platformId=None, nbDaysFromNow=None, displayRawData=True, displayLocation=True, **kwds):
+        return synthetic_response(self.number_of_passes, platformId, displayRawData, displayLocation)
+
+
+@pytest.fixture
+def response(number_of_passes):
+    return synthetic_response(number_of_passes)
+
+
+@pytest.fixture
+def platform_info(number_of_passes):
+    api = ArgosPlatformInfoOffline()
+    api.number_of_passes = number_of_passes
+    api.retrieve("260603", username="user", password="secret")
+    return api
+
+
+@pytest.fixture
+def uncached_platform_info(platform_info):
+    # platform_info with the payload cache disabled, so that measurements
+    # count the decoding and the memory of the result only.
+    platform_info.payload_cache = PayloadCache(maxsize=0)
+    return platform_info
+
+
+@pytest.fixture(autouse=True)
+def wsdl_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(argosClient, "CACHE_PATH", str(tmp_path))
+    argosClient.clear_client_cache()
+    yield
+    argosClient.clear_client_cache()
@@ -0,0 +1,68 @@
+''' Import-time benchmark for the argos package
+
+Measures the cumulative import time of argos, argos.argosMessage and
+argos.argosClient with ``python -X importtime``, each in a fresh
+interpreter, and lists the heavy dependencies that got imported.
+
+Usage:
+
+    python benchmarks/importtime.py [--repeat N] [--max-ms MS]
+
+With --max-ms, the script exits with status 1 if the median import time
+of any module exceeds the given number of milliseconds, so that it can be
+used as a regression check.
+'''
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+MODULES = ["argos", "argos.argosMessage", "argos.argosClient"]
+HEAVY_DEPENDENCIES = ["zeep", "lxml", "requests", "arrow", "numpy"]
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+
+def import_time(module):
+    ''' Returns the cumulative import time in microseconds and the heavy dependencies imported '''
+    code = f"import {module}"
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([SRC, env.get("PYTHONPATH", "")])
+    p = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                       env=env, capture_output=True, text=True, check=True)
+    cumulative = None
+    imported = set()
+    for line in p.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cum, name = line.split("|")
+        name = name.strip()
+        if name in HEAVY_DEPENDENCIES:
+            imported.add(name)
+        if name == module:
+            cumulative = int(cum)
+    return cumulative, imported
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="number of measurements per module")
+    parser.add_argument("--max-ms", type=float, default=None, help="fail if an import takes longer")
+    args = parser.parse_args()
+    failed = False
+    print(f"{'module':<24s}{'median (ms)':>12s}{'min (ms)':>12s}  heavy dependencies")
+    for module in MODULES:
+        results = [import_time(module) for i in range(args.repeat)]
+        times = [t/1000 for t, _ in results]
+        imported = sorted(results[-1][1])
+        median = statistics.median(times)
+        print(f"{module:<24s}{median:12.1f}{min(times):12.1f}  {', '.join(imported) or '-'}")
+        if args.max_ms is not None and median > args.max_ms:
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,14 @@
 # mymodule/__init__.py
 
-try:
-    from setuptools_scm import get_version
-    __version__ = get_version()
-except ImportError:
-    __version__ = "0.0.0"
+def __getattr__(name):
+    # The version is determined on first access only, as setuptools_scm
+    # is slow to import.
+    if name == "__version__":
+        global __version__
+        try:
+            from setuptools_scm import get_version
+            __version__ = get_version()
+        except ImportError:
+            __version__ = "0.0.0"
+        return __version__
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,322 @@
+''' Archive of raw getXml responses
+
+Consecutive responses of a platform overlap, because each covers the
+last number of days. ArgosArchive therefore does not store responses as
+they are, but splits them into the satellitePass elements and the text
+between them. Each piece is stored once, compressed, under the SHA-256
+hash of its content; a response is stored as the list of hashes of its
+pieces. Satellite passes are indexed by platform and bestMsgDate. A
+satellite pass can change between responses, as messages received later
+are added to it; the index keeps the one of the latest response.
+
+This allows to
+
+- rebuild any archived response exactly (get_response());
+- read the unique satellite passes of a platform in time order, without
+  parsing any response (iter_passes(), replay_info()).
+
+Pieces are compressed with zstd if the zstandard package is available,
+and with gzip otherwise. The archive is an SQLite database.
+
+ArgosPlatformInfo archives each response it retrieves when given an
+archive:
+
+    archive = ArgosArchive("responses.sqlite")
+    api = ArgosPlatformInfo(credentials="argos_login.txt", archive=archive)
+'''
+
+import gzip
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+import xml.etree.ElementTree as ET
+
+from . import argosClient
+
+logger = logging.getLogger("Argos")
+
+_PASS_PATTERN = re.compile(r"(<satellitePass>.*?</satellitePass>)", re.DOTALL)
+_PLATFORM_PATTERN = re.compile(r"<platformId>(.*?)</platformId>")
+_BEST_MSG_DATE_PATTERN = re.compile(r"<bestMsgDate>(.*?)</bestMsgDate>")
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+class ArgosArchive(object):
+    ''' Content-addressed archive of getXml responses, backed by an SQLite database
+
+    Parameters
+    ----------
+    filename : string (optional) Default : ":memory:"
+        name of the database file. The default keeps the archive in memory.
+    compression : {"zstd", "gzip"} or None (optional) Default : None
+        compression of new pieces. If None, zstd is used if the zstandard
+        package is available, gzip otherwise. Pieces already stored are
+        read whatever their compression.
+    level : int or None (optional) Default : None
+        compression level. If None, the default of the compressor is used.
+
+    The archive can be shared by several threads.
+    '''
+    SCHEMA = ["""CREATE TABLE IF NOT EXISTS chunks (
+                     hash TEXT PRIMARY KEY,
+                     compression TEXT NOT NULL,
+                     size INTEGER NOT NULL,
+                     data BLOB NOT NULL)""",
+              """CREATE TABLE IF NOT EXISTS responses (
+                     id INTEGER PRIMARY KEY AUTOINCREMENT,
+                     platformId TEXT,
+                     retrieved REAL NOT NULL,
+                     nbDaysFromNow INTEGER,
+                     hash TEXT NOT NULL,
+                     size INTEGER NOT NULL,
+                     chunks TEXT NOT NULL)""",
+              """CREATE INDEX IF NOT EXISTS responses_platform ON responses (platformId, retrieved)""",
+              """CREATE TABLE IF NOT EXISTS passes (
+                     platformId TEXT NOT NULL,
+                     bestMsgDate TEXT NOT NULL,
+                     hash TEXT NOT NULL,
+                     retrieved REAL NOT NULL,
+                     PRIMARY KEY (platformId, bestMsgDate)) WITHOUT ROWID"""]
+
+    def __init__(self, filename=":memory:", compression=None, level=None):
+        self.filename = filename
+        if compression is None:
+            compression = "zstd" if _zstandard() else "gzip"
+        if compression not in ("zstd", "gzip"):
+            raise ValueError(f"Unknown compression {compression!r}.")
+        self.compression = compression
+        self.level = level
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(filename, check_same_thread=False)
+        with self.lock, self.connection:
+            for statement in self.SCHEMA:
+                self.connection.execute(statement)
+
+    def close(self):
+        ''' Closes the database '''
+        with self.lock:
+            self.connection.close()
+
+    def add_response(self, response, platformId=None, retrieved=None, number_of_days_from_now=None):
+        ''' Archives a response
+
+        Parameters
+        ----------
+        response : str
+            response of the getXml call
+        platformId : string or None (optional) Default : None
+            platform the response was requested for
+        retrieved : float or None (optional) Default : None
+            time of retrieval, in seconds since 1970-01-01. If None, the current time is used.
+        number_of_days_from_now : int or None (optional) Default : None
+            number of days the response covers
+
+        Returns
+        -------
+        int
+            identifier of the archived response
+        '''
+        retrieved = time.time() if retrieved is None else retrieved
+        pieces = _PASS_PATTERN.split(response)
+        hashes = []
+        chunks = dict()
+        passes = []
+        current_platform = platformId
+        for i, piece in enumerate(pieces):
+            data = piece.encode('utf-8')
+            digest = hashlib.sha256(data).hexdigest()
+            hashes.append(digest)
+            chunks[digest] = data
+            if i % 2:
+                date = _BEST_MSG_DATE_PATTERN.search(piece)
+                passes.append((current_platform, date.group(1) if date else "", digest, retrieved))
+            else:
+                platforms = _PLATFORM_PATTERN.findall(piece)
+                if platforms:
+                    current_platform = platforms[-1]
+        response_hash = hashlib.sha256(response.encode('utf-8')).hexdigest()
+        with self.lock, self.connection:
+            known = set()
+            digests = list(chunks)
+            for i in range(0, len(digests), 500):
+                batch = digests[i:i+500]
+                cursor = self.connection.execute(f"SELECT hash FROM chunks WHERE hash IN ({','.join('?'*len(batch))})",
+                                                 batch)
+                known.update(row[0] for row in cursor)
+            self.connection.executemany("INSERT INTO chunks VALUES (?, ?, ?, ?)",
+                                        [(digest, self.compression, len(data), self._compress(data))
+                                         for digest, data in chunks.items() if digest not in known])
+            # A satellite pass replaces the one archived from an earlier response.
+            self.connection.executemany("INSERT INTO passes VALUES (?, ?, ?, ?) "
+                                        "ON CONFLICT (platformId, bestMsgDate) DO UPDATE "
+                                        "SET hash=excluded.hash, retrieved=excluded.retrieved "
+                                        "WHERE excluded.retrieved>=passes.retrieved",
+                                        [p for p in passes if p[0] is not None])
+            cursor = self.connection.execute("INSERT INTO responses (platformId, retrieved, nbDaysFromNow, hash, size, chunks) "
+                                             "VALUES (?, ?, ?, ?, ?, ?)",
+                                             (platformId, retrieved, number_of_days_from_now, response_hash,
+                                              len(response), json.dumps(hashes)))
+            return cursor.lastrowid
+
+    def get_response(self, response_id):
+        ''' Rebuilds an archived response
+
+        Parameters
+        ----------
+        response_id : int
+            identifier returned by add_response() or responses()
+
+        Returns
+        -------
+        str
+            the response, exactly as archived
+        '''
+        with self.lock:
+            row = self.connection.execute("SELECT hash, chunks FROM responses WHERE id=?", (response_id,)).fetchone()
+            if row is None:
+                raise KeyError(response_id)
+            response_hash, hashes = row[0], json.loads(row[1])
+            pieces = self._get_chunks(set(hashes))
+        response = "".join(pieces[h] for h in hashes)
+        if hashlib.sha256(response.encode('utf-8')).hexdigest() != response_hash:
+            raise ValueError(f"Archived response {response_id} is corrupt.")
+        return response
+
+    def responses(self, platformId=None, start=None, end=None):
+        ''' Lists the archived responses
+
+        Parameters
+        ----------
+        platformId : string or None (optional) Default : None
+            if given, only responses for this platform are listed
+        start, end : float or None (optional) Default : None
+            if given, only responses retrieved at or after start, and
+            before end, are listed (seconds since 1970-01-01)
+
+        Returns
+        -------
+        list of (int, string, float, int)
+            identifier, platformId, time of retrieval and number of days
+            of each response, in order of retrieval
+        '''
+        conditions, parameters = self._conditions(platformId, "retrieved", start, end)
+        with self.lock:
+            cursor = self.connection.execute("SELECT id, platformId, retrieved, nbDaysFromNow FROM responses"
+                                             f"{conditions} ORDER BY retrieved, id", parameters)
+            return cursor.fetchall()
+
+    def iter_passes(self, platformId=None, start=None, end=None):
+        ''' Iterates over the unique satellite passes, in order of platform and time
+
+        Of the versions of a satellite pass, that of the latest response is read.
+
+        Parameters
+        ----------
+        platformId : string or None (optional) Default : None
+            if given, only satellite passes of this platform are read
+        start, end : string or None (optional) Default : None
+            if given, only satellite passes with a bestMsgDate at or after
+            start, and before end, are read (ISO 8601 strings, as in responses)
+
+        Yields
+        ------
+        (string, string, str)
+            platformId, bestMsgDate and the satellitePass element as text
+        '''
+        conditions, parameters = self._conditions(platformId, "bestMsgDate", start, end)
+        with self.lock:
+            rows = self.connection.execute("SELECT platformId, bestMsgDate, hash FROM passes"
+                                           f"{conditions} ORDER BY platformId, bestMsgDate",
+                                           parameters).fetchall()
+        for i in range(0, len(rows), 1000):
+            batch = rows[i:i+1000]
+            with self.lock:
+                pieces = self._get_chunks(set(h for _, _, h in batch))
+            for platformId, bestMsgDate, digest in batch:
+                yield platformId, bestMsgDate, pieces[digest]
+
+    def replay_info(self, platformId=None, start=None, end=None, minimum_quality_flag=argosClient.CRC):
+        ''' Decodes the unique satellite passes, in order of platform and time
+
+        See iter_passes() for the parameters. Satellite passes with a
+        quality flag lower than minimum_quality_flag are skipped.
+
+        Yields
+        ------
+        dict
+            platformId, bestMsgDate and the information ArgosPlatformInfo.get_info()
+            returns for the satellite pass
+        '''
+        from . import argosReprocess
+        parser = argosReprocess.ArgosResponseParser()
+        for platformId, bestMsgDate, text in self.iter_passes(platformId, start, end):
+            parser._set_platform(platformId)
+            argos_location, bestMsgDate, best_payload, quality_flag = parser._select_pass(ET.fromstring(text))
+            if quality_flag >= minimum_quality_flag:
+                info = parser._decode_pass(argos_location, best_payload, quality_flag)
+                yield dict(platformId=platformId, bestMsgDate=bestMsgDate, **info)
+
+    def stats(self):
+        ''' Returns the size of the archive
+
+        Returns
+        -------
+        dict
+            number of responses, unique chunks and satellite passes,
+            size of the archived responses, size of the unique chunks,
+            size stored after compression, and the ratio of the size of the
+            responses to the size stored.
+        '''
+        with self.lock:
+            n_responses, response_bytes = self.connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+            n_chunks, chunk_bytes, stored_bytes = self.connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(data)), 0) FROM chunks").fetchone()
+            n_passes = self.connection.execute("SELECT COUNT(*) FROM passes").fetchone()[0]
+        return dict(responses=n_responses, chunks=n_chunks, passes=n_passes,
+                    response_bytes=response_bytes, chunk_bytes=chunk_bytes, stored_bytes=stored_bytes,
+                    ratio=response_bytes/stored_bytes if stored_bytes else 0.)
+
+    def _conditions(self, platformId, column, start, end):
+        conditions, parameters = [], []
+        for condition, value in [("platformId=?", platformId), (f"{column}>=?", start), (f"{column}<?", end)]:
+            if value is not None:
+                conditions.append(condition)
+                parameters.append(value)
+        return (" WHERE " + " AND ".join(conditions) if conditions else ""), parameters
+
+    def _get_chunks(self, hashes):
+        # Returns the decompressed text of chunks by hash. Must be called with the lock held.
+        hashes = list(hashes)
+        pieces = dict()
+        for i in range(0, len(hashes), 500):
+            batch = hashes[i:i+500]
+            cursor = self.connection.execute("SELECT hash, compression, data FROM chunks "
+                                             f"WHERE hash IN ({','.join('?'*len(batch))})", batch)
+            for digest, compression, data in cursor:
+                pieces[digest] = self._decompress(compression, data).decode('utf-8')
+        return pieces
+
+    def _compress(self, data):
+        if self.compression == "zstd":
+            return _zstandard().ZstdCompressor(level=3 if self.level is None else self.level).compress(data)
+        return gzip.compress(data, compresslevel=9 if self.level is None else self.level, mtime=0)
+
+    def _decompress(self, compression, data):
+        if compression == "zstd":
+            zstandard = _zstandard()
+            if zstandard is None:
+                raise RuntimeError("The archive holds zstd compressed data. Install the zstandard package.")
+            return zstandard.ZstdDecompressor().decompress(data)
+        return gzip.decompress(data)
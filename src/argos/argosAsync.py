@@ -0,0 +1,373 @@
+''' asyncio clients of the Argos webservice
+
+AsyncArgosPlatformInfo, AsyncArgosProgramInfo and AsyncArgosFleetClient
+are the counterparts of the classes of argosClient for use in an event
+loop. The SOAP calls are made with the asynchronous transport of zeep,
+which requires httpx (pip install argos[async]). Parsing and decoding of
+the responses runs in a worker thread, so that it does not block the
+event loop. The results are the same as those of the synchronous classes.
+
+Example
+-------
+
+    async def main():
+        fleet = AsyncArgosFleetClient(credentials="argos_login.txt", max_workers=32)
+        try:
+            results = await fleet.retrieve_many(["260603", "27011"])
+        finally:
+            await close_async_clients()
+
+    asyncio.run(main())
+
+Loading the WSDL is a blocking operation in zeep. It is done once per
+webservice and event loop, in a worker thread.
+'''
+
+import asyncio
+import logging
+import time
+import weakref
+
+from . import argosClient
+from .argosClient import CRC, FleetResult
+
+logger = logging.getLogger("Argos")
+
+# Clients by event loop and wsdl url. httpx connections cannot be shared
+# between event loops.
+_async_clients = weakref.WeakKeyDictionary()
+
+
+async def get_async_client(wsdl, cache_timeout=None, timeout=None, operation_timeout=None, pool_maxsize=None):
+    ''' Returns an asynchronous zeep client for the given webservice
+
+    Clients are cached by event loop and wsdl url. Concurrent calls for
+    the same webservice wait for a single client to be created. See
+    argosClient.get_client() for the parameters.
+
+    Returns
+    -------
+    zeep.AsyncClient
+    '''
+    loop = asyncio.get_running_loop()
+    clients = _async_clients.setdefault(loop, dict())
+    task = clients.get(wsdl)
+    if task is None:
+        task = loop.create_task(asyncio.to_thread(_create_async_client, wsdl, cache_timeout, timeout,
+                                                  operation_timeout, pool_maxsize))
+        clients[wsdl] = task
+        def forget_failed(task):
+            if task.cancelled() or task.exception() is not None:
+                clients.pop(wsdl, None)
+        task.add_done_callback(forget_failed)
+    return await asyncio.shield(task)
+
+
+async def close_async_clients():
+    ''' Closes the connections of, and removes, the clients of the running event loop '''
+    clients = _async_clients.pop(asyncio.get_running_loop(), dict())
+    for task in clients.values():
+        if task.done() and not task.cancelled() and task.exception() is None:
+            transport = task.result().transport
+            await transport.aclose()
+            transport.wsdl_client.close()
+
+
+def async_transport_factory(cache_timeout=None, timeout=None, operation_timeout=None, pool_maxsize=None):
+    ''' Creates an asynchronous zeep transport with a persistent document cache and a connection pool
+
+    See argosClient.get_client() for the parameters.
+
+    Returns
+    -------
+    zeep.transports.AsyncTransport
+    '''
+    import httpx
+    import zeep.transports
+    pool_maxsize = pool_maxsize or argosClient.POOL_MAXSIZE
+    timeout = timeout or argosClient.TIMEOUT
+    operation_timeout = operation_timeout or argosClient.OPERATION_TIMEOUT
+    limits = httpx.Limits(max_connections=pool_maxsize, max_keepalive_connections=pool_maxsize)
+    return zeep.transports.AsyncTransport(client=httpx.AsyncClient(limits=limits, timeout=operation_timeout),
+                                          wsdl_client=httpx.Client(timeout=timeout),
+                                          cache=argosClient.cache_factory(cache_timeout))
+
+
+def _create_async_client(wsdl, cache_timeout, timeout, operation_timeout, pool_maxsize):
+    import zeep
+    transport = async_transport_factory(cache_timeout, timeout, operation_timeout, pool_maxsize)
+    return zeep.AsyncClient(wsdl=wsdl, transport=transport)
+
+
+class AsyncArgosProgramInfo(argosClient.ArgosProgramInfo):
+    ''' Class to retrieve information on argos programmes, for use with asyncio.
+
+    Parameters are as for argosClient.ArgosProgramInfo, except that
+    service, if given, must be a coroutine function. resilience, if
+    given, calls the service through an argosResilience.AsyncResilientService.
+    retrieve() and fetch() are coroutines; the other methods are those
+    of ArgosProgramInfo.
+    '''
+
+    def service_factory(self, wsdl):
+        # The service is created by the first call to retrieve(), in the event loop.
+        self.wsdl = wsdl
+        return None
+
+    def _resilient(self, service):
+        # Returns the service, called under the resilience policy if there is one.
+        if self.resilience is None or service is None:
+            return service
+        return self.resilience.wrap_async(service, "getPlatformList")
+
+    async def retrieve(self, username=None, password=None):
+        ''' Retrieves all information from webservice for given username and password
+
+        Parameters
+        ----------
+        username : string or None
+            username
+        password : string or None
+            password
+
+        Returns
+        -------
+        None
+        '''
+        s = await self.fetch(username, password)
+        await asyncio.to_thread(self.load, s)
+
+    async def fetch(self, username=None, password=None):
+        ''' Calls getPlatformList, without processing the response
+
+        See argosClient.ArgosProgramInfo.fetch().
+
+        Returns
+        -------
+        str
+            response of the webservice, which can be passed to load()
+        '''
+        username = username or self.username
+        password = password or self.password
+        if self.service is None:
+            client = await get_async_client(self.wsdl)
+            self.service = self._resilient(client.service.getPlatformList)
+        t0 = time.perf_counter()
+        s = await self.service(username=username, password=password)
+        if self.metrics is not None:
+            self.metrics.timing("program_info.soap", time.perf_counter() - t0)
+        return s
+
+
+class AsyncArgosPlatformInfo(argosClient.ArgosPlatformInfo):
+    ''' Class to retrieve Argos platform information, for use with asyncio.
+
+    Parameters are as for argosClient.ArgosPlatformInfo, except that
+    service, if given, must be a coroutine function. resilience, if
+    given, calls the service through an argosResilience.AsyncResilientService.
+    retrieve(), get_info(), get_frame(), retrieve_info() and poll() are
+    coroutines. get_info() and get_frame() parse and decode the response
+    in a worker thread. iter_info() is not a coroutine, and runs in the
+    calling thread.
+    '''
+
+    def service_factory(self, wsdl):
+        # The service is created by the first call to retrieve(), in the event loop.
+        self.wsdl = wsdl
+        return None
+
+    def _resilient(self, service):
+        # Returns the service, called under the resilience policy if there is one.
+        if self.resilience is None or service is None:
+            return service
+        return self.resilience.wrap_async(service, "getXml")
+
+    async def retrieve(self, platformId, username=None, password=None, number_of_days_from_now=1, fields=None):
+        ''' Retrieves all information from webservice for given username and password
+
+        Parameters
+        ----------
+        platformId : string
+            platform identifier
+        username : string
+            username
+        password : string
+            password
+        number_of_days_from_now : int (optional) Default : 1
+            the number of days in the past for which data is to be retrieved. Maximum value is 20.
+        fields : iterable of string or None (optional) Default : None
+            fields needed, see argosClient.ArgosPlatformInfo.retrieve()
+
+        Returns
+        -------
+        None
+        '''
+        username = username or self.username
+        password = password or self.password
+        if username is None or password is None:
+            raise ValueError('No credentials are supplied. Cannot continue.')
+        if self.service is None:
+            client = await get_async_client(self.wsdl)
+            self.service = self._resilient(client.service.getXml)
+        self.platformId=platformId
+        self.decoder = self.decoder_factory(platformId)
+        self.fields = self._check_fields(fields)
+        displayRawData, displayLocation = self._display_flags(self.fields)
+        t0 = time.perf_counter()
+        async def fetch():
+            s = await self.service(username=username, password=password, platformId=platformId, displayRawData=displayRawData, displayLocation=displayLocation, nbDaysFromNow=number_of_days_from_now)
+            if self.archive is not None:
+                await asyncio.to_thread(self._archive_response, s, platformId, number_of_days_from_now)
+            return s
+        if self.response_cache is None:
+            s = await fetch()
+        else:
+            key = self.response_cache.key(username, password, platformId, number_of_days_from_now, displayRawData, displayLocation)
+            s = await self.response_cache.aget(key, fetch)
+        self._set_response(s, time.perf_counter() - t0)
+
+    async def get_info(self, latest_only=False, minimum_quality_flag=CRC, output="dict", fields=None):
+        ''' Selects information for specific satellite pass.
+
+        See argosClient.ArgosPlatformInfo.get_info().
+
+        Returns
+        -------
+        dict or list of dict
+           dictionary with payload information
+        '''
+        return await asyncio.to_thread(super().get_info, latest_only, minimum_quality_flag, output, fields)
+
+    async def retrieve_info(self, platformId, username=None, password=None, number_of_days_from_now=1,
+                            latest_only=False, minimum_quality_flag=CRC, output="dict", fields=None):
+        ''' Retrieves and returns the information of a platform
+
+        Combines retrieve() and get_info(), for use with asyncio.gather().
+
+        Returns
+        -------
+        dict or list of dict
+           dictionary with payload information
+        '''
+        await self.retrieve(platformId, username, password, number_of_days_from_now, fields)
+        return await self.get_info(latest_only, minimum_quality_flag, output)
+
+    async def get_frame(self, latest_only=False, minimum_quality_flag=CRC, fields=None, library="pandas"):
+        ''' Returns the information of the satellite passes as a data frame
+
+        See argosClient.ArgosPlatformInfo.get_frame(). The frame is made in
+        a worker thread.
+        '''
+        return await asyncio.to_thread(super().get_frame, latest_only, minimum_quality_flag, fields, library)
+
+    async def poll(self, platformId, store, username=None, password=None, minimum_quality_flag=CRC):
+        ''' Retrieves the satellite passes that were not seen before
+
+        See argosClient.ArgosPlatformInfo.poll(). The store is read and
+        written, and the new satellite passes decoded, in a worker thread.
+
+        Returns
+        -------
+        list of dict
+           dictionaries with payload information of the new satellite passes, latest first.
+        '''
+        now = time.time()
+        last_poll = await asyncio.to_thread(store.last_poll, platformId)
+        await self.retrieve(platformId, username, password, self._days_to_poll(last_poll, now))
+        return await asyncio.to_thread(self._store_new_passes, platformId, store, minimum_quality_flag, now)
+
+
+class AsyncArgosFleetClient(argosClient.ArgosFleetClient):
+    ''' Class to retrieve Argos platform information for many platforms at once, for use with asyncio.
+
+    Parameters are as for argosClient.ArgosFleetClient. max_workers is the
+    maximum number of requests in flight, which is enforced with a
+    semaphore instead of a thread pool. resilience, if given, calls the
+    shared service through an argosResilience.AsyncResilientService.
+    retrieve_many() and retrieve_frame() are coroutines, and
+    retrieve_program() returns an awaitable.
+    '''
+
+    def service_factory(self, wsdl):
+        # The service is created by the first retrieval, in the event loop.
+        self.wsdl = wsdl
+        return None
+
+    def _resilient(self, service):
+        # Returns the service, called under the resilience policy if there is one.
+        if self.resilience is None or service is None:
+            return service
+        return self.resilience.wrap_async(service, "getXml")
+
+    def platform_info_factory(self):
+        ''' Creates an AsyncArgosPlatformInfo object using the shared service
+
+        Returns
+        -------
+        AsyncArgosPlatformInfo
+        '''
+        platform_info = AsyncArgosPlatformInfo(wsdl=self.wsdl, service=self.service, metrics=self.metrics,
+                                               response_cache=self.response_cache, archive=self.archive)
+        platform_info.username, platform_info.password = self.username, self.password
+        return platform_info
+
+    async def retrieve_many(self, platform_ids, username=None, password=None, number_of_days_from_now=1,
+                            max_workers=None, latest_only=False, minimum_quality_flag=CRC, output="dict",
+                            fields=None):
+        ''' Retrieves information for a number of platforms concurrently
+
+        See argosClient.ArgosFleetClient.retrieve_many(). max_workers is
+        the maximum number of requests in flight.
+
+        Returns
+        -------
+        dict
+           FleetResult for each platform identifier, in the order given.
+        '''
+        username = username or self.username
+        password = password or self.password
+        if username is None or password is None:
+            raise ValueError('No credentials are supplied. Cannot continue.')
+        if self.service is None:
+            client = await get_async_client(self.wsdl)
+            self.service = self._resilient(client.service.getXml)
+        platform_ids = list(dict.fromkeys(platform_ids))
+        semaphore = asyncio.Semaphore(max_workers or self.max_workers)
+        results = await asyncio.gather(*[self._retrieve_one(platformId, username, password,
+                                                            number_of_days_from_now, latest_only,
+                                                            minimum_quality_flag, output, fields, semaphore)
+                                         for platformId in platform_ids])
+        return dict((r.platformId, r) for r in results)
+
+    async def retrieve_frame(self, platform_ids, username=None, password=None, number_of_days_from_now=1,
+                             max_workers=None, latest_only=False, minimum_quality_flag=CRC, fields=None,
+                             library="pandas"):
+        ''' Retrieves information for a number of platforms as a single data frame
+
+        See argosClient.ArgosFleetClient.retrieve_frame(). The frame is made
+        in a worker thread.
+
+        Returns
+        -------
+        pandas.DataFrame or pyarrow.Table
+            one row per satellite pass, by platform in the order given and latest first
+        '''
+        from . import argosFrame
+        if library not in argosFrame.LIBRARIES:
+            raise ValueError(f"Unknown library {library!r}. Choose from {argosFrame.LIBRARIES}.")
+        results = await self.retrieve_many(platform_ids, username, password, number_of_days_from_now, max_workers,
+                                           latest_only, minimum_quality_flag, "columns", fields)
+        return await asyncio.to_thread(argosFrame.fleet_frame, results, library)
+
+    async def _retrieve_one(self, platformId, username, password, number_of_days_from_now,
+                            latest_only, minimum_quality_flag, output, fields, semaphore):
+        try:
+            platform_info = self.platform_info_factory()
+            async with semaphore:
+                await platform_info.retrieve(platformId, username, password, number_of_days_from_now, fields)
+            info = await platform_info.get_info(latest_only=latest_only,
+                                                minimum_quality_flag=minimum_quality_flag, output=output)
+        except Exception as e:
+            logger.error(f"Failed to retrieve information for platform {platformId}: {e!r}")
+            return FleetResult(platformId, None, e)
+        return FleetResult(platformId, info, None)
@@ -0,0 +1,284 @@
+''' Coalescing of identical requests and caching of responses
+
+A ResponseCache passed to ArgosPlatformInfo (or ArgosFleetClient) as
+response_cache makes identical getXml requests share their responses:
+
+- requests made while an identical request is in flight wait for its
+  response, instead of calling the webservice themselves;
+- responses are kept for a short time (ttl) in a size-bounded cache in
+  memory, and optionally in an SQLite database, so that processes on the
+  same host share them too.
+
+Requests are identical if username, password, platformId, nbDaysFromNow
+and the display flags are, so that a request with a wrong password is
+never answered from the cache. The key holds a salted hash of the
+username and password, not the password itself; the salt is kept in the
+database, if any, for other processes to share.
+'''
+
+import hashlib
+import hmac
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# Time in seconds responses are kept
+RESPONSE_TTL = 60
+
+
+class _Flight(object):
+    # A request in progress, which other requests can wait for. Threads
+    # wait for done; coroutines for a future of their event loop, in waiters.
+    def __init__(self):
+        self.done = threading.Event()
+        self.waiters = []
+        self.response = None
+        self.error = None
+
+
+def _wake(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class ResponseCache(object):
+    ''' Single-flight TTL cache of webservice responses
+
+    Parameters
+    ----------
+    ttl : float (optional) Default : RESPONSE_TTL
+        time in seconds a response is reused
+    maxsize : int (optional) Default : 256
+        maximum number of responses kept in memory
+    filename : string or None (optional) Default : None
+        SQLite database shared with other processes. If None, responses
+        are only cached in memory. The database holds the responses, and
+        should be readable by the user only.
+
+    The cache can be shared by several threads. See stats() for the
+    hit ratio and the number of calls to the webservice saved.
+    '''
+    SCHEMA = ["""CREATE TABLE IF NOT EXISTS responses (
+                     key TEXT PRIMARY KEY,
+                     created REAL NOT NULL,
+                     response TEXT NOT NULL)""",
+              """CREATE TABLE IF NOT EXISTS salt (
+                     value BLOB NOT NULL)"""]
+
+    def __init__(self, ttl=RESPONSE_TTL, maxsize=256, filename=None):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.filename = filename
+        self.hits = 0
+        self.disk_hits = 0
+        self.coalesced = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._flights = dict()
+        self._lock = threading.Lock()
+        self.connection = None
+        self._salt = os.urandom(16)
+        if filename is not None:
+            self._disk_lock = threading.Lock()
+            self.connection = sqlite3.connect(filename, timeout=30, check_same_thread=False)
+            with self._disk_lock, self.connection:
+                for statement in self.SCHEMA:
+                    self.connection.execute(statement)
+                self.connection.execute("INSERT INTO salt SELECT ? WHERE NOT EXISTS (SELECT 1 FROM salt)",
+                                        (self._salt,))
+                self._salt = self.connection.execute("SELECT value FROM salt").fetchone()[0]
+
+    def close(self):
+        ''' Closes the database, if any '''
+        if self.connection is not None:
+            with self._disk_lock:
+                self.connection.close()
+
+    def key(self, username, password, platformId, number_of_days_from_now, displayRawData=True,
+            displayLocation=True):
+        ''' Returns the key of a getXml request
+
+        The credentials are represented by a salted hash of username and password.
+        '''
+        credentials = hmac.new(self._salt, json.dumps([username, password]).encode('utf-8'),
+                               hashlib.sha256).hexdigest()
+        return (credentials, platformId, number_of_days_from_now, displayRawData, displayLocation)
+
+    def get(self, key, fetch):
+        ''' Returns the cached response for a key, or the response of fetch()
+
+        Parameters
+        ----------
+        key : tuple
+            key of the request, see key()
+        fetch : callable
+            called without arguments to get the response from the webservice
+
+        Returns
+        -------
+        str
+            response
+
+        If fetch() raises an exception, it is raised in all requests
+        waiting for it, and nothing is cached.
+        '''
+        now = time.time()
+        flight, leader, response = self._join(key, now)
+        if flight is None:
+            return response
+        if not leader:
+            flight.done.wait()
+            return self._waited(flight)
+        try:
+            created, response = self._disk_get(key, now)
+            missed = response is None
+            if missed:
+                response = fetch()
+                created = time.time()
+                self._disk_put(key, created, response)
+            return self._land(key, flight, created, response, missed)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            self._leave(key, flight)
+
+    async def aget(self, key, fetch):
+        ''' Returns the cached response for a key, or the response of await fetch()
+
+        Coroutine version of get(), for use with asyncio. fetch is a
+        coroutine function. Requests in flight are shared with get().
+        Waiting for a request in flight does not take a thread; the
+        database, if any, is read and written in a worker thread.
+        '''
+        import asyncio
+        now = time.time()
+        flight, leader, response = self._join(key, now)
+        if flight is None:
+            return response
+        if not leader:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            with self._lock:
+                if flight.done.is_set():
+                    _wake(future)
+                else:
+                    flight.waiters.append((loop, future))
+            await future
+            return self._waited(flight)
+        try:
+            created = response = None
+            if self.connection is not None:
+                created, response = await asyncio.to_thread(self._disk_get, key, now)
+            missed = response is None
+            if missed:
+                response = await fetch()
+                created = time.time()
+                if self.connection is not None:
+                    await asyncio.to_thread(self._disk_put, key, created, response)
+            return self._land(key, flight, created, response, missed)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            self._leave(key, flight)
+
+    def clear(self):
+        ''' Removes all responses from memory and the database, and resets the counters '''
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.disk_hits = self.coalesced = self.misses = 0
+        if self.connection is not None:
+            with self._disk_lock, self.connection:
+                self.connection.execute("DELETE FROM responses")
+
+    def stats(self):
+        ''' Returns the counts of requests by outcome, the hit ratio and the round-trips saved
+
+        Returns
+        -------
+        dict
+            hits (in memory), disk_hits, coalesced (waited for an identical
+            request in flight), misses (called the webservice), hit_ratio and
+            saved_round_trips.
+        '''
+        with self._lock:
+            saved = self.hits + self.disk_hits + self.coalesced
+            total = saved + self.misses
+            return dict(hits=self.hits, disk_hits=self.disk_hits, coalesced=self.coalesced,
+                        misses=self.misses, hit_ratio=saved/total if total else 0.,
+                        saved_round_trips=saved)
+
+    def _join(self, key, now):
+        # Returns (None, False, response) for a response in memory, else
+        # the flight of the key, and whether this request leads it.
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return None, False, entry[1]
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.coalesced += 1
+        return flight, leader, None
+
+    @staticmethod
+    def _waited(flight):
+        # Returns the response of a flight waited for, or raises its error.
+        if flight.error is not None:
+            raise flight.error
+        return flight.response
+
+    def _land(self, key, flight, created, response, missed):
+        # Counts and keeps the response of a flight led by this request.
+        with self._lock:
+            if missed:
+                self.misses += 1
+            else:
+                self.disk_hits += 1
+        self._store(key, created + self.ttl, response)
+        flight.response = response
+        return response
+
+    def _leave(self, key, flight):
+        # Ends a flight, waking the requests waiting for it.
+        with self._lock:
+            del self._flights[key]
+            flight.done.set()
+            waiters, flight.waiters = flight.waiters, []
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, future)
+            except RuntimeError:
+                # The event loop of the waiter is closed.
+                pass
+
+    def _store(self, key, expires, response):
+        with self._lock:
+            self._entries[key] = (expires, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _disk_get(self, key, now):
+        if self.connection is None:
+            return None, None
+        with self._disk_lock:
+            row = self.connection.execute("SELECT created, response FROM responses WHERE key=? AND created>?",
+                                          (json.dumps(key), now - self.ttl)).fetchone()
+        return row or (None, None)
+
+    def _disk_put(self, key, created, response):
+        if self.connection is None:
+            return
+        with self._disk_lock, self.connection:
+            self.connection.execute("DELETE FROM responses WHERE created<=?", (created - self.ttl,))
+            self.connection.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?)",
+                                    (json.dumps(key), created, response))
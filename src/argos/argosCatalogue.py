@@ -0,0 +1,286 @@
+''' Cached catalogue of programs and platforms
+
+ArgosCatalogue keeps the information of the getPlatformList call in a
+file, so that processes do not need to call the webservice each time
+they start. Information older than a time to live is refreshed in a
+background thread, while the stored information continues to be served.
+Only when no information is available at all does a lookup wait for the
+webservice.
+
+If the response of the webservice has not changed since the last call,
+as determined by its hash, only the time of the last check is updated.
+
+Lookups use indexes built once per change of the information:
+
+    get_platforms()       platforms of a program, sorted
+    get_program()         program of a platform
+    find_platforms()      platforms with a given attribute value, sorted
+'''
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from . import argosClient
+
+logger = logging.getLogger("Argos")
+
+# Time in seconds the catalogue is used without checking for changes
+CATALOGUE_TTL = 3600
+# Time in seconds after which a failed refresh is retried, at most
+RETRY_INTERVAL = 60
+# Version of the file format
+FILE_VERSION = 1
+
+
+class _CatalogueIndex(object):
+    # Information of a getPlatformList response and the indexes built from it.
+    def __init__(self, info_dict):
+        self.info_dict = info_dict
+        self.platforms = dict()
+        self.program_of = dict()
+        self.attributes = dict()
+        for programNumber, platform_dict in info_dict.items():
+            self.platforms[programNumber] = tuple(sorted(platform_dict, key=lambda x : int(x)))
+            for platformId, attributes in platform_dict.items():
+                self.program_of[platformId] = programNumber
+                for item in attributes.items():
+                    self.attributes.setdefault(item, []).append(platformId)
+        for item, platforms in self.attributes.items():
+            self.attributes[item] = tuple(sorted(platforms, key=lambda x : int(x)))
+
+
+class ArgosCatalogue(object):
+    ''' Catalogue of programs and platforms, cached on disk
+
+    Parameters
+    ----------
+    program_info : argosClient.ArgosProgramInfo
+        client used to call getPlatformList
+    filename : string or None (optional) Default : None
+        file the catalogue is kept in. If None, a file in
+        argosClient.CACHE_PATH named after the webservice and the
+        username is used, see default_filename().
+    ttl : float (optional) Default : CATALOGUE_TTL
+        time in seconds after which the information is refreshed
+    username : string or None (optional) Default : None
+        username. If None, the username of program_info is used.
+    password : string or None (optional) Default : None
+        password. If None, the password of program_info is used.
+
+    The attributes fetches, unchanged and rebuilds count the calls to the
+    webservice, the calls that returned unchanged information, and the
+    times the indexes were rebuilt. The catalogue can be shared by
+    several threads.
+    '''
+    def __init__(self, program_info, filename=None, ttl=CATALOGUE_TTL, username=None, password=None):
+        self.program_info = program_info
+        self.ttl = ttl
+        self.username = username
+        self.filename = filename or self.default_filename(getattr(program_info, "wsdl", None),
+                                                          username or program_info.username)
+        self.password = password
+        self.fetches = 0
+        self.unchanged = 0
+        self.rebuilds = 0
+        self.checked = None
+        self._hash = None
+        self._index = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._thread = None
+        self._next_attempt = 0
+        self._read()
+
+    @staticmethod
+    def default_filename(wsdl, username):
+        ''' Returns the file of the catalogue of a webservice and username
+
+        Catalogues of different accounts or webservices are kept apart,
+        as the platforms they list differ.
+
+        Returns
+        -------
+        string
+            catalogue-<hash of wsdl and username>.json in argosClient.CACHE_PATH
+        '''
+        digest = hashlib.sha256(json.dumps([wsdl, username]).encode('utf-8')).hexdigest()
+        return os.path.join(argosClient.CACHE_PATH, f"catalogue-{digest[:16]}.json")
+
+    @property
+    def is_stale(self):
+        ''' True if no information is available, or it is older than ttl '''
+        return self.checked is None or time.time() - self.checked >= self.ttl
+
+    def refresh(self):
+        ''' Calls the webservice, and updates the catalogue and its file
+
+        Returns
+        -------
+        bool
+            True if the information changed
+        '''
+        with self._refresh_lock:
+            response = self.program_info.fetch(self.username, self.password)
+            now = time.time()
+            digest = hashlib.sha256(response.encode('utf-8')).hexdigest()
+            self.fetches += 1
+            changed = digest != self._hash
+            if changed:
+                self.program_info.load(response)
+                index = _CatalogueIndex(self.program_info.info_dict)
+                self.rebuilds += 1
+            else:
+                index = self._index
+                self.unchanged += 1
+            with self._lock:
+                self._index, self._hash, self.checked = index, digest, now
+            self._write()
+            return changed
+
+    def wait(self, timeout=None):
+        ''' Waits for a background refresh in progress to finish '''
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def get_programs(self):
+        ''' Gets list of program numbers
+
+        Returns
+        -------
+        list of string
+            program numbers
+        '''
+        return list(self._current().info_dict)
+
+    def get_platforms(self, programNumber):
+        ''' Gets list of platform IDs of a program, sorted
+
+        Parameters
+        ----------
+        programNumber : string
+            program number
+
+        Returns
+        -------
+        list of string
+            platform numbers
+        '''
+        return list(self._current().platforms[programNumber])
+
+    def get_program(self, platformId):
+        ''' Gets the program number of a platform
+
+        Parameters
+        ----------
+        platformId : string
+            platform identifier
+
+        Returns
+        -------
+        string or None
+            program number, or None if the platform is not known
+        '''
+        return self._current().program_of.get(platformId)
+
+    def get_platform_info(self, platformId):
+        ''' Gets the attributes of a platform
+
+        Parameters
+        ----------
+        platformId : string
+            platform identifier
+
+        Returns
+        -------
+        dict
+            attributes reported by getPlatformList, such as platformType
+        '''
+        index = self._current()
+        return dict(index.info_dict[index.program_of[platformId]][platformId])
+
+    def find_platforms(self, attribute, value):
+        ''' Gets the platforms with a given attribute value, sorted
+
+        Parameters
+        ----------
+        attribute : string
+            name of the attribute, for example platformType
+        value : string
+            value of the attribute, for example GLIDER
+
+        Returns
+        -------
+        list of string
+            platform numbers
+        '''
+        return list(self._current().attributes.get((attribute, value), ()))
+
+    def _current(self):
+        # Returns the index, refreshing the catalogue first if it is
+        # empty, or in the background if it is stale.
+        if self._index is None:
+            self.refresh()
+        elif self.is_stale:
+            self._refresh_in_background()
+        return self._index
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            if time.time() < self._next_attempt:
+                return
+            self._thread = threading.Thread(target=self._background_refresh, daemon=True)
+            self._thread.start()
+
+    def _background_refresh(self):
+        # Another process may have refreshed the file in the meantime.
+        self._read()
+        if not self.is_stale:
+            return
+        try:
+            self.refresh()
+        except Exception as e:
+            self._next_attempt = time.time() + min(self.ttl, RETRY_INTERVAL)
+            logger.warning(f"Failed to refresh the platform catalogue ({e!r}). Using stored information.")
+
+    def _read(self):
+        try:
+            with open(self.filename, 'r') as fp:
+                data = json.load(fp)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Cannot read platform catalogue {self.filename} ({e}).")
+            return
+        if data.get('version') != FILE_VERSION or (self.checked or 0) >= data['checked']:
+            return
+        index = self._index if data['hash'] == self._hash else _CatalogueIndex(data['info_dict'])
+        with self._lock:
+            self._index, self._hash, self.checked = index, data['hash'], data['checked']
+
+    def _write(self):
+        # Writes to a temporary file first, so that other processes never
+        # read an incomplete file.
+        data = dict(version=FILE_VERSION, checked=self.checked, hash=self._hash,
+                    info_dict=self._index.info_dict)
+        directory = os.path.dirname(os.path.abspath(self.filename))
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        except OSError as e:
+            logger.warning(f"Cannot write platform catalogue {self.filename} ({e}).")
+            return
+        try:
+            with os.fdopen(fd, 'w') as fp:
+                json.dump(data, fp)
+            os.replace(tmp, self.filename)
+        except OSError as e:
+            logger.warning(f"Cannot write platform catalogue {self.filename} ({e}).")
+            os.remove(tmp)
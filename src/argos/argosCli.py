@@ -0,0 +1,169 @@
+''' Command line interface of the argos package
+
+The entry point is installed as the console script ``argos``. Run
+``argos --help`` for the available subcommands.
+'''
+
+import argparse
+import logging
+import signal
+import sys
+
+from . import argosClient
+
+logger = logging.getLogger("Argos")
+
+
+def daemon(args):
+    from . import argosDaemon
+    from . import argosStore
+    fleet = argosClient.ArgosFleetClient(wsdl=args.wsdl, credentials=args.credentials)
+    platform_ids = list(args.platform or [])
+    if args.program:
+        from . import argosCatalogue
+        program_info = argosClient.ArgosProgramInfo(wsdl=args.wsdl, credentials=args.credentials)
+        catalogue = argosCatalogue.ArgosCatalogue(program_info, ttl=args.catalogue_ttl)
+        for programNumber in args.program:
+            platform_ids += catalogue.get_platforms(programNumber)
+    if not platform_ids:
+        raise SystemExit("No platforms to poll. Use --platform and/or --program.")
+    store = argosStore.ArgosPassStore(args.store) if args.store else None
+    fp = open(args.output, 'a') if args.output else sys.stdout
+    try:
+        d = argosDaemon.ArgosDaemon(fleet, platform_ids, argosDaemon.JsonLinesSink(fp), store=store,
+                                    interval=args.interval, jitter=args.jitter,
+                                    max_concurrency=args.max_concurrency, max_backoff=args.max_backoff,
+                                    minimum_quality_flag=args.minimum_quality_flag)
+        signal.signal(signal.SIGTERM, lambda signum, frame: d.stop())
+        try:
+            d.run(duration=args.duration)
+        except KeyboardInterrupt:
+            pass
+    finally:
+        if fp is not sys.stdout:
+            fp.close()
+    return 0
+
+
+def reprocess(args):
+    from . import argosReprocess
+    stats = argosReprocess.reprocess(args.sources, args.output, max_workers=args.workers,
+                                     chunksize=args.chunksize,
+                                     minimum_quality_flag=args.minimum_quality_flag)
+    print(f"Processed {stats['files']} files, {stats['passes']} satellite passes and "
+          f"{stats['messages']} messages in {stats['elapsed']:.2f} s "
+          f"({stats['files_per_second']:.1f} files/s, {stats['messages_per_second']:.1f} messages/s). "
+          f"Wrote {stats['records']} records to {args.output}.", file=sys.stderr)
+    return 0
+
+
+def export(args):
+    from . import argosExport
+    def fixes():
+        for filename in args.sources:
+            with open(filename, 'r') as fp:
+                yield from argosExport.iter_json_lines(fp)
+    n = argosExport.export(fixes(), args.output, profile=args.profile)
+    print(f"Wrote {n} fixes to {args.output}.", file=sys.stderr)
+    return 0
+
+
+def profile_run(args):
+    from . import argosProfile
+    response = argosProfile.load_response(args.response) if args.response else None
+    result = argosProfile.profile(response, number_of_passes=args.passes, platformId=args.platform,
+                                  repeat=args.repeat, soap=args.soap, top=args.top)
+    key = args.key or argosProfile.version_key()
+    print(argosProfile.format_profile(key, result))
+    if args.results:
+        argosProfile.store_results(result, key, args.results)
+        print(f"Stored as {key} in {args.results}.", file=sys.stderr)
+    return 0
+
+
+def profile_compare(args):
+    from . import argosProfile
+    results = argosProfile.load_results(args.results)
+    candidate = args.candidate or (list(results)[-1] if results else None)
+    for key in (args.baseline, candidate):
+        if key not in results:
+            raise SystemExit(f"No results stored as {key} in {args.results}.")
+    rows = argosProfile.compare(results[args.baseline], results[candidate], args.threshold)
+    print(f"{candidate} compared to {args.baseline}:")
+    print(argosProfile.format_comparison(rows, args.threshold))
+    return 1 if any(flagged for *_, flagged in rows) else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="argos", description="Tools for Argos messages from CLS.")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log debug information")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    p = subparsers.add_parser("daemon", help="poll platforms continuously and write new fixes as JSON lines")
+    p.add_argument("--credentials", default="argos_login.txt", help="file with username, password and wsdl")
+    p.add_argument("--wsdl", default=None, help="url of the webservice, if not given in the credentials file")
+    p.add_argument("--platform", action="append", help="platform identifier (can be repeated)")
+    p.add_argument("--program", action="append", help="poll all platforms of this program (can be repeated)")
+    p.add_argument("--catalogue-ttl", type=float, default=3600,
+                   help="seconds the cached platform list of a program is used without checking for changes")
+    p.add_argument("--interval", type=float, default=600, help="seconds between polls of a platform")
+    p.add_argument("--jitter", type=float, default=0.1, help="relative random variation of the interval")
+    p.add_argument("--max-concurrency", type=int, default=4, help="maximum number of concurrent requests")
+    p.add_argument("--max-backoff", type=float, default=3600, help="maximum seconds between retries after failures")
+    p.add_argument("--minimum-quality-flag", type=int, default=argosClient.CRC,
+                   help="minimum quality flag of the fixes written")
+    p.add_argument("--store", default=None, help="database file of seen satellite passes (default: in memory)")
+    p.add_argument("--output", default=None, help="file to append fixes to (default: stdout)")
+    p.add_argument("--duration", type=float, default=None, help="stop after this many seconds")
+    p.set_defaults(func=daemon)
+
+    p = subparsers.add_parser("reprocess", help="decode archived getXml responses into JSON lines")
+    p.add_argument("sources", nargs="+", help="files, directories or glob patterns of saved responses")
+    p.add_argument("-o", "--output", required=True, help="JSON lines file to write")
+    p.add_argument("--workers", type=int, default=None, help="number of processes (default: number of processors)")
+    p.add_argument("--chunksize", type=int, default=16, help="number of files per work unit")
+    p.add_argument("--minimum-quality-flag", type=int, default=argosClient.CRC,
+                   help="minimum quality flag of the fixes written")
+    p.set_defaults(func=reprocess)
+
+    p = subparsers.add_parser("export", help="convert JSON lines of fixes to CSV, GeoJSON, NetCDF or Parquet")
+    p.add_argument("sources", nargs="+", help="JSON lines files written by the daemon or by reprocess")
+    p.add_argument("-o", "--output", required=True,
+                   help="file to write; the extension (.csv, .jsonl, .geojson, .nc, .parquet) selects the format")
+    p.add_argument("--profile", default=None, help="codec profile of the payloads (default: glider)")
+    p.set_defaults(func=export)
+
+    p = subparsers.add_parser("profile", help="profile the processing pipeline and track regressions")
+    profile_commands = p.add_subparsers(dest="profile_command", required=True)
+    p = profile_commands.add_parser("run", help="time retrieve, get_info and decoding, and measure memory")
+    p.add_argument("--response", default=None, help="recorded getXml response (default: a synthetic one)")
+    p.add_argument("--passes", type=int, default=1000, help="satellite passes of the synthetic response")
+    p.add_argument("--platform", default="260603", help="platform identifier")
+    p.add_argument("--repeat", type=int, default=5, help="number of timed runs")
+    p.add_argument("--soap", action="store_true", help="call getXml through zeep on a local stand-in server")
+    p.add_argument("--top", type=int, default=10, help="number of allocating lines reported")
+    p.add_argument("--results", default="argos_profile.json",
+                   help="JSON file to store the results in; empty not to store them")
+    p.add_argument("--key", default=None, help="key to store the results under (default: git commit or version)")
+    p.set_defaults(func=profile_run)
+    p = profile_commands.add_parser("compare", help="compare stored results; the exit status is 1 on regressions")
+    p.add_argument("baseline", help="key of the baseline results")
+    p.add_argument("candidate", nargs="?", default=None, help="key of the results compared (default: the latest)")
+    p.add_argument("--results", default="argos_profile.json", help="JSON file of the results")
+    p.add_argument("--threshold", type=float, default=0.1,
+                   help="relative growth of a time or memory measurement flagged as a regression")
+    p.set_defaults(func=profile_compare)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    if args.verbose:
+        logger.setLevel(logging.DEBUG)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
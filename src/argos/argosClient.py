@@ -1,17 +1,140 @@
 import logging
+import math
 import re
 import os
+import sqlite3
+import threading
+import time
+from collections import Counter, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from itertools import chain
 
-import zeep
 import xml.etree.ElementTree as ET
+from . import argosCodec
 from . import argosMessage
 
+# zeep (and with it lxml and requests) is imported only when a client is
+# created, so that processing responses does not pay for importing it.
+
 logger = logging.getLogger("Argos")
 
 CRC = 2
 BESTMGS = 1
 
+# Fields of the information of a satellite pass, besides the fields of the
+# GPS location, that can be selected with the fields keyword
+INFO_FIELDS = ("argos_location", "gps_location_qf")
+
+# Number of characters (or bytes) fed at a time to the incremental parser
+CHUNK_SIZE = 1<<16
+
+# Maximum number of days the webservice can be asked to look back
+MAX_DAYS_FROM_NOW = 20
+# Time in seconds added to the time since the last poll, to catch
+# satellite passes that are reported with a delay
+POLL_MARGIN = 6*3600
+
+# Directory of the on-disk cache of WSDL and XSD documents
+CACHE_PATH = os.path.join(os.environ["HOME"], ".cache", "argos")
+# Time in seconds cached WSDL and XSD documents remain valid
+WSDL_CACHE_TIMEOUT = 24*3600
+# Timeouts in seconds for loading documents and for SOAP operations
+TIMEOUT = 30
+OPERATION_TIMEOUT = 60
+# Maximum number of kept-alive connections per host
+POOL_MAXSIZE = 16
+
+_clients = dict()
+_clients_lock = threading.Lock()
+
+
+def get_client(wsdl, cache_timeout=None, timeout=None, operation_timeout=None, pool_maxsize=None):
+    ''' Returns a zeep client for the given webservice
+
+    Clients are cached by wsdl url, so that all objects in this process
+    share a single client, and the WSDL is downloaded and parsed only
+    once. The configuration given when the client is created first
+    applies.
+
+    Parameters
+    ----------
+    wsdl : string
+        url of the webservice
+    cache_timeout : int or None (optional) Default : None
+        time in seconds WSDL and XSD documents are cached on disk. If None, WSDL_CACHE_TIMEOUT is used.
+    timeout : float or None (optional) Default : None
+        timeout for loading documents. If None, TIMEOUT is used.
+    operation_timeout : float or None (optional) Default : None
+        timeout for SOAP operations. If None, OPERATION_TIMEOUT is used.
+    pool_maxsize : int or None (optional) Default : None
+        number of connections kept alive. If None, POOL_MAXSIZE is used.
+
+    Returns
+    -------
+    zeep.Client
+    '''
+    import zeep
+    with _clients_lock:
+        client = _clients.get(wsdl)
+        if client is None:
+            transport = transport_factory(cache_timeout, timeout, operation_timeout, pool_maxsize)
+            client = zeep.Client(wsdl=wsdl, transport=transport)
+            _clients[wsdl] = client
+    return client
+
+
+def clear_client_cache():
+    ''' Removes all clients created by get_client() '''
+    with _clients_lock:
+        _clients.clear()
+
+
+def transport_factory(cache_timeout=None, timeout=None, operation_timeout=None, pool_maxsize=None):
+    ''' Creates a zeep transport with a persistent document cache and a pooled session
+
+    See get_client() for the parameters.
+
+    Returns
+    -------
+    zeep.transports.Transport
+    '''
+    import requests
+    import zeep.transports
+    pool_maxsize = pool_maxsize or POOL_MAXSIZE
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return zeep.transports.Transport(cache=cache_factory(cache_timeout), session=session,
+                                     timeout=timeout or TIMEOUT,
+                                     operation_timeout=operation_timeout or OPERATION_TIMEOUT)
+
+
+def cache_factory(cache_timeout=None):
+    ''' Creates the cache of WSDL and XSD documents
+
+    Documents are cached on disk in CACHE_PATH. If that is not possible,
+    they are cached in memory.
+
+    Parameters
+    ----------
+    cache_timeout : int or None (optional) Default : None
+        time in seconds documents are cached. If None, WSDL_CACHE_TIMEOUT is used.
+
+    Returns
+    -------
+    zeep.cache.Base
+    '''
+    import zeep.cache
+    cache_timeout = WSDL_CACHE_TIMEOUT if cache_timeout is None else cache_timeout
+    try:
+        os.makedirs(CACHE_PATH, exist_ok=True)
+        return zeep.cache.SqliteCache(path=os.path.join(CACHE_PATH, "wsdl.sqlite"),
+                                      timeout=cache_timeout)
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"Cannot use on-disk WSDL cache in {CACHE_PATH} ({e}). Caching in memory.")
+        return zeep.cache.InMemoryCache(timeout=cache_timeout)
+
 
 
 class CredentialsReader:
@@ -123,22 +246,40 @@ class ArgosProgramInfo(object):
     wsdl = "https://some/web/serice/"
 
     The username and password are optional, but would need to supplied in the script.
+
+    service : callable or None
+        getPlatformList service to use. If None, the service is created by service_factory().
+    metrics : argosMetrics.Metrics or None
+        if given, receives the duration of each stage and counts of the data processed.
+    resilience : argosResilience.Resilience or None
+        if given, the service is called under its policy of deadlines,
+        retries, hedged requests and circuit breaking.
     '''
    
-    def __init__(self, wsdl="", credentials=None):
+    def __init__(self, wsdl="", credentials=None, service=None, metrics=None, resilience=None):
         if credentials:
             cr = CredentialsReader(credentials)
             self.username, self.password, wsdl = cr.get_credentials()
         else:
             self.username, self.password = None, None
-        self.service = self.service_factory(wsdl)
+        self.wsdl = wsdl
+        self.resilience = resilience
+        self.service = self._resilient(service or self.service_factory(wsdl))
+        self.metrics = metrics
         self.info_dict={}
+        self._sorted_platforms = dict()
         
         
     def service_factory(self, wsdl):
-        client = zeep.Client(wsdl=wsdl)
+        client = get_client(wsdl)
         service = client.service.getPlatformList
         return service
+
+    def _resilient(self, service):
+        # Returns the service, called under the resilience policy if there is one.
+        if self.resilience is None or service is None:
+            return service
+        return self.resilience.wrap(service, "getPlatformList")
         
     def retrieve(self, username=None, password=None):
         ''' Retrieves all information from webservice for given username and password
@@ -154,11 +295,47 @@ class ArgosProgramInfo(object):
         -------
         None
         '''
+        self.load(self.fetch(username, password))
+
+    def fetch(self, username=None, password=None):
+        ''' Calls getPlatformList, without processing the response
+
+        Parameters
+        ----------
+        username : string or None
+            username
+        password : string or None
+            password
+
+        Returns
+        -------
+        str
+            response of the webservice, which can be passed to load()
+        '''
         username = username or self.username
         password = password or self.password
+        t0 = time.perf_counter()
         s = self.service(username=username, password=password)
+        if self.metrics is not None:
+            self.metrics.timing("program_info.soap", time.perf_counter() - t0)
+        return s
+
+    def load(self, s):
+        ''' Processes a getPlatformList response
+
+        Parameters
+        ----------
+        s : str
+            response, as returned by fetch()
+        '''
+        t0 = time.perf_counter()
         self.root = ET.fromstring(s)
         self.info_dict = self._info()
+        self._sorted_platforms = dict()
+        if self.metrics is not None:
+            self.metrics.timing("program_info.parse", time.perf_counter() - t0)
+            self.metrics.count("program_info.response_bytes", len(s))
+            self.metrics.count("program_info.platforms", sum(len(v) for v in self.info_dict.values()))
 
 
     def get_programs(self):
@@ -185,9 +362,11 @@ class ArgosProgramInfo(object):
         list of string
             platform numbers
         '''
-        platforms = list(self.info_dict[programNumber].keys())
-        platforms.sort(key=lambda x : int(x))
-        return platforms
+        platforms = self._sorted_platforms.get(programNumber)
+        if platforms is None:
+            platforms = sorted(self.info_dict[programNumber].keys(), key=lambda x : int(x))
+            self._sorted_platforms[programNumber] = platforms
+        return list(platforms)
 
 
     def _info(self):
@@ -224,29 +403,72 @@ class ArgosPlatformInfo(object):
     wsdl = "https://some/web/serice/"
 
     The username and password are optional, but would need to supplied in the script.
+
+    service : callable or None
+        getXml service to use. If None, the service is created by service_factory().
+        This allows several instances to share a single client.
+    metrics : argosMetrics.Metrics or None
+        if given, receives the duration of each stage and counts of the data processed.
+    payload_cache : argosMessage.PayloadCache or None
+        cache of checksums and decoded payloads. If None, the cache
+        argosMessage.payload_cache, shared by all instances, is used.
+    response_cache : argosCache.ResponseCache or None
+        if given, identical requests share a single call to the
+        webservice, and responses are reused for a short time.
+    archive : argosArchive.ArgosArchive or None
+        if given, each response received from the webservice is archived.
+    resilience : argosResilience.Resilience or None
+        if given, the service is called under its policy of deadlines,
+        retries, hedged requests and circuit breaking.
+
+    retrieve() and get_info() take a selection of fields. The names are
+    those of INFO_FIELDS and the fields of the GPS location, given by the
+    attribute fields of the decoder (for example ("lat", "lon")). Only
+    what the selected fields need is requested, parsed and decoded: the
+    Argos location is neither requested nor parsed unless argos_location
+    is selected, the messages are skipped unless a field of the GPS
+    location or gps_location_qf is, and only the selected fields of the
+    GPS location are decoded. The quality flag of satellite passes of
+    which the messages are skipped is 0.
     '''
     
-    def __init__(self, wsdl=None, credentials=None):
+    def __init__(self, wsdl=None, credentials=None, service=None, metrics=None, payload_cache=None,
+                 response_cache=None, archive=None, resilience=None):
         if credentials:
             cr = CredentialsReader(credentials)
             self.username, self.password, wsdl = cr.get_credentials()
         else:
             self.username, self.password = None, None
-        self.service = self.service_factory(wsdl)
         self.argos_message_decoder = argosMessage.ArgosMessageDecoder()
         self.number_of_satellite_passes = None
         self.decoder = argosMessage.ArgosMessageDecoder()
-        self.service = self.service_factory(wsdl)
+        self.resilience = resilience
+        self.service = self._resilient(service or self.service_factory(wsdl))
+        self.platformId = None
+        self.response = None
+        self.fields = None
+        self._root = None
+        self.metrics = metrics
+        self.payload_cache = argosMessage.payload_cache if payload_cache is None else payload_cache
+        self.response_cache = response_cache
+        self.archive = archive
+        self._stats = None
 
         
     def service_factory(self, wsdl):
-        client = zeep.Client(wsdl=wsdl)
+        client = get_client(wsdl)
         service = client.service.getXml
         return service
 
+    def _resilient(self, service):
+        # Returns the service, called under the resilience policy if there is one.
+        if self.resilience is None or service is None:
+            return service
+        return self.resilience.wrap(service, "getXml")
+
 
         
-    def retrieve(self, platformId, username=None, password=None, number_of_days_from_now=1):
+    def retrieve(self, platformId, username=None, password=None, number_of_days_from_now=1, fields=None):
         ''' Retrieves all information from webservice for given username and password
 
         Parameters
@@ -259,6 +481,10 @@ class ArgosPlatformInfo(object):
             password
         number_of_days_from_now : int (optional) Default : 1
             the number of days in the past for which data is to be retrieved. Maximum value is 20.
+        fields : iterable of string or None (optional) Default : None
+            fields needed. Data not needed for them is not requested. The
+            selection is kept, and applies to get_info() and iter_info().
+            If None, all fields are.
         
         Returns
         -------
@@ -270,19 +496,190 @@ class ArgosPlatformInfo(object):
         if username is None or password is None:
             raise ValueError('No credentials are supplied. Cannot continue.')
         self.platformId=platformId
-        s = self.service(username=username, password=password, platformId=platformId, displayRawData=True, displayLocation=True, nbDaysFromNow=number_of_days_from_now)
-        logger.debug(f"String returned from getXml call:\n{s}")
+        self.decoder = self.decoder_factory(platformId)
+        self.fields = self._check_fields(fields)
+        displayRawData, displayLocation = self._display_flags(self.fields)
+        t0 = time.perf_counter()
+        def fetch():
+            s = self.service(username=username, password=password, platformId=platformId, displayRawData=displayRawData, displayLocation=displayLocation, nbDaysFromNow=number_of_days_from_now)
+            if self.archive is not None:
+                self._archive_response(s, platformId, number_of_days_from_now)
+            return s
+        if self.response_cache is None:
+            s = fetch()
+        else:
+            key = self.response_cache.key(username, password, platformId, number_of_days_from_now, displayRawData, displayLocation)
+            s = self.response_cache.get(key, fetch)
+        self._set_response(s, time.perf_counter() - t0)
 
-        self.root = ET.fromstring(s)
-        
+    def _check_fields(self, fields):
+        # Returns the selection of fields as a frozenset, or None for all fields.
+        if fields is None:
+            return None
+        fields = frozenset([fields] if isinstance(fields, str) else fields)
+        unknown = fields.difference(INFO_FIELDS + self.decoder.fields)
+        if unknown:
+            raise ValueError(f"Unknown fields {', '.join(sorted(unknown))}.")
+        return fields
+
+    @staticmethod
+    def _display_flags(fields):
+        # Returns displayRawData and displayLocation for a selection of fields.
+        if fields is None:
+            return True, True
+        return bool(fields.difference(("argos_location",))), "argos_location" in fields
+
+    @staticmethod
+    def _skipped_tags(fields):
+        # Returns the children of satellitePass not needed for a selection of fields.
+        displayRawData, displayLocation = ArgosPlatformInfo._display_flags(fields)
+        return (() if displayRawData else ('message',)) + (() if displayLocation else ('location',))
+
+    def _archive_response(self, s, platformId, number_of_days_from_now):
+        # A failure to archive does not stop the response from being processed.
+        try:
+            self.archive.add_response(s, platformId, number_of_days_from_now=number_of_days_from_now)
+        except Exception as e:
+            logger.error(f"Failed to archive response for platform {platformId}: {e!r}")
+
+    def _set_response(self, s, elapsed):
+        if self.metrics is not None:
+            self.metrics.timing("platform_info.soap", elapsed)
+            self.metrics.count("platform_info.response_bytes", len(s))
+        logger.debug("String returned from getXml call:\n%s", s)
+        self.response = s
+        self._root = None
+
+    def decoder_factory(self, platformId):
+        ''' Creates the message decoder for a platform
+
+        Parameters
+        ----------
+        platformId : string
+            platform identifier
+
+        Returns
+        -------
+        argosMessage.ArgosMessageDecoder
+            decoder using the codec profile assigned to the platform
+        '''
+        return argosMessage.ArgosMessageDecoder(argosCodec.platform_profile(platformId))
+
+    @property
+    def root(self):
+        ''' Element tree of the last response
+
+        The tree is only built when accessed. get_info() and iter_info()
+        parse the response incrementally and do not need it.
+        '''
+        if self._root is None and self.response is not None:
+            self._root = ET.fromstring(self.response)
+        return self._root
         
-    def get_info(self, latest_only=False, minimum_quality_flag=CRC):
+    def iter_info(self, minimum_quality_flag=CRC, source=None, fields=None):
+        ''' Iterates over the satellite passes of a response.
+
+        The response is parsed incrementally. Each satellite pass is
+        yielded as soon as it is complete, and discarded afterwards, so
+        that the memory used does not grow with the size of the response.
+
+        Parameters
+        ----------
+        minimum_quality_flag : int (optional) Default : CRC
+            satellite passes with a lower quality flag are skipped.
+        source : string, file object or None (optional) Default : None
+            response to parse. If None, the response of the last call
+            to retrieve() is used.
+        fields : iterable of string or None (optional) Default : None
+            fields needed. If None, the selection given to retrieve() applies.
+
+        Yields
+        ------
+        dict
+           dictionary with payload information, in the order of the response.
+           argos_location is None, and gps_location holds the selected
+           fields only, if not all fields are selected.
+        '''
+        if source is None:
+            source = self.response
+        fields = self.fields if fields is None else self._check_fields(fields)
+        return self._iter_passes(minimum_quality_flag, source, self._decoder_of(fields), fields)
+
+    def _decoder_of(self, fields):
+        # Returns the function decoding satellite passes for a selection of fields.
+        if fields is None:
+            return self._decode_pass
+        return lambda argos_location, best_payload, quality_flag: \
+            self._decode_pass(argos_location, best_payload, quality_flag, fields)
+
+    def _iter_passes(self, minimum_quality_flag, source, decode, fields=None):
+        # Yields decode(argos_location, best_payload, quality_flag) for
+        # each satellite pass of sufficient quality. If decode is None, the
+        # selection (argos_location, best_payload, quality_flag) is yielded,
+        # and the caller decodes (and times the decoding of) what it needs.
+        if self.metrics is not None:
+            yield from self._iter_passes_instrumented(minimum_quality_flag, source, decode, fields)
+            return
+        for sp in self._iter_satellite_passes(source, self._skipped_tags(fields)):
+            argos_location, bestMsgDate, best_payload, quality_flag = self._select_pass(sp)
+            if quality_flag >= minimum_quality_flag:
+                if decode is None:
+                    yield argos_location, best_payload, quality_flag
+                else:
+                    yield decode(argos_location, best_payload, quality_flag)
+
+    def _iter_passes_instrumented(self, minimum_quality_flag, source, decode, fields):
+        # Same as _iter_passes(), timing each stage. Measurements are
+        # accumulated, and reported once the iteration ends. The decode
+        # stage is counted once per selected payload, not per pass.
+        self._stats = stats = Counter()
+        times = dict(parse=0., select=0., decode=0.)
+        decoded = 0
+        satellitePasses = self._iter_satellite_passes(source, self._skipped_tags(fields))
+        try:
+            while True:
+                t0 = time.perf_counter()
+                sp = next(satellitePasses, None)
+                t1 = time.perf_counter()
+                times['parse'] += t1 - t0
+                if sp is None:
+                    break
+                argos_location, bestMsgDate, best_payload, quality_flag = self._select_pass(sp)
+                times['select'] += time.perf_counter() - t1
+                stats['passes'] += 1
+                stats[f'quality_flag.{quality_flag}'] += 1
+                if quality_flag >= minimum_quality_flag:
+                    if decode is None:
+                        yield argos_location, best_payload, quality_flag
+                        continue
+                    t2 = time.perf_counter()
+                    info = decode(argos_location, best_payload, quality_flag)
+                    times['decode'] += time.perf_counter() - t2
+                    if quality_flag:
+                        decoded += 1
+                    yield info
+        finally:
+            self._stats = None
+            if decode is None:
+                del times['decode']
+            for stage, seconds in times.items():
+                self.metrics.timing(f"platform_info.{stage}", seconds,
+                                    decoded if stage == 'decode' else stats['passes'])
+            for name, value in stats.items():
+                self.metrics.count(f"platform_info.{name}", value)
+                
+    def get_info(self, latest_only=False, minimum_quality_flag=CRC, output="dict", fields=None):
         ''' Selects information for specific satellite pass.
 
         Parameters
         ----------
         number_of_days_from_now : int (optional) Default : 1
             the number of days in the past for which data is to be retrieved. Maximum value is 20.
+        output : {"dict", "records", "columns"} (optional) Default : "dict"
+            form of the information returned: dictionaries, argosRecords.Fix
+            records or a single argosRecords.FixColumns object. See argosRecords.
+        fields : iterable of string or None (optional) Default : None
+            fields needed. If None, the selection given to retrieve() applies.
         
         Returns
         -------
@@ -293,54 +690,440 @@ class ArgosPlatformInfo(object):
             if satellitePassNumber >= self.number_of_satellite_passes:
                 logger.error(f"Cannot return requested satellite pass. There are only {self.number_of_satellite_passes} available")
                 return dict()
-        satellitePasses = self.root.find("program").find("platform").findall("satellitePass")
+        fields = self.fields if fields is None else self._check_fields(fields)
+        if output == "columns":
+            return self._get_columns(latest_only, minimum_quality_flag, fields)
+        if latest_only:
+            # Only the latest satellite pass is decoded.
+            passes = list(self._iter_passes(minimum_quality_flag, self.response, None, fields))
+            t0 = time.perf_counter()
+            results = [self._decode_pass(*passes[-1], fields)] if passes else []
+            if self.metrics is not None:
+                self.metrics.timing("platform_info.decode", time.perf_counter() - t0,
+                                    sum(1 for p in passes[-1:] if p[2]))
+        else:
+            results = list(self._iter_passes(minimum_quality_flag, self.response, self._decoder_of(fields), fields))
+            results.reverse()
+        if output == "records":
+            from . import argosRecords
+            codec = self.decoder.codec
+            results = [argosRecords.Fix.from_dict(info, codec) for info in results]
+        elif output != "dict":
+            raise ValueError(f"Unknown output {output!r}.")
+        if latest_only:
+            return results[0]
+        else:
+            return results
+
+    def get_frame(self, latest_only=False, minimum_quality_flag=CRC, fields=None, library="pandas"):
+        ''' Returns the information of the satellite passes as a data frame
+
+        The satellite passes are collected into typed column buffers as the
+        response is parsed, and converted into a frame without decoding
+        the payloads into dictionaries. See argosFrame for the columns.
+
+        Parameters
+        ----------
+        latest_only : bool (optional) Default : False
+            if True, only the latest satellite pass is returned
+        minimum_quality_flag : int (optional) Default : CRC
+            satellite passes with a lower quality flag are left out
+        fields : iterable of string or None (optional) Default : None
+            fields needed. If None, the selection given to retrieve() applies.
+        library : {"pandas", "arrow"} (optional) Default : "pandas"
+            kind of frame returned
+
+        Returns
+        -------
+        pandas.DataFrame or pyarrow.Table
+            one row per satellite pass, latest first
+        '''
+        from . import argosFrame
+        if library not in argosFrame.LIBRARIES:
+            raise ValueError(f"Unknown library {library!r}. Choose from {argosFrame.LIBRARIES}.")
+        fields = self.fields if fields is None else self._check_fields(fields)
+        columns = self._get_columns(latest_only, minimum_quality_flag, fields)
+        return argosFrame.to_frame(columns, self.platformId, library)
+
+    def _get_columns(self, latest_only, minimum_quality_flag, fields):
+        # The selected payloads are collected first, and decoded in one go.
+        from . import argosRecords
+        builder = argosRecords.ColumnBuilder()
+        passes = self._iter_passes(minimum_quality_flag, self.response, None, fields)
+        if latest_only:
+            builder.extend(list(passes)[-1:])
+        else:
+            builder.extend(passes)
+        t0 = time.perf_counter()
+        columns = builder.to_columns(self.decoder, self._gps_fields(fields), reverse=True)
+        if self.metrics is not None:
+            self.metrics.timing("platform_info.decode", time.perf_counter() - t0, len(columns))
+        return columns
+
+    def poll(self, platformId, store, username=None, password=None, minimum_quality_flag=CRC):
+        ''' Retrieves the satellite passes that were not seen before
+
+        The number of days requested from the webservice is the smallest
+        that covers the time since the last successful poll of this platform,
+        plus POLL_MARGIN. Satellite passes are identified by their
+        bestMsgDate and selected payload; passes found in the store are
+        skipped without decoding, new passes are decoded and added to the store.
+
+        Parameters
+        ----------
+        platformId : string
+            platform identifier
+        store : argosStore.ArgosPassStore
+            store of previously seen satellite passes
+        username : string
+            username
+        password : string
+            password
+        minimum_quality_flag : int (optional) Default : CRC
+            new satellite passes with a lower quality flag are stored, but not returned.
 
-        locations = [sp.find('location') for sp in satellitePasses]
-        messages = [sp.findall('message') for sp in satellitePasses]
-        bestMsgDates = [sp.find('bestMsgDate') for sp in satellitePasses]
+        Returns
+        -------
+        list of dict
+           dictionaries with payload information of the new satellite passes, latest first.
+        '''
+        now = time.time()
+        number_of_days_from_now = self._days_to_poll(store.last_poll(platformId), now)
+        self.retrieve(platformId, username, password, number_of_days_from_now)
+        return self._store_new_passes(platformId, store, minimum_quality_flag, now)
 
+    def _store_new_passes(self, platformId, store, minimum_quality_flag, now):
+        # Decodes and stores the satellite passes of the response not in
+        # the store, and returns those of sufficient quality, latest first.
         results = []
-        for location, mesgList, bestMsgDate in zip(locations, messages, bestMsgDates):
-            try:
-                argos_location = dict(latitude=location.find("latitude").text,
-                                      longitude=location.find("longitude").text,
-                                      date=location.find("locationDate").text)
-            except AttributeError:
-                argos_location = None
-            best_payload, quality_flag = self._select_best_payload(mesgList, bestMsgDate)
-            if quality_flag:
-                gps_location = self.decoder(best_payload)
-            else:
-                gps_location = {}
+        for sp in self._iter_satellite_passes(self.response):
+            argos_location, bestMsgDate, best_payload, quality_flag = self._select_pass(sp)
+            if store.has_pass(platformId, bestMsgDate, best_payload):
+                continue
+            info = self._decode_pass(argos_location, best_payload, quality_flag)
+            store.add_pass(platformId, bestMsgDate, best_payload, info)
             if quality_flag >= minimum_quality_flag:
-                results.append(dict(argos_location = argos_location,
-                                    gps_location = gps_location,
-                                    gps_location_qf = quality_flag)
-                               )
+                results.append(info)
+        store.set_last_poll(platformId, now)
         results.reverse()
-        if latest_only:
-            return results[0]
-        else:
-            return results
+        return results
+
+    def _days_to_poll(self, last_poll, now):
+        if last_poll is None:
+            return MAX_DAYS_FROM_NOW
+        days = math.ceil((now - last_poll + POLL_MARGIN)/86400)
+        return min(max(days, 1), MAX_DAYS_FROM_NOW)
     
+    def _iter_satellite_passes(self, source, skipped_tags=()):
+        # Yields the satellitePass elements of the first platform of the
+        # first program, and clears them once processed. Children of
+        # satellitePass with a tag in skipped_tags are passed over, and
+        # dropped as soon as they end.
+        parser = ET.XMLPullParser(events=('start', 'end'))
+        path = []
+        n_programs = n_platforms = 0
+        skip_depth = 0
+        for chunk in self._iter_chunks(source):
+            parser.feed(chunk)
+            for event, elem in parser.read_events():
+                if skip_depth:
+                    # Inside a skipped element: only its end matters.
+                    skip_depth += 1 if event == 'start' else -1
+                    if not skip_depth:
+                        path[-1].remove(elem)
+                    continue
+                if event == 'start':
+                    if skipped_tags and len(path) == 4 and elem.tag in skipped_tags and path[-1].tag == 'satellitePass':
+                        skip_depth = 1
+                        continue
+                    path.append(elem)
+                    if elem.tag == 'program' and len(path) == 2:
+                        n_programs += 1
+                    elif elem.tag == 'platform' and len(path) == 3 and n_programs == 1:
+                        n_platforms += 1
+                    continue
+                path.pop()
+                if elem.tag == 'platformId' and len(path) == 3 and n_programs == 1 and n_platforms == 1:
+                    self._set_platform(elem.text)
+                elif elem.tag == 'satellitePass' and len(path) == 3:
+                    if n_programs == 1 and n_platforms == 1:
+                        yield elem
+                    path[-1].remove(elem)
+                elif elem.tag in ('platform', 'program') and path:
+                    path[-1].remove(elem)
+        parser.close()
 
-            
+    def _set_platform(self, platformId):
+        # Responses parsed without retrieve() are decoded with the codec
+        # profile of the platform they contain.
+        if platformId != self.platformId:
+            self.platformId = platformId
+            self.decoder = self.decoder_factory(platformId)
+
+    def _iter_chunks(self, source):
+        if hasattr(source, 'read'):
+            while True:
+                chunk = source.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+        else:
+            for i in range(0, len(source), CHUNK_SIZE):
+                yield source[i:i+CHUNK_SIZE]
+
+    def _pass_info(self, satellitePass):
+        argos_location, bestMsgDate, best_payload, quality_flag = self._select_pass(satellitePass)
+        return self._decode_pass(argos_location, best_payload, quality_flag)
+
+    def _select_pass(self, satellitePass):
+        location = satellitePass.find('location')
+        try:
+            argos_location = dict(latitude=location.find("latitude").text,
+                                  longitude=location.find("longitude").text,
+                                  date=location.find("locationDate").text)
+        except AttributeError:
+            argos_location = None
+        mesgList = satellitePass.findall('message')
+        bestMsgDate = satellitePass.find('bestMsgDate')
+        best_payload, quality_flag = self._select_best_payload(mesgList, bestMsgDate)
+        return argos_location, bestMsgDate.text, best_payload, quality_flag
+
+    def _decode_pass(self, argos_location, best_payload, quality_flag, fields=None):
+        gps_fields = self._gps_fields(fields)
+        if quality_flag and gps_fields != ():
+            gps_location = self.payload_cache.decode(self.decoder, best_payload, gps_fields)
+        else:
+            gps_location = {}
+        return dict(argos_location = argos_location,
+                    gps_location = gps_location,
+                    gps_location_qf = quality_flag)
+
+    def _gps_fields(self, fields):
+        # Returns the selected fields of the GPS location in the order of
+        # the decoder, or None for all fields.
+        if fields is None:
+            return None
+        return tuple(k for k in self.decoder.fields if k in fields)
 
     def _select_best_payload(self, messages, bestMsgDate):
+        # Selects, in one pass, the first payload with a valid CRC that was
+        # received at bestMsgDate (quality flag 3), otherwise the first one
+        # with a valid CRC (2), otherwise the first one received at
+        # bestMsgDate (1). CRCs are only checked where they can matter.
         bestMsgDateStr = bestMsgDate.text
-        payloads = [m.find('collect').find('rawData').text for m in messages]
-        dates = [m.find('collect').find('date').text for m in messages]
-        crcs = [self.decoder.checksum_8bit(p) for p in payloads]
-        # best option crc True and date = bestMsgDateStr
-        best_payloads = [p for p,crc,date in zip(payloads, crcs, dates) if crc and date==bestMsgDateStr]
-        if best_payloads:
-            return best_payloads[0], 3
-        # Take any with crc==True
-        best_payloads = [p for p,crc in zip(payloads, crcs) if crc]
-        if best_payloads:
-            return best_payloads[0], 2
-        # Take best date
-        best_payloads = [p for p,date in zip(payloads, dates) if date==bestMsgDateStr]
-        if best_payloads:
-            return best_payloads[0], 1
-        return None, 0
+        checksum = self.payload_cache.checksum
+        decoder = self.decoder
+        crc_payload = date_payload = None
+        n_failures = 0
+        for m in messages:
+            collect = m.find('collect')
+            payload = collect.find('rawData').text
+            is_best_date = collect.find('date').text == bestMsgDateStr
+            if not is_best_date and crc_payload is not None:
+                continue
+            if checksum(decoder, payload):
+                if is_best_date:
+                    crc_payload, quality_flag = payload, 3
+                    break
+                crc_payload = payload
+            else:
+                n_failures += 1
+                if is_best_date and date_payload is None:
+                    date_payload = payload
+        else:
+            if crc_payload is not None:
+                quality_flag = 2
+            elif date_payload is not None:
+                crc_payload, quality_flag = date_payload, 1
+            else:
+                quality_flag = 0
+        if self._stats is not None:
+            self._stats['messages'] += len(messages)
+            self._stats['crc_failures'] += n_failures
+        return crc_payload, quality_flag
+
+
+
+FleetResult = namedtuple("FleetResult", ["platformId", "info", "error"])
+FleetResult.__doc__ = ''' Result of a single platform in a fleet retrieval.
+
+info holds what ArgosPlatformInfo.get_info() returned, and error the
+exception raised, if any. Exactly one of them is None.
+'''
+
+
+class ArgosFleetClient(object):
+    ''' Class to retrieve Argos platform information for many platforms at once.
+
+    The getXml calls for different platforms are run in parallel, using a
+    bounded thread pool. All calls share a single zeep client.
+
+    Parameters
+    ----------
+    wsdl : string
+        url of the webservice
+    credentials : string or None
+        filename with credentials
+    max_workers : int (optional) Default : 8
+        maximum number of concurrent requests to the webservice
+    metrics : argosMetrics.Metrics or None
+        if given, passed on to the ArgosPlatformInfo objects used.
+    response_cache : argosCache.ResponseCache or None
+        if given, passed on to the ArgosPlatformInfo objects used.
+    archive : argosArchive.ArgosArchive or None
+        if given, passed on to the ArgosPlatformInfo objects used.
+    resilience : argosResilience.Resilience or None
+        if given, the shared service is called under its policy of
+        deadlines, retries, hedged requests and circuit breaking.
+
+    The credentials file is expected to contain three lines, not starting with #
+    username = "user"
+    password = "something secret"
+    wsdl = "https://some/web/serice/"
+
+    The username and password are optional, but would need to supplied in the script.
+    '''
+    
+    def __init__(self, wsdl=None, credentials=None, max_workers=8, metrics=None, response_cache=None,
+                 archive=None, resilience=None):
+        if credentials:
+            cr = CredentialsReader(credentials)
+            self.username, self.password, wsdl = cr.get_credentials()
+        else:
+            self.username, self.password = None, None
+        self.max_workers = max_workers
+        self.metrics = metrics
+        self.response_cache = response_cache
+        self.archive = archive
+        self.resilience = resilience
+        self.service = self._resilient(self.service_factory(wsdl))
+
+    def service_factory(self, wsdl):
+        client = get_client(wsdl)
+        service = client.service.getXml
+        return service
+
+    def _resilient(self, service):
+        # Returns the service, called under the resilience policy if there is one.
+        if self.resilience is None or service is None:
+            return service
+        return self.resilience.wrap(service, "getXml")
+
+    def platform_info_factory(self):
+        ''' Creates an ArgosPlatformInfo object using the shared service
+
+        Returns
+        -------
+        ArgosPlatformInfo
+        '''
+        platform_info = ArgosPlatformInfo(service=self.service, metrics=self.metrics,
+                                          response_cache=self.response_cache, archive=self.archive)
+        platform_info.username, platform_info.password = self.username, self.password
+        return platform_info
+    
+    def retrieve_many(self, platform_ids, username=None, password=None, number_of_days_from_now=1,
+                      max_workers=None, latest_only=False, minimum_quality_flag=CRC, output="dict", fields=None):
+        ''' Retrieves information for a number of platforms concurrently
+
+        Parameters
+        ----------
+        platform_ids : list of string
+            platform identifiers
+        username : string
+            username
+        password : string
+            password
+        number_of_days_from_now : int (optional) Default : 1
+            the number of days in the past for which data is to be retrieved. Maximum value is 20.
+        max_workers : int or None (optional) Default : None
+            maximum number of concurrent requests. If None, the value given to the constructor is used.
+        latest_only : bool (optional) Default : False
+            passed on to ArgosPlatformInfo.get_info()
+        minimum_quality_flag : int (optional) Default : CRC
+            passed on to ArgosPlatformInfo.get_info()
+        output : {"dict", "records", "columns"} (optional) Default : "dict"
+            passed on to ArgosPlatformInfo.get_info()
+        fields : iterable of string or None (optional) Default : None
+            passed on to ArgosPlatformInfo.retrieve()
+
+        Returns
+        -------
+        dict
+           FleetResult for each platform identifier, in the order given.
+
+        A failure to retrieve or process the data of one platform is
+        recorded in its FleetResult, and does not affect the others.
+        '''
+        username = username or self.username
+        password = password or self.password
+        if username is None or password is None:
+            raise ValueError('No credentials are supplied. Cannot continue.')
+        platform_ids = list(dict.fromkeys(platform_ids))
+        max_workers = max_workers or self.max_workers
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(self._retrieve_one, platformId, username, password,
+                                       number_of_days_from_now, latest_only, minimum_quality_flag, output, fields)
+                       for platformId in platform_ids]
+            return dict((r.platformId, r) for r in (f.result() for f in futures))
+
+    def retrieve_frame(self, platform_ids, username=None, password=None, number_of_days_from_now=1,
+                       max_workers=None, latest_only=False, minimum_quality_flag=CRC, fields=None,
+                       library="pandas"):
+        ''' Retrieves information for a number of platforms as a single data frame
+
+        Parameters
+        ----------
+        library : {"pandas", "arrow"} (optional) Default : "pandas"
+            kind of frame returned
+
+        See retrieve_many() for the other parameters, and argosFrame for the columns.
+
+        Returns
+        -------
+        pandas.DataFrame or pyarrow.Table
+            one row per satellite pass, by platform in the order given and latest first
+
+        Platforms whose retrieval failed are left out; the failure is logged.
+        '''
+        from . import argosFrame
+        if library not in argosFrame.LIBRARIES:
+            raise ValueError(f"Unknown library {library!r}. Choose from {argosFrame.LIBRARIES}.")
+        results = self.retrieve_many(platform_ids, username, password, number_of_days_from_now, max_workers,
+                                     latest_only, minimum_quality_flag, "columns", fields)
+        return argosFrame.fleet_frame(results, library)
+
+    def retrieve_program(self, program_info, programNumber=None, **kwds):
+        ''' Retrieves information for all platforms of a program
+
+        Parameters
+        ----------
+        program_info : ArgosProgramInfo
+            object on which retrieve() has been called
+        programNumber : string or None (optional) Default : None
+            program number. If None, the platforms of all programs are retrieved.
+        **kwds : 
+            further keywords are passed on to retrieve_many()
+
+        Returns
+        -------
+        dict
+           FleetResult for each platform identifier
+        '''
+        if programNumber is None:
+            programNumbers = program_info.get_programs()
+        else:
+            programNumbers = [programNumber]
+        platform_ids = chain(*[program_info.get_platforms(p) for p in programNumbers])
+        return self.retrieve_many(platform_ids, **kwds)
+
+    def _retrieve_one(self, platformId, username, password, number_of_days_from_now,
+                      latest_only, minimum_quality_flag, output, fields):
+        try:
+            platform_info = self.platform_info_factory()
+            platform_info.retrieve(platformId, username, password, number_of_days_from_now, fields)
+            info = platform_info.get_info(latest_only=latest_only,
+                                          minimum_quality_flag=minimum_quality_flag, output=output)
+        except Exception as e:
+            logger.error(f"Failed to retrieve information for platform {platformId}: {e!r}")
+            return FleetResult(platformId, None, e)
+        return FleetResult(platformId, info, None)
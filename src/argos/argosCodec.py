@@ -0,0 +1,279 @@
+''' Payload codec profiles
+
+A codec profile describes the layout of the hexadecimal payload an
+instrument transmits: an ordered list of fields, each with a width in
+hexadecimal digits, a signedness and a scale factor. The payload is
+followed by a two-digit 8 bit checksum. A field can be marked as a time
+field, by giving the epoch (in seconds since 1970-01-01) its value
+counts from. The first time field is used for the date of a message.
+
+Profiles are compiled once into a CompiledCodec, which holds the
+precomputed offsets, shifts, masks and factors, and a numpy dtype for
+batch decoding. Compiled codecs are cached.
+
+Decoders are selected per platform: platforms that are not assigned a
+profile with set_platform_profile() use the default profile, which is the
+layout of the Slocum glider messages.
+'''
+
+import functools
+import re
+import threading
+from collections import namedtuple
+
+
+CodecField = namedtuple("CodecField", ["name", "size", "signed", "factor", "epoch"],
+                        defaults=[False, 1., None])
+CodecField.__doc__ = ''' Field of a payload
+
+Parameters
+----------
+name : string
+    name of the field
+size : int
+    number of hexadecimal digits
+signed : bool (optional) Default : False
+    if True, values with a leading digit larger than 8 are negative
+factor : float (optional) Default : 1.
+    scale factor applied to the integer value
+epoch : float or None (optional) Default : None
+    if not None, the field is a time in seconds since this epoch, given in seconds since 1970-01-01
+'''
+
+CodecProfile = namedtuple("CodecProfile", ["name", "fields"])
+CodecProfile.__doc__ = ''' Layout of a payload
+
+Parameters
+----------
+name : string
+    name of the profile
+fields : tuple of CodecField
+    fields of the payload, in the order they are transmitted
+'''
+
+# Number of hexadecimal digits of the checksum that terminates each payload
+CRC_SIZE = 2
+
+GLIDER = CodecProfile("glider",
+                      (CodecField("present_time"  , 8, False, 1., 0),
+                       CodecField("lat"           , 6, True , 0.01),
+                       CodecField("lon"           , 6, True , 0.01),
+                       CodecField("fixtime"       , 4, False, 1.),
+                       CodecField("latInvalid"    , 6, True , 0.01),
+                       CodecField("lonInvalid"    , 6, True , 0.01),
+                       CodecField("fixtimeInvalid", 4, False, 1.),
+                       CodecField("latToofar"     , 6, True , 0.01),
+                       CodecField("lonToofar"     , 6, True , 0.01),
+                       CodecField("fixtimeToofar" , 4, True , 1.),
+                       CodecField("U"             , 2, True , 0.05),
+                       CodecField("V"             , 2, True , 0.05)))
+
+DEFAULT_PROFILE = GLIDER.name
+
+_profiles = {GLIDER.name: GLIDER}
+_platform_profiles = {}
+_lock = threading.Lock()
+
+
+# Payloads, as accepted by CompiledCodec.decode()
+_HEX_DIGITS = re.compile(r'[0-9A-Fa-f]*')
+
+
+class CompiledCodec(object):
+    ''' Precomputed decoder for a codec profile
+
+    Parameters
+    ----------
+    profile : CodecProfile
+        profile to compile
+
+    Use compile_profile() rather than this class directly, so that
+    compiled codecs are cached.
+    '''
+    def __init__(self, profile):
+        self.profile = profile
+        self.names = tuple(f.name for f in profile.fields)
+        self.sizes = tuple(f.size for f in profile.fields)
+        self.offsets = tuple(sum(self.sizes[:i]) for i in range(len(self.sizes)))
+        self.length = sum(self.sizes) + CRC_SIZE
+        if self.length % 2:
+            raise ValueError(f"Codec profile '{profile.name}' does not describe a whole number of octets.")
+        self.shifts = tuple(4*(self.length - o - n) for o, n in zip(self.offsets, self.sizes))
+        self.masks = tuple(16**n - 1 for n in self.sizes)
+        # Signed values are negative if the leading digit is larger than 8.
+        self.thresholds = tuple(9*16**(n-1) if f.signed else 16**n
+                                for f, n in zip(profile.fields, self.sizes))
+        self.moduli = tuple(16**n for n in self.sizes)
+        self.factors = tuple(float(f.factor) for f in profile.fields)
+        self.signed = tuple(f.signed for f in profile.fields)
+        time_fields = [f for f in profile.fields if f.epoch is not None]
+        self.time_field = time_fields[0].name if time_fields else None
+        self.epoch = time_fields[0].epoch if time_fields else None
+        self.fields = tuple(zip(self.names, self.shifts, self.masks, self.thresholds,
+                                self.moduli, self.factors))
+        self._selections = dict()
+
+    @functools.cached_property
+    def dtype(self):
+        ''' numpy dtype of batch decoded messages '''
+        import numpy as np
+        dtype = [(k, np.float64) for k in self.names] + [('crc', np.bool_)]
+        if self.time_field:
+            dtype.append(('date', 'U20'))
+        return np.dtype(dtype)
+
+    def select(self, names):
+        ''' Returns the indices of a selection of fields, in the order of the profile
+
+        Parameters
+        ----------
+        names : iterable of string
+            names of fields. Names that are not fields of the profile are ignored.
+
+        Returns
+        -------
+        tuple of int
+        '''
+        names = frozenset(names)
+        selection = self._selections.get(names)
+        if selection is None:
+            selection = self._selections[names] = tuple(i for i, k in enumerate(self.names) if k in names)
+        return selection
+
+    def decode(self, message, names=None):
+        ''' Decodes the fields of a message
+
+        Parameters
+        ----------
+        message : str
+            hexadecimal payload
+        names : iterable of string or None (optional) Default : None
+            names of the fields to decode. If None, all fields are decoded.
+
+        Returns
+        -------
+        dict
+            scaled value of each field
+
+        Messages that are shorter or longer than the profile prescribes
+        are decoded field by field, as far as they go; missing fields are 0.
+        A ValueError is raised if the message has characters that are not
+        hexadecimal digits, as int() would otherwise accept underscores and
+        surrounding whitespace.
+        '''
+        if not _HEX_DIGITS.fullmatch(message):
+            raise ValueError(f"Payload {message!r} is not hexadecimal.")
+        if len(message) != self.length:
+            return self._decode_fieldwise(message, names)
+        fields = self.fields if names is None else [self.fields[i] for i in self.select(names)]
+        value = int(message, 16)
+        data = dict()
+        for name, shift, mask, threshold, modulus, factor in fields:
+            x = (value >> shift) & mask
+            if x >= threshold:
+                x -= modulus
+            data[name] = x*factor
+        return data
+
+    def _decode_fieldwise(self, message, names=None):
+        data = dict()
+        for name, offset, size, signed, factor in zip(self.names, self.offsets, self.sizes,
+                                                       self.signed, self.factors):
+            if names is not None and name not in names:
+                continue
+            x = message[offset:offset+size]
+            if x == "":
+                xn = 0
+            elif signed and x[0] > '8':
+                xn = int(x, 16) - 16**size
+            else:
+                xn = int(x, 16)
+            data[name] = xn*factor
+        return data
+
+
+def register_profile(profile):
+    ''' Registers a codec profile
+
+    Parameters
+    ----------
+    profile : CodecProfile
+        profile to register. A profile with the same name is replaced.
+    '''
+    profile = CodecProfile(profile.name, tuple(CodecField(*f) for f in profile.fields))
+    if not profile.fields or any(f.size < 1 for f in profile.fields):
+        raise ValueError(f"Codec profile '{profile.name}' has fields without digits.")
+    with _lock:
+        _profiles[profile.name] = profile
+
+
+def get_profile(profile=None):
+    ''' Gets a codec profile
+
+    Parameters
+    ----------
+    profile : string, CodecProfile or None (optional) Default : None
+        name of a registered profile, or a profile. If None, the default profile is returned.
+
+    Returns
+    -------
+    CodecProfile
+    '''
+    if profile is None:
+        profile = DEFAULT_PROFILE
+    if isinstance(profile, CodecProfile):
+        return CodecProfile(profile.name, tuple(profile.fields))
+    try:
+        return _profiles[profile]
+    except KeyError:
+        raise ValueError(f"Unknown codec profile '{profile}'.")
+
+
+def set_platform_profile(platformId, profile):
+    ''' Assigns a codec profile to a platform
+
+    Parameters
+    ----------
+    platformId : string
+        platform identifier
+    profile : string or CodecProfile or None
+        name of a registered profile, or a profile. If None, the platform
+        reverts to the default profile.
+    '''
+    with _lock:
+        if profile is None:
+            _platform_profiles.pop(platformId, None)
+        else:
+            _platform_profiles[platformId] = get_profile(profile)
+
+
+def platform_profile(platformId):
+    ''' Gets the codec profile of a platform
+
+    Parameters
+    ----------
+    platformId : string
+        platform identifier
+
+    Returns
+    -------
+    CodecProfile
+    '''
+    return _platform_profiles.get(platformId) or get_profile()
+
+
+@functools.lru_cache(maxsize=None)
+def compile_profile(profile):
+    ''' Compiles a codec profile
+
+    Parameters
+    ----------
+    profile : CodecProfile
+        profile to compile
+
+    Returns
+    -------
+    CompiledCodec
+        compiled codec, cached for each distinct profile.
+    '''
+    return CompiledCodec(profile)
@@ -0,0 +1,147 @@
+import heapq
+import json
+import logging
+import random
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from . import argosClient
+from . import argosStore
+
+logger = logging.getLogger("Argos")
+
+# Longest time in seconds the scheduler sleeps before checking whether it should stop
+MAX_SLEEP = 1.0
+
+
+class JsonLinesSink(object):
+    ''' Writes fixes as JSON lines
+
+    Parameters
+    ----------
+    fp : file object or None (optional) Default : None
+        file to write to. If None, sys.stdout is used.
+
+    Each line holds a dictionary as returned by ArgosPlatformInfo.get_info(),
+    with the platform identifier added under the key platformId. Lines are
+    flushed as they are written. The sink can be shared by several threads.
+    '''
+    def __init__(self, fp=None):
+        self.fp = fp or sys.stdout
+        self.lock = threading.Lock()
+
+    def __call__(self, platformId, info):
+        line = json.dumps(dict(platformId=platformId, **info))
+        with self.lock:
+            self.fp.write(line + "\n")
+            self.fp.flush()
+
+
+class ArgosDaemon(object):
+    ''' Polls a number of platforms at regular intervals
+
+    Parameters
+    ----------
+    fleet : argosClient.ArgosFleetClient
+        client providing the shared webservice and credentials
+    platform_ids : list of string
+        platform identifiers to poll
+    sink : callable
+        called as sink(platformId, info) for each new fix
+    store : argosStore.ArgosPassStore or None (optional) Default : None
+        store of seen satellite passes. If None, an in-memory store is used.
+    interval : float (optional) Default : 600
+        time in seconds between polls of a platform
+    jitter : float (optional) Default : 0.1
+        relative random variation of the interval, which spreads the
+        requests of different platforms over time
+    max_concurrency : int (optional) Default : 4
+        maximum number of concurrent requests to the webservice
+    max_backoff : float (optional) Default : 3600
+        maximum time in seconds to wait before polling a failing platform again
+    minimum_quality_flag : int (optional) Default : argosClient.CRC
+        fixes with a lower quality flag are not passed on to the sink
+
+    After a failed poll, the platform is polled again after twice the
+    interval. The delay doubles with each consecutive failure, up to max_backoff.
+    '''
+    def __init__(self, fleet, platform_ids, sink, store=None, interval=600, jitter=0.1,
+                 max_concurrency=4, max_backoff=3600, minimum_quality_flag=argosClient.CRC):
+        self.fleet = fleet
+        self.platform_ids = list(dict.fromkeys(platform_ids))
+        self.sink = sink
+        self.store = store or argosStore.ArgosPassStore()
+        self.interval = interval
+        self.jitter = jitter
+        self.max_concurrency = max_concurrency
+        self.max_backoff = max_backoff
+        self.minimum_quality_flag = minimum_quality_flag
+        self.failures = dict((p, 0) for p in self.platform_ids)
+        self.number_of_polls = 0
+        self._queue = []
+        self._stop = threading.Event()
+
+    def stop(self):
+        ''' Makes run() return, once the polls in progress have finished '''
+        self._stop.set()
+
+    def run(self, duration=None):
+        ''' Runs the polling loop
+
+        Parameters
+        ----------
+        duration : float or None (optional) Default : None
+            time in seconds after which to return. If None, the loop runs until stop() is called.
+        '''
+        self._stop.clear()
+        now = time.monotonic()
+        end = None if duration is None else now + duration
+        # Spread the first polls over a fraction of the interval.
+        self._queue = [(now + random.uniform(0, self.jitter*self.interval), p) for p in self.platform_ids]
+        heapq.heapify(self._queue)
+        running = dict()
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            while not self._stop.is_set():
+                now = time.monotonic()
+                if end is not None and now >= end:
+                    break
+                while self._queue and self._queue[0][0] <= now and len(running) < self.max_concurrency:
+                    _, platformId = heapq.heappop(self._queue)
+                    running[executor.submit(self._poll, platformId)] = platformId
+                timeout = MAX_SLEEP
+                if self._queue and len(running) < self.max_concurrency:
+                    timeout = min(timeout, max(self._queue[0][0] - now, 0))
+                if end is not None:
+                    timeout = min(timeout, max(end - now, 0))
+                if running:
+                    done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self._reschedule(running.pop(future), future)
+                else:
+                    self._stop.wait(timeout)
+            for future in list(running):
+                future.exception()
+                self._reschedule(running.pop(future), future)
+
+    def _poll(self, platformId):
+        platform_info = self.fleet.platform_info_factory()
+        new = platform_info.poll(platformId, self.store, minimum_quality_flag=self.minimum_quality_flag)
+        for info in reversed(new):
+            self.sink(platformId, info)
+        return len(new)
+
+    def _reschedule(self, platformId, future):
+        self.number_of_polls += 1
+        error = future.exception()
+        if error is None:
+            self.failures[platformId] = 0
+            delay = self.interval
+        else:
+            self.failures[platformId] += 1
+            delay = min(self.interval * 2**self.failures[platformId], self.max_backoff)
+            logger.warning(f"Polling platform {platformId} failed ({error!r}). "
+                           f"Retrying in {delay:.0f} s.")
+        delay *= 1 + random.uniform(-self.jitter, self.jitter)
+        heapq.heappush(self._queue, (time.monotonic() + delay, platformId))
@@ -0,0 +1,372 @@
+''' Streaming export of fixes
+
+The writers of this module take the information of satellite passes one
+at a time, as yielded by ArgosPlatformInfo.iter_info() or read from the
+JSON lines files written by the daemon and by reprocessing, and write
+them without keeping them in memory. Formats:
+
+    CsvWriter         comma separated values, one row per fix
+    JsonLinesWriter   one JSON object per line, as returned by get_info()
+    GeoJsonWriter     a GeoJSON FeatureCollection, one Point per fix
+    NetCDFWriter      a NetCDF4 file with a variable per column (needs netCDF4)
+    ParquetWriter     a Parquet file with a column per field (needs pyarrow)
+
+Except for JsonLinesWriter, fixes are flattened into the columns
+
+    platformId, argos_latitude, argos_longitude, argos_date,
+    the fields of the GPS location (see gps_fields()), gps_location_qf
+
+The Argos latitude and longitude are in decimal degrees; the GPS latitude
+and longitude are kept in DDMM.mm, as decoded. NetCDFWriter and
+ParquetWriter collect batch_size fixes before appending them to the file.
+
+export() selects a writer by the extension of the file name:
+
+    with open("fixes.jsonl") as fp:
+        export(iter_json_lines(fp), "fixes.parquet")
+'''
+
+import csv
+import json
+import math
+import os
+
+from . import argosClient
+from . import argosCodec
+from . import argosMessage
+
+# Number of fixes written at once by the batched writers
+BATCH_SIZE = 10000
+
+
+def gps_fields(profile=None):
+    ''' Returns the names of the fields of decoded GPS locations
+
+    Parameters
+    ----------
+    profile : string, argosCodec.CodecProfile or None (optional) Default : None
+        codec profile. If None, the default profile is used.
+
+    Returns
+    -------
+    tuple of string
+    '''
+    codec = argosCodec.compile_profile(argosCodec.get_profile(profile))
+    return codec.names + ('crc',) + (('date',) if codec.time_field else ())
+
+
+def flatten(info, fields, platformId=None):
+    ''' Flattens the information of a satellite pass into a row
+
+    Parameters
+    ----------
+    info : dict
+        information of a satellite pass, as returned by ArgosPlatformInfo.get_info()
+    fields : tuple of string
+        fields of the GPS location, see gps_fields()
+    platformId : string or None (optional) Default : None
+        platform identifier. If None, info['platformId'] is used, if present.
+
+    Returns
+    -------
+    dict
+        values of the columns. Missing values are None.
+    '''
+    argos_location = info['argos_location']
+    gps_location = info['gps_location']
+    row = dict(platformId=platformId or info.get('platformId'))
+    if argos_location:
+        row['argos_latitude'] = float(argos_location['latitude'])
+        row['argos_longitude'] = float(argos_location['longitude'])
+        row['argos_date'] = argos_location['date']
+    else:
+        row['argos_latitude'] = row['argos_longitude'] = row['argos_date'] = None
+    for k in fields:
+        row[k] = gps_location.get(k)
+    row['gps_location_qf'] = info['gps_location_qf']
+    return row
+
+
+def iter_json_lines(fp):
+    ''' Iterates over the fixes of a JSON lines file written by the daemon or by reprocessing
+
+    Parameters
+    ----------
+    fp : file object
+        file opened for reading
+
+    Yields
+    ------
+    dict
+    '''
+    for line in fp:
+        if line.strip():
+            yield json.loads(line)
+
+
+class FixWriter(object):
+    ''' Base class of the writers
+
+    Parameters
+    ----------
+    filename : string
+        name of the file to write
+    profile : string, argosCodec.CodecProfile or None (optional) Default : None
+        codec profile of the payloads, which determines the columns
+
+    Writers are context managers, which close the file on exit.
+    '''
+    def __init__(self, filename, profile=None):
+        self.filename = filename
+        self.fields = gps_fields(profile)
+        self.columns = ('platformId', 'argos_latitude', 'argos_longitude', 'argos_date') \
+            + self.fields + ('gps_location_qf',)
+        self.number_of_fixes = 0
+
+    def write(self, info, platformId=None):
+        ''' Writes a fix
+
+        Parameters
+        ----------
+        info : dict or argosRecords.Fix
+            information of a satellite pass, as returned by ArgosPlatformInfo.get_info()
+        platformId : string or None (optional) Default : None
+            platform identifier. If None, info['platformId'] is used, if present.
+        '''
+        if hasattr(info, 'to_dict'):
+            info = info.to_dict()
+        self._write(info, platformId)
+        self.number_of_fixes += 1
+
+    def write_all(self, infos, platformId=None):
+        ''' Writes all fixes of an iterable
+
+        Returns
+        -------
+        int
+            number of fixes written
+        '''
+        n = self.number_of_fixes
+        for info in infos:
+            self.write(info, platformId)
+        return self.number_of_fixes - n
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _write(self, info, platformId):
+        raise NotImplementedError
+
+
+class CsvWriter(FixWriter):
+    ''' Writes fixes as comma separated values, with a header line. Missing values are empty. '''
+    def __init__(self, filename, profile=None):
+        super().__init__(filename, profile)
+        self.fp = open(filename, 'w', newline='')
+        self.writer = csv.DictWriter(self.fp, self.columns)
+        self.writer.writeheader()
+
+    def _write(self, info, platformId):
+        self.writer.writerow(flatten(info, self.fields, platformId))
+
+    def close(self):
+        self.fp.close()
+
+
+class JsonLinesWriter(FixWriter):
+    ''' Writes fixes as JSON lines, in the form of ArgosPlatformInfo.get_info(), with platformId added '''
+    def __init__(self, filename, profile=None):
+        super().__init__(filename, profile)
+        self.fp = open(filename, 'w')
+
+    def _write(self, info, platformId):
+        if platformId is not None:
+            info = dict(platformId=platformId, **info)
+        self.fp.write(json.dumps(info) + "\n")
+
+    def close(self):
+        self.fp.close()
+
+
+class GeoJsonWriter(FixWriter):
+    ''' Writes fixes as a GeoJSON FeatureCollection of Points
+
+    The position of a fix is the GPS location if its quality flag is at
+    least minimum_quality_flag and latitude and longitude are available,
+    otherwise the Argos location, if any. The property position_source
+    tells which ("gps", "argos" or null). All columns are included as properties.
+    '''
+    def __init__(self, filename, profile=None, minimum_quality_flag=argosClient.CRC):
+        super().__init__(filename, profile)
+        self.minimum_quality_flag = minimum_quality_flag
+        self.fp = open(filename, 'w')
+        self.fp.write('{"type": "FeatureCollection", "features": [\n')
+
+    def _write(self, info, platformId):
+        row = flatten(info, self.fields, platformId)
+        geometry, row['position_source'] = None, None
+        latitude = argosMessage.ddmm_to_degrees(row.get('lat'))
+        longitude = argosMessage.ddmm_to_degrees(row.get('lon'))
+        if row['gps_location_qf'] >= self.minimum_quality_flag and not (math.isnan(latitude) or math.isnan(longitude)):
+            geometry, row['position_source'] = dict(type="Point", coordinates=[longitude, latitude]), "gps"
+        elif row['argos_date'] is not None:
+            geometry = dict(type="Point", coordinates=[row['argos_longitude'], row['argos_latitude']])
+            row['position_source'] = "argos"
+        separator = ",\n" if self.number_of_fixes else ""
+        self.fp.write(separator + json.dumps(dict(type="Feature", geometry=geometry, properties=row)))
+
+    def close(self):
+        if not self.fp.closed:
+            self.fp.write("\n]}\n")
+            self.fp.close()
+
+
+class _BatchWriter(FixWriter):
+    # Collects rows column by column, and passes them on to
+    # _write_batch() every batch_size rows.
+    def __init__(self, filename, profile=None, batch_size=BATCH_SIZE):
+        super().__init__(filename, profile)
+        self.batch_size = batch_size
+        self._batch = dict((k, []) for k in self.columns)
+        self._batch_length = 0
+
+    def _write(self, info, platformId):
+        row = flatten(info, self.fields, platformId)
+        for k, column in self._batch.items():
+            column.append(row[k])
+        self._batch_length += 1
+        if self._batch_length >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        ''' Appends the collected fixes to the file '''
+        if self._batch_length:
+            self._write_batch(self._batch)
+            for column in self._batch.values():
+                column.clear()
+            self._batch_length = 0
+
+    def close(self):
+        self.flush()
+
+    def _column_kind(self, k):
+        # "str", "bool", "int" or "float"
+        if k in ('platformId', 'argos_date', 'date'):
+            return "str"
+        if k == 'crc':
+            return "bool"
+        if k == 'gps_location_qf':
+            return "int"
+        return "float"
+
+
+class NetCDFWriter(_BatchWriter):
+    ''' Writes fixes to a NetCDF4 file, along the unlimited dimension fix
+
+    Strings are stored as variable-length strings, crc as a byte (-1 if
+    missing), and missing floating point values as NaN. Needs the netCDF4 package.
+    '''
+    def __init__(self, filename, profile=None, batch_size=BATCH_SIZE):
+        import netCDF4
+        super().__init__(filename, profile, batch_size)
+        self.dataset = netCDF4.Dataset(filename, 'w', format="NETCDF4")
+        self.dataset.createDimension("fix", None)
+        for k in self.columns:
+            kind = self._column_kind(k)
+            if kind == "str":
+                self.dataset.createVariable(k, str, ("fix",))
+            elif kind == "bool":
+                self.dataset.createVariable(k, 'i1', ("fix",), fill_value=-1)
+            elif kind == "int":
+                self.dataset.createVariable(k, 'i1', ("fix",))
+            else:
+                self.dataset.createVariable(k, 'f8', ("fix",), fill_value=math.nan)
+        self.dataset.setncattr("source", "argos")
+        self._length = 0
+
+    def _write_batch(self, batch):
+        import numpy as np
+        start, end = self._length, self._length + self._batch_length
+        for k, values in batch.items():
+            kind = self._column_kind(k)
+            if kind == "str":
+                data = np.array([v or "" for v in values], dtype=object)
+            elif kind == "bool":
+                data = np.array([-1 if v is None else int(v) for v in values], dtype=np.int8)
+            elif kind == "int":
+                data = np.array(values, dtype=np.int8)
+            else:
+                data = np.array([math.nan if v is None else v for v in values], dtype=np.float64)
+            self.dataset.variables[k][start:end] = data
+        self._length = end
+
+    def close(self):
+        if self.dataset.isopen():
+            super().close()
+            self.dataset.close()
+
+
+class ParquetWriter(_BatchWriter):
+    ''' Writes fixes to a Parquet file, one row group per batch
+
+    Missing values are nulls. Needs the pyarrow package.
+    '''
+    def __init__(self, filename, profile=None, batch_size=BATCH_SIZE):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        super().__init__(filename, profile, batch_size)
+        types = dict(str=pa.string(), bool=pa.bool_(), int=pa.int8(), float=pa.float64())
+        self.schema = pa.schema([(k, types[self._column_kind(k)]) for k in self.columns])
+        self.writer = pq.ParquetWriter(filename, self.schema)
+
+    def _write_batch(self, batch):
+        import pyarrow as pa
+        self.writer.write_table(pa.Table.from_pydict(batch, schema=self.schema))
+
+    def close(self):
+        if self.writer.is_open:
+            super().close()
+            self.writer.close()
+
+
+WRITERS = {".csv": CsvWriter,
+           ".jsonl": JsonLinesWriter,
+           ".geojson": GeoJsonWriter,
+           ".nc": NetCDFWriter,
+           ".parquet": ParquetWriter}
+
+
+def export(infos, filename, platformId=None, profile=None, **kwds):
+    ''' Writes fixes to a file, in the format given by the extension of its name
+
+    Parameters
+    ----------
+    infos : iterable of dict or argosRecords.Fix
+        information of satellite passes
+    filename : string
+        name of the file to write. The extension selects the writer, see WRITERS.
+    platformId : string or None (optional) Default : None
+        platform identifier, if not given in the fixes
+    profile : string, argosCodec.CodecProfile or None (optional) Default : None
+        codec profile of the payloads
+    **kwds :
+        further keywords are passed on to the writer
+
+    Returns
+    -------
+    int
+        number of fixes written
+    '''
+    extension = os.path.splitext(filename)[1].lower()
+    try:
+        writer_class = WRITERS[extension]
+    except KeyError:
+        raise ValueError(f"Unknown export format {extension!r}. Known formats: {', '.join(WRITERS)}.")
+    with writer_class(filename, profile=profile, **kwds) as writer:
+        return writer.write_all(infos, platformId)
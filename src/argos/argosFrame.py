@@ -0,0 +1,151 @@
+''' Data frames of fixes
+
+ArgosPlatformInfo.get_frame() and ArgosFleetClient.retrieve_frame()
+return the fixes of one or many platforms as a pandas DataFrame or a
+pyarrow Table, with a row per satellite pass. The satellite passes are
+collected into typed column buffers while the response is parsed
+(argosRecords.ColumnBuilder), and the payloads decoded in one go. The
+selection of a satellite pass still makes a small dictionary of its
+Argos location, which is dropped once appended; no dictionary of the
+decoded GPS location, nor of the satellite pass, is made. The columns are
+
+    platformId         platform identifier (categorical in pandas,
+                       dictionary encoded in Arrow)
+    argos_latitude     latitude of the Argos location in decimal degrees
+    argos_longitude    longitude of the Argos location in decimal degrees
+    argos_date         date of the Argos location
+    the fields of the GPS location, as decoded (the GPS latitude and
+    longitude in DDMM.mm), and crc
+    date               time of the GPS location, if the codec profile has a time field
+    gps_location_qf    quality flag
+
+Dates are datetime64[ms], in UTC. Missing values are NaN and NaT in
+pandas, and nulls in Arrow. Fields of the GPS location are missing, and
+crc False, where no payload was selected.
+
+to_frame() and fleet_frame() convert the columns returned by
+get_info(output="columns") and retrieve_many(output="columns"). Neither
+pandas nor pyarrow is needed by the rest of the package; they are
+imported when a frame is made.
+'''
+
+import numpy as np
+
+from . import argosClient
+
+# Libraries frames can be made for
+LIBRARIES = ("pandas", "arrow")
+
+
+def frame_columns(columns):
+    ''' Returns the columns of the frame of the fixes of a platform
+
+    Parameters
+    ----------
+    columns : argosRecords.FixColumns
+        fixes of the platform
+
+    Returns
+    -------
+    dict
+        numpy array of each column except platformId, in the order of the frame
+    '''
+    codec = columns.codec
+    result = dict(argos_latitude=columns['argos_latitude'],
+                  argos_longitude=columns['argos_longitude'],
+                  argos_date=_parse_dates(columns['argos_date']))
+    for k in columns.names:
+        result[k] = columns[k]
+    if codec.time_field and codec.time_field in columns.names:
+        result['date'] = _to_datetime64(columns[codec.time_field] + codec.epoch)
+    result['gps_location_qf'] = columns['gps_location_qf']
+    return result
+
+
+def to_frame(columns, platformId=None, library="pandas"):
+    ''' Returns the fixes of a platform as a data frame
+
+    Parameters
+    ----------
+    columns : argosRecords.FixColumns
+        fixes of the platform, as returned by ArgosPlatformInfo.get_info(output="columns")
+    platformId : string or None (optional) Default : None
+        platform identifier
+    library : {"pandas", "arrow"} (optional) Default : "pandas"
+        kind of frame returned
+
+    Returns
+    -------
+    pandas.DataFrame or pyarrow.Table
+    '''
+    return fleet_frame({platformId: columns}, library)
+
+
+def fleet_frame(fleet, library="pandas"):
+    ''' Returns the fixes of a fleet of platforms as a single data frame
+
+    Parameters
+    ----------
+    fleet : dict
+        fixes of each platform identifier, as argosRecords.FixColumns or
+        as the argosClient.FleetResult holding them. Platforms whose
+        retrieval failed are left out.
+    library : {"pandas", "arrow"} (optional) Default : "pandas"
+        kind of frame returned
+
+    Returns
+    -------
+    pandas.DataFrame or pyarrow.Table
+        fixes by platform, in the order given
+    '''
+    if library not in LIBRARIES:
+        raise ValueError(f"Unknown library {library!r}. Choose from {LIBRARIES}.")
+    platform_ids = []
+    parts = []
+    for platformId, columns in fleet.items():
+        if isinstance(columns, argosClient.FleetResult):
+            columns = columns.info
+        if columns is None:
+            continue
+        parts.append(frame_columns(columns))
+        platform_ids.append(platformId)
+    if not parts:
+        parts.append(dict(argos_latitude=np.zeros(0), argos_longitude=np.zeros(0),
+                          argos_date=np.zeros(0, dtype='datetime64[ms]'),
+                          gps_location_qf=np.zeros(0, dtype=np.int8)))
+    names = list(parts[0])
+    if any(list(part) != names for part in parts):
+        raise ValueError("The fixes of all platforms must have the same columns.")
+    if len(parts) == 1:
+        data = parts[0]
+    else:
+        data = dict((k, np.concatenate([part[k] for part in parts])) for k in names)
+    codes = np.repeat(np.arange(len(platform_ids), dtype=np.int32),
+                      [len(part['gps_location_qf']) for part in parts[:len(platform_ids)]])
+    categories = [str(p) if p is not None else "" for p in platform_ids]
+    if library == "arrow":
+        import pyarrow as pa
+        arrays = [pa.DictionaryArray.from_arrays(pa.array(codes), pa.array(categories, pa.string()))]
+        arrays += [pa.array(data[k], from_pandas=True) for k in names]
+        return pa.table(arrays, names=['platformId'] + names)
+    import pandas as pd
+    frame = dict(platformId=pd.Categorical.from_codes(codes, categories=categories))
+    frame.update(data)
+    return pd.DataFrame(frame, copy=False)
+
+
+def _parse_dates(dates):
+    # Converts the bytes of Argos dates, as "2024-08-26T20:45:15.000Z",
+    # to datetime64. Missing dates are NaT.
+    result = np.full(len(dates), np.datetime64('NaT'), dtype='datetime64[ms]')
+    present = dates != b''
+    result[present] = np.char.rstrip(dates[present], b'Z').astype('U').astype('datetime64[ms]')
+    return result
+
+
+def _to_datetime64(seconds):
+    # Converts seconds since 1970-01-01 to datetime64. NaN is NaT.
+    present = np.isfinite(seconds)
+    result = np.full(len(seconds), np.datetime64('NaT'), dtype='datetime64[ms]')
+    result[present] = np.round(seconds[present]*1000).astype(np.int64).view('datetime64[ms]')
+    return result
@@ -0,0 +1,318 @@
+''' Time and spatial index of fixes
+
+FixIndex answers the questions "which fixes did platform X report
+between t0 and t1" and "which platforms were inside this box during this
+time" without scanning all fixes. Fixes are added as they arrive; the
+index is kept up to date incrementally.
+
+Each fix is placed at a time and a position:
+
+- the time of the GPS location (the time field of the codec profile) if
+  the quality flag is at least minimum_quality_flag and the time was
+  decoded, otherwise the date of the Argos location;
+- the GPS latitude and longitude, converted to decimal degrees, if the
+  quality flag is at least minimum_quality_flag and they are available,
+  otherwise the Argos location.
+
+Fixes without a time are not indexed. A FixIndex can be used as the
+sink of an argosDaemon.ArgosDaemon, to index fixes as they are polled.
+
+For each platform, the times are kept in an array, sorted, which is
+searched by bisection. For the spatial index, the world is divided into
+cells of cell_size degrees; each cell keeps the times, positions and
+fixes that fall in it, sorted by time. Fixes are appended as they are
+added. Responses list the latest fixes first, so arrays that received
+fixes out of order are sorted once, by the first query that needs them.
+'''
+
+import datetime
+import math
+import threading
+from array import array
+from bisect import bisect_left
+
+from . import argosClient
+from . import argosCodec
+from . import argosMessage
+
+
+def to_seconds(t):
+    ''' Converts a time to seconds since 1970-01-01
+
+    Parameters
+    ----------
+    t : float, string or None
+        seconds since 1970-01-01, or an ISO 8601 string as in responses
+
+    Returns
+    -------
+    float or None
+    '''
+    if t is None or isinstance(t, (int, float)):
+        return t
+    if t.endswith("Z"):
+        t = t[:-1] + "+00:00"
+    d = datetime.datetime.fromisoformat(t)
+    if d.tzinfo is None:
+        d = d.replace(tzinfo=datetime.timezone.utc)
+    return d.timestamp()
+
+
+class _Series(object):
+    # Fixes with their times and positions, in parallel arrays. sort()
+    # must be called before the series is searched.
+    __slots__ = ('times', 'latitudes', 'longitudes', 'platform_ids', 'fixes', 'is_sorted')
+
+    def __init__(self):
+        self.times = array('d')
+        self.latitudes = array('d')
+        self.longitudes = array('d')
+        self.platform_ids = []
+        self.fixes = []
+        self.is_sorted = True
+
+    def append(self, t, latitude, longitude, platformId, fix):
+        if self.times and t < self.times[-1]:
+            self.is_sorted = False
+        self.times.append(t)
+        self.latitudes.append(latitude)
+        self.longitudes.append(longitude)
+        self.platform_ids.append(platformId)
+        self.fixes.append(fix)
+
+    def sort(self):
+        # Sorts by time, if needed. Fixes with equal times stay in the
+        # order they were added.
+        if self.is_sorted:
+            return
+        order = sorted(range(len(self.times)), key=self.times.__getitem__)
+        self.times = array('d', [self.times[i] for i in order])
+        self.latitudes = array('d', [self.latitudes[i] for i in order])
+        self.longitudes = array('d', [self.longitudes[i] for i in order])
+        self.platform_ids = [self.platform_ids[i] for i in order]
+        self.fixes = [self.fixes[i] for i in order]
+        self.is_sorted = True
+
+    def span(self, start, end):
+        # Indices of the fixes with start <= t < end.
+        i0 = 0 if start is None else bisect_left(self.times, start)
+        i1 = len(self.times) if end is None else bisect_left(self.times, end)
+        return i0, i1
+
+
+class FixIndex(object):
+    ''' Time and spatial index of fixes
+
+    Parameters
+    ----------
+    cell_size : float (optional) Default : 1.0
+        size in degrees of the cells of the spatial index
+    profile : string, argosCodec.CodecProfile or None (optional) Default : None
+        codec profile of the payloads, which gives the time field
+    minimum_quality_flag : int (optional) Default : argosClient.CRC
+        GPS locations with a lower quality flag are not used as position
+
+    Times given to the queries can be seconds since 1970-01-01 or ISO 8601
+    strings. Time ranges include start and exclude end. The attribute
+    skipped counts the fixes that could not be indexed for lack of a time.
+    The index can be shared by several threads.
+    '''
+    def __init__(self, cell_size=1.0, profile=None, minimum_quality_flag=argosClient.CRC):
+        self.cell_size = cell_size
+        self.codec = argosCodec.compile_profile(argosCodec.get_profile(profile))
+        self.minimum_quality_flag = minimum_quality_flag
+        self.skipped = 0
+        self._platforms = dict()
+        self._cells = dict()
+        self._length = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return self._length
+
+    def add(self, info, platformId=None):
+        ''' Adds a fix
+
+        Parameters
+        ----------
+        info : dict
+            information of a satellite pass, as returned by ArgosPlatformInfo.get_info()
+        platformId : string or None (optional) Default : None
+            platform identifier. If None, info['platformId'] is used.
+
+        Returns
+        -------
+        bool
+            True if the fix was indexed
+        '''
+        with self.lock:
+            return self._add(info, platformId)
+
+    def __call__(self, platformId, info):
+        # Allows the index to be used as the sink of an argosDaemon.ArgosDaemon.
+        self.add(info, platformId)
+
+    def add_many(self, infos, platformId=None):
+        ''' Adds the fixes of an iterable
+
+        Returns
+        -------
+        int
+            number of fixes indexed
+        '''
+        with self.lock:
+            return sum(self._add(info, platformId) for info in infos)
+
+    def _add(self, info, platformId):
+        # Adds a fix. Must be called with the lock held.
+        platformId = platformId or info['platformId']
+        t, latitude, longitude = self.locate(info)
+        if t is None:
+            self.skipped += 1
+            return False
+        series = self._platforms.get(platformId)
+        if series is None:
+            series = self._platforms[platformId] = _Series()
+        series.append(t, latitude, longitude, platformId, info)
+        if not math.isnan(latitude):
+            key = self._cell(latitude, longitude)
+            cell = self._cells.get(key)
+            if cell is None:
+                cell = self._cells[key] = _Series()
+            cell.append(t, latitude, longitude, platformId, info)
+        self._length += 1
+        return True
+
+    def locate(self, info):
+        ''' Returns the time, latitude and longitude a fix is indexed at
+
+        Parameters
+        ----------
+        info : dict
+            information of a satellite pass
+
+        Returns
+        -------
+        (float or None, float, float)
+            time in seconds since 1970-01-01, and latitude and longitude in
+            decimal degrees. The time is None, and the position NaN, if not known.
+        '''
+        gps_location = info['gps_location']
+        argos_location = info['argos_location']
+        t = None
+        latitude = longitude = math.nan
+        # The payload of a satellite pass of low quality may be corrupt,
+        # and a selection of fields may leave its time out.
+        use_gps = bool(gps_location) and info['gps_location_qf'] >= self.minimum_quality_flag
+        if use_gps and self.codec.time_field in gps_location:
+            t = gps_location[self.codec.time_field] + self.codec.epoch
+        elif argos_location:
+            t = to_seconds(argos_location['date'])
+        if use_gps:
+            latitude = argosMessage.ddmm_to_degrees(gps_location.get('lat'))
+            longitude = argosMessage.ddmm_to_degrees(gps_location.get('lon'))
+        if (math.isnan(latitude) or math.isnan(longitude)) and argos_location:
+            latitude = float(argos_location['latitude'])
+            longitude = float(argos_location['longitude'])
+        return t, latitude, longitude
+
+    def platforms(self):
+        ''' Returns the identifiers of the platforms with indexed fixes '''
+        with self.lock:
+            return list(self._platforms)
+
+    def between(self, platformId, start=None, end=None):
+        ''' Returns the fixes of a platform in a time range, sorted by time
+
+        Parameters
+        ----------
+        platformId : string
+            platform identifier
+        start, end : float, string or None (optional) Default : None
+            start and end of the time range. None leaves the range open.
+
+        Returns
+        -------
+        list of dict
+        '''
+        start, end = to_seconds(start), to_seconds(end)
+        with self.lock:
+            series = self._platforms.get(platformId)
+            if series is None:
+                return []
+            series.sort()
+            i0, i1 = series.span(start, end)
+            return series.fixes[i0:i1]
+
+    def latest(self, platformId):
+        ''' Returns the latest fix of a platform, or None '''
+        with self.lock:
+            series = self._platforms.get(platformId)
+            if series is None:
+                return None
+            series.sort()
+            return series.fixes[-1]
+
+    def within(self, lat_min, lat_max, lon_min, lon_max, start=None, end=None):
+        ''' Returns the fixes inside a box, in a time range
+
+        Parameters
+        ----------
+        lat_min, lat_max : float
+            latitude range in decimal degrees
+        lon_min, lon_max : float
+            longitude range in decimal degrees. If lon_min is larger than
+            lon_max, the box crosses the 180th meridian.
+        start, end : float, string or None (optional) Default : None
+            start and end of the time range. None leaves the range open.
+
+        Returns
+        -------
+        list of (string, dict)
+            platform identifier and fix, sorted by platform and time
+        '''
+        start, end = to_seconds(start), to_seconds(end)
+        with self.lock:
+            if lon_min > lon_max:
+                found = self._within(lat_min, lat_max, lon_min, 180., start, end) \
+                    + self._within(lat_min, lat_max, -180., lon_max, start, end)
+            else:
+                found = self._within(lat_min, lat_max, lon_min, lon_max, start, end)
+        found.sort(key=lambda item: item[:2])
+        return [(platformId, fix) for platformId, t, fix in found]
+
+    def platforms_within(self, lat_min, lat_max, lon_min, lon_max, start=None, end=None):
+        ''' Returns the platforms with fixes inside a box, in a time range
+
+        See within() for the parameters.
+
+        Returns
+        -------
+        list of string
+            platform identifiers, sorted
+        '''
+        return sorted(set(platformId for platformId, fix in
+                          self.within(lat_min, lat_max, lon_min, lon_max, start, end)))
+
+    def _cell(self, latitude, longitude):
+        return (math.floor(latitude/self.cell_size), math.floor(longitude/self.cell_size))
+
+    def _cells_in(self, lat_min, lat_max, lon_min, lon_max):
+        i0, j0 = self._cell(lat_min, lon_min)
+        i1, j1 = self._cell(lat_max, lon_max)
+        if (i1 - i0 + 1)*(j1 - j0 + 1) > len(self._cells):
+            return [cell for (i, j), cell in self._cells.items() if i0 <= i <= i1 and j0 <= j <= j1]
+        cells = (self._cells.get((i, j)) for i in range(i0, i1 + 1) for j in range(j0, j1 + 1))
+        return [cell for cell in cells if cell is not None]
+
+    def _within(self, lat_min, lat_max, lon_min, lon_max, start, end):
+        # Must be called with the lock held.
+        found = []
+        for cell in self._cells_in(lat_min, lat_max, lon_min, lon_max):
+            cell.sort()
+            i0, i1 = cell.span(start, end)
+            latitudes, longitudes = cell.latitudes, cell.longitudes
+            for i in range(i0, i1):
+                if lat_min <= latitudes[i] <= lat_max and lon_min <= longitudes[i] <= lon_max:
+                    found.append((cell.platform_ids[i], cell.times[i], cell.fixes[i]))
+        return found
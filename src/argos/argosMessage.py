@@ -1,61 +1,295 @@
-import arrow
+import datetime
+import functools
+import math
+import threading
+from collections import OrderedDict
+
+from . import argosCodec
+
+# numpy is imported where needed only, so that decoding single messages
+# does not pay for importing it.
+
+# Value of latitudes and longitudes that were not available (all bits set)
+MISSING_POSITION = -0.01
+
+
+@functools.lru_cache(maxsize=None)
+def _nibble_table():
+    # Lookup table mapping ASCII codes to nibble values. Characters that are
+    # not hexadecimal digits map to 0xFF, which flags the payload as malformed.
+    import numpy as np
+    table = np.full(256, 0xFF, dtype=np.uint8)
+    for i, c in enumerate("0123456789ABCDEF"):
+        table[ord(c)] = i
+        table[ord(c.lower())] = i
+    return table
+
+
+def _packed(dtype):
+    # Structured dtype with the fields of dtype, without the gaps a selection of fields leaves.
+    import numpy as np
+    return np.dtype([(k, dtype.fields[k][0]) for k in dtype.names])
+
+
+def format_date(t):
+    ''' Formats a time as an ISO 8601 string
+
+    Parameters
+    ----------
+    t : float
+        time in seconds since 1970-01-01
+
+    Returns
+    -------
+    str
+        date formatted as YYYY-MM-DDTHH:MM:SSZ (UTC)
+    '''
+    d = datetime.datetime.fromtimestamp(t, datetime.timezone.utc)
+    return f"{d.year:04d}-{d.month:02d}-{d.day:02d}T{d.hour:02d}:{d.minute:02d}:{d.second:02d}Z"
+
+
+def ddmm_to_degrees(value):
+    ''' Converts a latitude or longitude from DDMM.mm to decimal degrees
+
+    Payloads report positions as degrees times 100 plus minutes, for
+    example 5412.30 for 54 degrees 12.30 minutes.
+
+    Parameters
+    ----------
+    value : float or None
+        position in DDMM.mm
+
+    Returns
+    -------
+    float
+        position in decimal degrees, or NaN if value is None, NaN or
+        MISSING_POSITION
+    '''
+    if value is None or value != value or value == MISSING_POSITION:
+        return math.nan
+    degrees, minutes = divmod(abs(value), 100)
+    return math.copysign(degrees + minutes/60, value)
+
 
 class ArgosMessageDecoder(object):
-    CODEC={"present_time"  :(8,'unsigned',1.),
-           "lat"           :(6,'signed',0.01),
-           "lon"           :(6,'signed',0.01),
-           "fixtime"       :(4,'unsigned',1.),
-           "latInvalid"    :(6,'signed',0.01),
-           "lonInvalid"    :(6,'signed',0.01),
-           "fixtimeInvalid":(4,'unsigned',1.),
-           "latToofar"     :(6,'signed',0.01),
-           "lonToofar"     :(6,'signed',0.01),
-           "fixtimeToofar" :(4,'signed',1.),
-           "U"             :(2,'signed',0.05),
-           "V"             :(2,'signed',0.05)}
-    CODECVAR=["present_time"  ,
-              "lat"           ,
-              "lon"           ,
-              "fixtime"       ,
-              "latInvalid"    ,
-              "lonInvalid"    ,
-              "fixtimeInvalid",
-              "latToofar"     ,
-              "lonToofar"     ,
-              "fixtimeToofar" ,
-              "U"             ,
-              "V"             ]
-
-    def __init__(self):
-        pass
+    ''' Decoder for hexadecimal Argos payloads
+
+    Parameters
+    ----------
+    profile : string, argosCodec.CodecProfile or None (optional) Default : None
+        codec profile describing the payload layout. If None, the default
+        profile (Slocum glider messages) is used.
+
+    The attributes CODEC and CODECVAR describe the layout of the default profile.
+    '''
+    CODEC = dict((f.name, (f.size, 'signed' if f.signed else 'unsigned', f.factor))
+                 for f in argosCodec.GLIDER.fields)
+    CODECVAR = [f.name for f in argosCodec.GLIDER.fields]
+
+    def __init__(self, profile=None):
+        self.codec = argosCodec.compile_profile(argosCodec.get_profile(profile))
+        self.length = self.codec.length
+        self._projections = dict()
+
+    @property
+    def dtype(self):
+        ''' numpy dtype of the records returned by decode_batch() '''
+        return self.codec.dtype
+
+    @property
+    def fields(self):
+        ''' Names of the fields of decoded records: the fields of the codec profile, crc and date '''
+        return self.codec.names + ('crc',) + (('date',) if self.codec.time_field else ())
 
     def __call__(self, message):
         return self.parseHex(message)
         
-    def parseHex(self, message):
-        data = dict()
-        position=0
-        for k in self.CODECVAR:
-            size,typ,factor=self.CODEC[k]
-            hexValue=message[position:position+size]
-            data[k]=self.hexToDec(hexValue,size,typ)*factor
-            position+=size
-        data['crc']=self.checksum_8bit(message)
-        data['date'] = arrow.get(data['present_time']).format('YYYY-MM-DDTHH:mm:ss[Z]')
+    def parseHex(self, message, crc=None, fields=None):
+        ''' Decodes a hexadecimal payload
+
+        Parameters
+        ----------
+        message : str
+            hexadecimal payload
+        crc : bool or None (optional) Default : None
+            result of the checksum, if already known
+        fields : iterable of string or None (optional) Default : None
+            names of the fields to decode, see the attribute fields. If
+            None, all fields are decoded. Only the fields asked for are
+            computed; the checksum, for example, is not checked unless crc
+            is among them.
+
+        Returns
+        -------
+        dict
+        '''
+        if fields is None:
+            data = self.codec.decode(message)
+            data['crc']=self.checksum_8bit(message) if crc is None else crc
+            if self.codec.time_field:
+                t = data[self.codec.time_field] + self.codec.epoch
+                data['date'] = format_date(t)
+            return data
+        names, with_crc, with_date, dtype = self._projection(fields)
+        data = self.codec.decode(message, names)
+        if with_crc:
+            data['crc'] = self.checksum_8bit(message) if crc is None else crc
+        if with_date:
+            time_field = self.codec.time_field
+            data['date'] = format_date(data[time_field] + self.codec.epoch)
+            if time_field not in dtype.names:
+                del data[time_field]
         return data
+
+    def decode_batch(self, messages, fields=None):
+        ''' Decodes a sequence of hexadecimal payloads in one go.
+
+        Parameters
+        ----------
+        messages : sequence of str
+            hexadecimal payloads, each expected to be as long as the
+            codec profile prescribes (62 characters for the default profile)
+        fields : iterable of string or None (optional) Default : None
+            names of the fields to decode, as for parseHex(). If None,
+            all fields are decoded.
+
+        Returns
+        -------
+        numpy structured array
+            one record per message, with a field for each field of the
+            codec profile, plus the fields crc and date, or with the fields
+            asked for only.
+
+        The results are identical to those of parseHex(). Payloads that do
+        not have the prescribed length or contain non-hexadecimal characters
+        are not decoded; their numerical fields are set to NaN, crc to False,
+        and date to an empty string.
+        '''
+        import numpy as np
+        codec = self.codec
+        if fields is None:
+            names, with_crc, with_date, dtype = codec.names, True, bool(codec.time_field), self.dtype
+        else:
+            names, with_crc, with_date, dtype = self._projection(fields)
+        nibbles, valid = self._nibble_matrix(messages)
+        result = np.zeros(len(valid), dtype=dtype)
+        values = dict()
+        for i in codec.select(names):
+            position, size, factor = codec.offsets[i], codec.sizes[i], codec.factors[i]
+            columns = nibbles[:, position:position+size].astype(np.int64)
+            value = np.zeros(len(valid), dtype=np.int64)
+            for j in range(size):
+                value = (value << 4) | columns[:, j]
+            if codec.signed[i]:
+                # Same sign rule as hexToDec: leading digit larger than 8.
+                value -= np.where(columns[:, 0] > 8, 16**size, 0)
+            values[codec.names[i]] = value = value * factor
+            value[~valid] = np.nan
+            if codec.names[i] in dtype.names:
+                result[codec.names[i]] = value
+        if with_crc:
+            result['crc'] = self._checksum_nibbles(nibbles, valid)
+        if with_date:
+            seconds = np.floor(values[codec.time_field][valid] + codec.epoch).astype(np.int64)
+            result['date'][valid] = np.datetime_as_string(seconds.astype('datetime64[s]'),
+                                                      unit='s', timezone='UTC')
+        return result
+
+    def _projection(self, fields):
+        # Returns the names of the codec fields to decode, whether crc and
+        # date are asked for, and the dtype of the records of decode_batch().
+        fields = frozenset(fields)
+        projection = self._projections.get(fields)
+        if projection is None:
+            unknown = fields.difference(self.fields)
+            if unknown:
+                raise ValueError(f"Unknown fields {', '.join(sorted(unknown))} for codec profile "
+                                 f"'{self.codec.profile.name}'.")
+            with_date = 'date' in fields
+            names = tuple(k for k in self.codec.names if k in fields or (with_date and k == self.codec.time_field))
+            dtype = self.dtype[[k for k in self.dtype.names if k in fields]]
+            projection = self._projections[fields] = (names, 'crc' in fields, with_date, _packed(dtype))
+        return projection
+
+    def _nibble_matrix(self, messages):
+        ''' Converts messages into a matrix of nibble values
+
+        Returns a (n, length) uint8 array and a boolean array flagging the
+        messages that have the correct length and contain hexadecimal
+        digits only. Rows of invalid messages are set to zero.
+        '''
+        import numpy as np
+        n = self.length
+        messages = list(messages)
+        lengths = np.fromiter(map(len, messages), dtype=np.int64, count=len(messages))
+        valid = lengths == n
+        if not np.all(valid):
+            messages = [m if ok else "0"*n for m, ok in zip(messages, valid)]
+        # Non-ascii characters are replaced by a single '?', which keeps
+        # the length of the buffer intact and maps onto an invalid nibble.
+        buffer = "".join(messages).encode('ascii', errors='replace')
+        nibbles = _nibble_table()[np.frombuffer(buffer, dtype=np.uint8)].reshape(-1, n)
+        valid &= np.all(nibbles != 0xFF, axis=1)
+        nibbles[~valid] = 0
+        return nibbles, valid
     
     def checksum_8bit(self, message):
-        lengthMessage=len(message)
-        if lengthMessage!=62:
+        ''' Checks the 8 bit checksum of a message
+
+        Parameters
+        ----------
+        message : str, bytes or memoryview
+            hexadecimal payload (62 characters for the default profile),
+            or the raw octets of the payload
+
+        Returns
+        -------
+        bool
+            True if the last octet matches the checksum of the others,
+            False otherwise, also for malformed messages.
+        '''
+        if isinstance(message, str):
+            if len(message) != self.length:
+                return False
+            try:
+                octets = bytes.fromhex(message)
+            except ValueError:
+                return False
+        else:
+            octets = bytes(message)
+            if len(octets) == self.length:
+                try:
+                    octets = bytes.fromhex(octets.decode('ascii'))
+                except ValueError:
+                    return False
+        if len(octets) != self.length//2:
             return False
-        f=lambda x:self.hexToDec(x,2,'unsigned')
-        bytes=list(map(f,[message[i:i+2] for i in range(0,lengthMessage,2)]))
-        crc8=0
-        for b in bytes[:-1]:
-            crc8+=b
-            crc8=crc8%256
-        crc8=256-crc8
-        return crc8==bytes[-1]
+        crc8 = 256 - (sum(octets[:-1]) & 0xFF)
+        return crc8 == octets[-1]
+
+    def checksum_batch(self, messages):
+        ''' Checks the 8 bit checksum of a sequence of messages
+
+        Parameters
+        ----------
+        messages : sequence of str
+            hexadecimal payloads
+
+        Returns
+        -------
+        numpy array of bool
+            mask which is True for each message with a valid checksum.
+            Messages with a wrong length or non-hexadecimal characters
+            yield False.
+        '''
+        nibbles, valid = self._nibble_matrix(messages)
+        return self._checksum_nibbles(nibbles, valid)
+
+    def _checksum_nibbles(self, nibbles, valid):
+        import numpy as np
+        octets = (nibbles[:, 0::2] << 4) | nibbles[:, 1::2]
+        crc8 = 256 - (octets[:, :-1].sum(axis=1, dtype=np.int64) & 0xFF)
+        return valid & (crc8 == octets[:, -1])
         
 
     def hexToDec(self,x,n,typ):
@@ -71,3 +305,100 @@ class ArgosMessageDecoder(object):
             xn=int(x,16)
         return(xn)
 
+
+
+class PayloadCache(object):
+    ''' Bounded LRU cache of checksums and decoded payloads
+
+    Parameters
+    ----------
+    maxsize : int (optional) Default : 16384
+        maximum number of payloads kept. A cache with maxsize 0 keeps nothing.
+
+    Entries are keyed by the codec of the decoder and the payload, so that
+    the cache can be shared by decoders of different platforms. The
+    checksum of a payload is cached when first computed; the decoded
+    record is added when the payload is first decoded. The attributes
+    hits and misses count the lookups. The cache can be shared by
+    several threads.
+    '''
+    def __init__(self, maxsize=16384):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def checksum(self, decoder, payload):
+        ''' Returns decoder.checksum_8bit(payload), cached '''
+        key = (decoder.codec, payload)
+        entry = self._lookup(key)
+        if entry is not None:
+            return entry[0]
+        crc = decoder.checksum_8bit(payload)
+        self._store(key, [crc, None])
+        return crc
+
+    def decode(self, decoder, payload, fields=None):
+        ''' Returns decoder.parseHex(payload, fields=fields), cached
+
+        The dictionary returned is a copy, which the caller may modify.
+        Only complete records are cached: a selection of fields is taken
+        from the cached record if there is one, and decoded otherwise.
+        '''
+        key = (decoder.codec, payload)
+        entry = self._lookup(key, decoded=True)
+        if entry is not None and entry[1] is not None:
+            if fields is None:
+                return dict(entry[1])
+            return dict((k, v) for k, v in entry[1].items() if k in fields)
+        if fields is not None:
+            return decoder.parseHex(payload, crc=entry and entry[0], fields=fields)
+        record = decoder.parseHex(payload, crc=entry and entry[0])
+        self._store(key, [record['crc'], record])
+        return dict(record)
+
+    def clear(self):
+        ''' Removes all entries and resets the counters '''
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        ''' Returns the number of hits, misses, entries and the hit ratio
+
+        Returns
+        -------
+        dict
+        '''
+        with self._lock:
+            lookups = self.hits + self.misses
+            return dict(hits=self.hits, misses=self.misses, size=len(self._entries),
+                        hit_ratio=self.hits/lookups if lookups else 0.)
+
+    def _lookup(self, key, decoded=False):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (decoded and entry[1] is None):
+                self.misses += 1
+            else:
+                self.hits += 1
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _store(self, key, entry):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+# Cache shared by all ArgosPlatformInfo objects that are not given one
+payload_cache = PayloadCache()
@@ -0,0 +1,187 @@
+''' Instrumentation of the clients
+
+ArgosPlatformInfo and ArgosProgramInfo accept a metrics object, which is
+told how long each processing stage took and how many items passed. Any
+object with the methods timing() and count() of the Metrics class can be
+used. Without a metrics object (the default), no measurements are made.
+
+Stages timed (seconds):
+
+    platform_info.soap     getXml round-trip
+    platform_info.parse    incremental XML parsing of the response
+    platform_info.select   selection of the best payload, including CRC checks
+    platform_info.decode   decoding of the selected payloads
+    program_info.soap      getPlatformList round-trip
+    program_info.parse     parsing of the platform list
+    resilience.call        calls made under an argosResilience.Resilience policy,
+                           retries and hedged requests included
+
+Counters:
+
+    platform_info.response_bytes     size of the getXml responses
+    platform_info.passes             satellite passes processed
+    platform_info.messages           messages processed
+    platform_info.crc_failures       messages found with a wrong checksum (checksums
+                                     are only checked where they affect the selection)
+    platform_info.quality_flag.N     satellite passes with quality flag N
+    program_info.response_bytes      size of the getPlatformList responses
+    program_info.platforms           platforms listed
+    resilience.failures              calls that failed, after retries
+    resilience.retries               calls retried after a transient fault
+    resilience.hedged                duplicate requests sent
+    resilience.hedge_wins            calls answered by the duplicate request
+    resilience.deadline_exceeded     calls not answered before their deadline
+    resilience.rejected              calls rejected by an open circuit
+
+Two implementations are provided: MetricsRecorder, which accumulates the
+measurements in memory and renders them in the Prometheus text format,
+and StatsdExporter, which sends them to a StatsD daemon.
+'''
+
+import socket
+import threading
+
+
+class Metrics(object):
+    ''' Interface of metrics objects. Measurements are discarded. '''
+
+    def timing(self, name, seconds, count=1):
+        ''' Records the time spent in a stage
+
+        Parameters
+        ----------
+        name : string
+            name of the stage
+        seconds : float
+            time spent
+        count : int (optional) Default : 1
+            number of times the stage was run in this time
+        '''
+        pass
+
+    def count(self, name, value=1):
+        ''' Increments a counter
+
+        Parameters
+        ----------
+        name : string
+            name of the counter
+        value : int (optional) Default : 1
+            increment
+        '''
+        pass
+
+
+class CallbackMetrics(Metrics):
+    ''' Passes measurements on to a function
+
+    Parameters
+    ----------
+    callback : callable
+        called as callback(kind, name, value), with kind either "timing" or "count"
+    '''
+    def __init__(self, callback):
+        self.callback = callback
+
+    def timing(self, name, seconds, count=1):
+        self.callback("timing", name, seconds)
+
+    def count(self, name, value=1):
+        self.callback("count", name, value)
+
+
+class MetricsRecorder(Metrics):
+    ''' Accumulates measurements in memory
+
+    The attribute counters holds the value of each counter, and the
+    attribute timings holds for each stage a list of the number of runs,
+    the total time and the longest time reported at once.
+    '''
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = dict()
+        self.timings = dict()
+
+    def timing(self, name, seconds, count=1):
+        with self.lock:
+            t = self.timings.setdefault(name, [0, 0., 0.])
+            t[0] += count
+            t[1] += seconds
+            t[2] = max(t[2], seconds)
+
+    def count(self, name, value=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def reset(self):
+        ''' Clears all measurements '''
+        with self.lock:
+            self.counters.clear()
+            self.timings.clear()
+
+    def prometheus_text(self, prefix="argos"):
+        ''' Renders the measurements in the Prometheus text exposition format
+
+        Parameters
+        ----------
+        prefix : string (optional) Default : "argos"
+            prefix of the metric names
+
+        Returns
+        -------
+        str
+        '''
+        lines = []
+        with self.lock:
+            counters = sorted(self.counters.items())
+            timings = sorted(self.timings.items())
+        for name, value in counters:
+            metric = _prometheus_name(prefix, name) + "_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+        for name, (count, total, maximum) in timings:
+            metric = _prometheus_name(prefix, name) + "_seconds"
+            lines += [f"# TYPE {metric} summary",
+                      f"{metric}_count {count}",
+                      f"{metric}_sum {total:.9f}",
+                      f"# TYPE {metric}_max gauge",
+                      f"{metric}_max {maximum:.9f}"]
+        return "\n".join(lines) + "\n"
+
+
+class StatsdExporter(Metrics):
+    ''' Sends measurements to a StatsD daemon over UDP
+
+    Parameters
+    ----------
+    host : string (optional) Default : "127.0.0.1"
+        host of the StatsD daemon
+    port : int (optional) Default : 8125
+        port of the StatsD daemon
+    prefix : string (optional) Default : "argos"
+        prefix of the metric names
+
+    Timings are sent in milliseconds. Sending errors are ignored.
+    '''
+    def __init__(self, host="127.0.0.1", port=8125, prefix="argos"):
+        self.address = (host, port)
+        self.prefix = prefix
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def timing(self, name, seconds, count=1):
+        self._send(f"{self.prefix}.{name}:{1000*seconds:.3f}|ms")
+
+    def count(self, name, value=1):
+        self._send(f"{self.prefix}.{name}:{value}|c")
+
+    def close(self):
+        self.socket.close()
+
+    def _send(self, line):
+        try:
+            self.socket.sendto(line.encode("ascii"), self.address)
+        except OSError:
+            pass
+
+
+def _prometheus_name(prefix, name):
+    return "_".join([prefix] + name.split(".")).replace("-", "_")
@@ -0,0 +1,316 @@
+''' Profiling of the processing pipeline, with regression tracking
+
+profile() runs the pipeline retrieve() -> get_info() -> decoding of
+ArgosPlatformInfo over a synthetic response of a given number of
+satellite passes, or over a recorded getXml response, and reports
+
+- the wall time of each stage, the median and minimum over repeated runs:
+
+      retrieve    retrieve(), including the getXml call
+      soap        the getXml call
+      get_info    get_info(), which parses, selects and decodes:
+      parse       incremental XML parsing of the response
+      select      selection of the best payload, including CRC checks
+      decode      decoding of the selected payloads
+      columns     get_info(output="columns")
+      total       all of the above, once
+
+- the peak resident set size of the process (where the resource module
+  is available), and the peak memory traced by tracemalloc during one
+  more run, with the lines that allocated most of the memory held once
+  get_info() has returned.
+
+Each run starts with an empty payload cache. By default the getXml call
+returns the response directly; with soap=True it goes through zeep to a
+local argosTesting.SoapStandin.
+
+Results are stored in a JSON file, keyed by the git commit of the
+package (or its version if it is not in a git work tree), so that runs
+of different releases can be compared. compare() reports the change of
+each measurement between two keys, and flags those that grew by more
+than the threshold. From the command line:
+
+    argos profile run --passes 10000
+    argos profile compare v1.2.0 --threshold 0.1
+
+The module can be run with python -m argos.argosProfile as well.
+'''
+
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from . import argosClient
+from . import argosTesting
+from .argosMessage import PayloadCache
+from .argosMetrics import MetricsRecorder
+
+logger = logging.getLogger("Argos")
+
+# File the results are stored in by default
+RESULTS_FILE = "argos_profile.json"
+# Relative growth of a measurement above which compare() flags it
+THRESHOLD = 0.10
+# Growth of a time in seconds below which compare() does not flag it
+MIN_DIFFERENCE = 1e-3
+# Number of allocating lines reported
+TOP_ALLOCATORS = 10
+# Stages timed, in the order reported
+STAGES = ("retrieve", "soap", "get_info", "parse", "select", "decode", "columns", "total")
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def version_key():
+    ''' Returns the key results of this version of the package are stored under
+
+    Returns
+    -------
+    string
+        the abbreviated git commit of the package, with "-dirty" if the
+        work tree has changes, or the version of the package if it is not
+        in a git work tree
+    '''
+    try:
+        p = subprocess.run(["git", "describe", "--always", "--dirty", "--abbrev=12"], cwd=_PACKAGE_DIR,
+                           capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        p = None
+    if p is not None and p.returncode == 0 and p.stdout.strip():
+        return p.stdout.strip()
+    import argos
+    return argos.__version__
+
+
+def load_response(filename):
+    ''' Reads a recorded getXml response '''
+    with open(filename, 'r', encoding="ISO-8859-1") as fp:
+        return fp.read()
+
+
+def profile(response=None, number_of_passes=1000, platformId="260603", repeat=5, soap=False,
+            top=TOP_ALLOCATORS):
+    ''' Profiles the processing pipeline
+
+    Parameters
+    ----------
+    response : string or None (optional) Default : None
+        getXml response to process. If None, a synthetic response of
+        number_of_passes satellite passes is made.
+    number_of_passes : int (optional) Default : 1000
+        number of satellite passes of the synthetic response
+    platformId : string (optional) Default : "260603"
+        platform identifier
+    repeat : int (optional) Default : 5
+        number of timed runs
+    soap : bool (optional) Default : False
+        if True, the getXml call goes through zeep to a local SoapStandin
+    top : int (optional) Default : TOP_ALLOCATORS
+        number of allocating lines reported
+
+    Returns
+    -------
+    dict
+        parameters, counters, stages (median and min seconds of each
+        stage), memory (peak_rss and tracemalloc_peak in bytes) and
+        top_allocators (location, and size in bytes and number of blocks
+        held once get_info() has returned, of the lines that allocated most)
+    '''
+    if response is None:
+        response = argosTesting.synthetic_response(platformId, number_of_passes)
+    if soap:
+        with argosTesting.SoapStandin(responses={platformId: response}) as standin:
+            service = argosClient.get_client(standin.wsdl_url).service.getXml
+            return _profile(service, response, platformId, repeat, top, soap)
+    return _profile(lambda **kwds: response, response, platformId, repeat, top, soap)
+
+
+def _profile(service, response, platformId, repeat, top, soap):
+    runs = [_run(service, platformId) for i in range(repeat)]
+    times = dict((stage, [run[0][stage] for run in runs]) for stage in STAGES)
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__),
+               tracemalloc.Filter(False, "<frozen importlib._bootstrap*>")]
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        snapshots = []
+        _run(service, platformId, lambda: snapshots.append(tracemalloc.take_snapshot()))
+        tracemalloc_peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    statistics_ = snapshots[0].filter_traces(filters).compare_to(before.filter_traces(filters), 'lineno')
+    top_allocators = [dict(location=f"{_short_path(s.traceback[0].filename)}:{s.traceback[0].lineno}",
+                           size=s.size_diff, count=s.count_diff)
+                      for s in statistics_[:top] if s.size_diff > 0]
+    counters = runs[-1][1]
+    return dict(parameters=dict(platformId=platformId, passes=counters.get('platform_info.passes', 0),
+                                response_bytes=len(response), repeat=repeat, soap=soap),
+                counters=counters,
+                stages=dict((stage, dict(median=statistics.median(t), min=min(t))) for stage, t in times.items()),
+                memory=dict(peak_rss=peak_rss(), tracemalloc_peak=tracemalloc_peak),
+                top_allocators=top_allocators,
+                python=platform.python_version(),
+                machine=platform.machine(),
+                time=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()))
+
+
+def _run(service, platformId, snapshot=None):
+    # Runs the pipeline once. Returns the time of each stage and the
+    # counters. snapshot is called once get_info() has returned.
+    metrics = MetricsRecorder()
+    api = argosClient.ArgosPlatformInfo(service=service, metrics=metrics, payload_cache=PayloadCache())
+    t0 = time.perf_counter()
+    api.retrieve(platformId, username="user", password="secret")
+    t1 = time.perf_counter()
+    info = api.get_info(minimum_quality_flag=0)
+    t2 = time.perf_counter()
+    if snapshot is not None:
+        snapshot()
+    del info
+    api.metrics = None
+    api.payload_cache = PayloadCache()
+    t3 = time.perf_counter()
+    api.get_info(minimum_quality_flag=0, output="columns")
+    t4 = time.perf_counter()
+    stages = dict(retrieve=t1 - t0, get_info=t2 - t1, columns=t4 - t3)
+    stages['total'] = stages['retrieve'] + stages['get_info'] + stages['columns']
+    for stage in ("soap", "parse", "select", "decode"):
+        stages[stage] = metrics.timings.get(f"platform_info.{stage}", [0, 0.])[1]
+    return stages, dict(metrics.counters)
+
+
+def peak_rss():
+    ''' Returns the peak resident set size of the process in bytes, or None if unknown '''
+    try:
+        import resource
+    except ImportError:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return maxrss if sys.platform == "darwin" else maxrss*1024
+
+
+def _short_path(filename):
+    # Paths in the package are given relative to its parent directory.
+    parent = os.path.dirname(_PACKAGE_DIR)
+    if filename.startswith(parent + os.sep):
+        return os.path.relpath(filename, parent)
+    return filename
+
+
+def load_results(filename=RESULTS_FILE):
+    ''' Returns the stored results by key, or an empty dictionary if there is no file '''
+    try:
+        with open(filename, 'r') as fp:
+            return json.load(fp)
+    except FileNotFoundError:
+        return dict()
+
+
+def store_results(result, key=None, filename=RESULTS_FILE):
+    ''' Stores results under a key, replacing earlier results stored under it
+
+    Parameters
+    ----------
+    result : dict
+        results returned by profile()
+    key : string or None (optional) Default : None
+        key. If None, version_key() is used.
+    filename : string (optional) Default : RESULTS_FILE
+        JSON file of the results
+
+    Returns
+    -------
+    string
+        the key
+    '''
+    key = key or version_key()
+    results = load_results(filename)
+    results.pop(key, None)
+    results[key] = result
+    tmp = f"{filename}.tmp"
+    with open(tmp, 'w') as fp:
+        json.dump(results, fp, indent=1)
+    os.replace(tmp, filename)
+    return key
+
+
+def compare(baseline, candidate, threshold=THRESHOLD, min_difference=MIN_DIFFERENCE):
+    ''' Compares two profiles
+
+    Parameters
+    ----------
+    baseline, candidate : dict
+        results returned by profile()
+    threshold : float (optional) Default : THRESHOLD
+        relative growth above which a measurement is flagged
+    min_difference : float (optional) Default : MIN_DIFFERENCE
+        growth of a time in seconds below which it is not flagged, so
+        that the noise of very short stages is not taken for a regression
+
+    Returns
+    -------
+    list of (string, float, float, float or None, bool)
+        for the median time of each stage (in seconds) and the memory
+        measurements (in bytes): the name, the baseline and candidate
+        values, the relative change (None if the baseline is 0) and
+        whether it is flagged. Measurements missing from either profile
+        are left out.
+    '''
+    if baseline['parameters'] != candidate['parameters']:
+        logger.warning("The profiles were made with different parameters; the comparison may not be meaningful.")
+    measurements = [(stage, baseline['stages'].get(stage, {}).get('median'),
+                     candidate['stages'].get(stage, {}).get('median'), min_difference) for stage in STAGES]
+    measurements += [(name, baseline['memory'].get(name), candidate['memory'].get(name), 0)
+                     for name in ("tracemalloc_peak", "peak_rss")]
+    rows = []
+    for name, before, after, minimum in measurements:
+        if before is None or after is None:
+            continue
+        change = (after - before)/before if before else None
+        flagged = change is not None and change > threshold and after - before > minimum
+        rows.append((name, before, after, change, flagged))
+    return rows
+
+
+def format_profile(key, result):
+    ''' Returns a report of a profile as text '''
+    p = result['parameters']
+    lines = [f"{key}: {p['passes']} satellite passes, {p['response_bytes']} bytes, "
+             f"{p['repeat']} runs{', through SOAP' if p['soap'] else ''}",
+             f"{'stage':<12s}{'median (ms)':>14s}{'min (ms)':>12s}"]
+    for stage, t in result['stages'].items():
+        lines.append(f"{stage:<12s}{t['median']*1e3:14.2f}{t['min']*1e3:12.2f}")
+    memory = result['memory']
+    if memory['peak_rss'] is not None:
+        lines.append(f"peak RSS: {memory['peak_rss']/2**20:.1f} MiB")
+    lines.append(f"tracemalloc peak: {memory['tracemalloc_peak']/2**20:.1f} MiB")
+    lines.append("top allocators:")
+    for a in result['top_allocators']:
+        lines.append(f"  {a['size']/1024:10.1f} KiB {a['count']:8d} blocks  {a['location']}")
+    return "\n".join(lines)
+
+
+def format_comparison(rows, threshold=THRESHOLD):
+    ''' Returns the comparison returned by compare() as text '''
+    lines = [f"{'measurement':<24s}{'baseline':>12s}{'candidate':>12s}{'change':>10s}"]
+    for name, before, after, change, flagged in rows:
+        if name in STAGES:
+            name, before, after = f"{name} (ms)", before*1e3, after*1e3
+        else:
+            name, before, after = f"{name} (MiB)", before/2**20, after/2**20
+        change = "-" if change is None else f"{change:+.1%}"
+        lines.append(f"{name:<24s}{before:12.2f}{after:12.2f}{change:>10s}"
+                     f"{f'  slower than {threshold:.0%}' if flagged else ''}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    from . import argosCli
+    sys.exit(argosCli.main(["profile"] + sys.argv[1:]))
@@ -0,0 +1,323 @@
+''' Compact representations of fixes
+
+ArgosPlatformInfo.get_info() returns by default a dictionary per
+satellite pass, holding the Argos location as strings and the decoded
+GPS location as a dictionary. For large numbers of fixes, two more
+compact forms are available:
+
+    output="records"   a Fix named tuple per satellite pass, holding an
+                       ArgosLocation and a GpsLocation named tuple, with
+                       numerical values
+    output="columns"   a single FixColumns object, holding a numpy array
+                       per field
+
+Both can be converted back into the dictionaries get_info() returns by
+default, with to_dict() and to_dicts() respectively.
+
+The latitude and longitude of the Argos location are converted back
+into strings with ARGOS_LOCATION_DECIMALS decimals, as the webservice
+reports them.
+'''
+
+import functools
+import math
+from array import array
+from collections import namedtuple
+
+from . import argosMessage
+
+# Number of decimals of the Argos latitude and longitude in responses
+ARGOS_LOCATION_DECIMALS = 3
+
+
+class ArgosLocation(namedtuple("ArgosLocation", ["latitude", "longitude", "date"])):
+    ''' Location of a platform determined by Argos
+
+    latitude and longitude are in decimal degrees, date is the
+    locationDate string of the response.
+    '''
+    __slots__ = ()
+
+    @classmethod
+    def from_dict(cls, argos_location):
+        ''' Creates an ArgosLocation from its dictionary form, or returns None for None '''
+        if argos_location is None:
+            return None
+        return cls(float(argos_location['latitude']), float(argos_location['longitude']),
+                   argos_location['date'])
+
+    def to_dict(self):
+        ''' Returns the dictionary form, as returned by ArgosPlatformInfo.get_info() '''
+        return dict(latitude=f"{self.latitude:.{ARGOS_LOCATION_DECIMALS}f}",
+                    longitude=f"{self.longitude:.{ARGOS_LOCATION_DECIMALS}f}",
+                    date=self.date)
+
+
+class _GpsLocation(object):
+    # Methods of the GpsLocation types created by gps_location_type().
+    __slots__ = ()
+
+    @property
+    def date(self):
+        ''' Time of the message, as formatted by ArgosMessageDecoder.parseHex() '''
+        codec = self.codec
+        if codec.time_field not in self._fields:
+            return None
+        return argosMessage.format_date(getattr(self, codec.time_field) + codec.epoch)
+
+    def to_dict(self):
+        ''' Returns the dictionary form, as returned by ArgosMessageDecoder.parseHex() '''
+        d = self._asdict()
+        if self.codec.time_field in self._fields:
+            d['date'] = self.date
+        return d
+
+
+@functools.lru_cache(maxsize=None)
+def gps_location_type(codec, names=None):
+    ''' Returns the record type of messages decoded with a codec
+
+    Parameters
+    ----------
+    codec : argosCodec.CompiledCodec
+        compiled codec profile
+    names : tuple of string or None (optional) Default : None
+        fields of the record, for messages of which only some fields were
+        decoded. If None, all fields of the codec profile and crc.
+
+    Returns
+    -------
+    type
+        named tuple with a field for each field of the codec profile, and
+        the field crc. The date is computed from the time field when asked
+        for, if the record has it.
+    '''
+    base = namedtuple("GpsLocation", codec.names + ("crc",) if names is None else names)
+    return type("GpsLocation", (base, _GpsLocation), dict(__slots__=(), codec=codec))
+
+
+class Fix(namedtuple("Fix", ["argos_location", "gps_location", "gps_location_qf"])):
+    ''' Information of a satellite pass
+
+    argos_location is an ArgosLocation or None, gps_location a GpsLocation
+    (see gps_location_type()) or None if no payload was selected, and
+    gps_location_qf the quality flag.
+    '''
+    __slots__ = ()
+
+    @classmethod
+    def from_dict(cls, info, codec):
+        ''' Creates a Fix from a dictionary returned by ArgosPlatformInfo.get_info()
+
+        Parameters
+        ----------
+        info : dict
+            information of a satellite pass
+        codec : argosCodec.CompiledCodec
+            codec the payload was decoded with
+
+        Returns
+        -------
+        Fix
+        '''
+        gps_location = info['gps_location']
+        if gps_location:
+            names = codec.names + ('crc',)
+            names = None if all(k in gps_location for k in names) else tuple(k for k in names if k in gps_location)
+            record_type = gps_location_type(codec, names)
+            gps_location = record_type._make([gps_location[k] for k in record_type._fields])
+        else:
+            gps_location = None
+        return cls(ArgosLocation.from_dict(info['argos_location']), gps_location, info['gps_location_qf'])
+
+    def to_dict(self):
+        ''' Returns the dictionary form, as returned by ArgosPlatformInfo.get_info() '''
+        return dict(argos_location=self.argos_location and self.argos_location.to_dict(),
+                    gps_location={} if self.gps_location is None else self.gps_location.to_dict(),
+                    gps_location_qf=self.gps_location_qf)
+
+
+class ColumnBuilder(object):
+    ''' Collects satellite passes into column buffers
+
+    Satellite passes are appended as they are parsed, as the argos
+    location, selected payload and quality flag yielded by
+    ArgosPlatformInfo; only the values are kept, in typed buffers, until
+    to_columns() decodes the payloads in one go.
+    '''
+    def __init__(self):
+        self.latitudes = array('d')
+        self.longitudes = array('d')
+        self.quality_flags = array('b')
+        self.dates = []
+        self.payloads = []
+
+    def __len__(self):
+        return len(self.payloads)
+
+    def append(self, argos_location, payload, quality_flag):
+        ''' Appends a satellite pass '''
+        if argos_location is None:
+            self.latitudes.append(math.nan)
+            self.longitudes.append(math.nan)
+            self.dates.append("")
+        else:
+            self.latitudes.append(float(argos_location['latitude']))
+            self.longitudes.append(float(argos_location['longitude']))
+            self.dates.append(argos_location['date'])
+        self.payloads.append(payload or "")
+        self.quality_flags.append(quality_flag)
+
+    def extend(self, passes):
+        ''' Appends the satellite passes of an iterable of (argos_location, payload, quality_flag) '''
+        for p in passes:
+            self.append(*p)
+
+    def to_columns(self, decoder, fields=None, reverse=False):
+        ''' Returns the satellite passes as a FixColumns object
+
+        Parameters
+        ----------
+        decoder : argosMessage.ArgosMessageDecoder
+            decoder of the payloads, which are decoded in one go
+        fields : iterable of string or None (optional) Default : None
+            fields of the GPS location to decode. If None, all fields are.
+        reverse : bool (optional) Default : False
+            if True, the satellite passes are in the reverse order of appending
+
+        Returns
+        -------
+        FixColumns
+        '''
+        import numpy as np
+        codec = decoder.codec
+        names = codec.names + ('crc',)
+        if fields is not None:
+            names = tuple(k for k in names if k in fields)
+        step = -1 if reverse else 1
+        payloads = self.payloads[::step]
+        data = np.zeros(len(payloads), dtype=FixColumns.dtype(codec, max(map(len, self.dates), default=1) or 1,
+                                                              names))
+        if names:
+            decoded = decoder.decode_batch(payloads, None if fields is None else names)
+            for k in names:
+                data[k] = decoded[k]
+            # Payloads of the wrong length are decoded as far as they go, as by parseHex().
+            for i, p in enumerate(payloads):
+                if p and len(p) != decoder.length:
+                    record = decoder.parseHex(p, fields=None if fields is None else names)
+                    for k in names:
+                        data[k][i] = record[k]
+        data['gps_location_qf'] = np.frombuffer(self.quality_flags, dtype=np.int8)[::step]
+        data['argos_latitude'] = np.frombuffer(self.latitudes, dtype=np.float64)[::step]
+        data['argos_longitude'] = np.frombuffer(self.longitudes, dtype=np.float64)[::step]
+        data['argos_date'] = self.dates[::step]
+        return FixColumns(data, codec)
+
+
+class FixColumns(object):
+    ''' Columnar container of fixes
+
+    Parameters
+    ----------
+    data : numpy structured array
+        one row per satellite pass, with the dtype returned by FixColumns.dtype()
+    codec : argosCodec.CompiledCodec
+        codec the payloads were decoded with
+
+    A column is obtained by indexing with its name, a Fix by indexing with
+    an integer. The columns are the fields of the codec profile and crc (or
+    those of them that were decoded, see names), the quality flag gps_location_qf, and argos_latitude, argos_longitude
+    (decimal degrees) and argos_date (bytes). Fields of the GPS location
+    are NaN where no payload was selected; argos_date is empty where no
+    Argos location was reported.
+    '''
+    def __init__(self, data, codec):
+        self.data = data
+        self.codec = codec
+        self.names = tuple(k for k in codec.names + ('crc',) if k in data.dtype.names)
+
+    @staticmethod
+    def dtype(codec, date_size=24, names=None):
+        ''' Returns the numpy dtype of the data of a FixColumns object
+
+        Parameters
+        ----------
+        codec : argosCodec.CompiledCodec
+            codec profile
+        date_size : int (optional) Default : 24
+            number of characters of the argos_date column
+        names : tuple of string or None (optional) Default : None
+            fields of the GPS location. If None, all fields of the codec profile and crc.
+
+        Returns
+        -------
+        numpy dtype
+        '''
+        import numpy as np
+        names = codec.names + ('crc',) if names is None else names
+        return np.dtype([(k, np.bool_ if k == 'crc' else np.float64) for k in names] +
+                        [('gps_location_qf', np.int8),
+                         ('argos_latitude', np.float64), ('argos_longitude', np.float64),
+                         ('argos_date', f'S{date_size}')])
+
+    @classmethod
+    def from_passes(cls, passes, decoder, fields=None):
+        ''' Creates a FixColumns object from selected payloads
+
+        Parameters
+        ----------
+        passes : iterable of (dict or None, str or None, int)
+            argos location, selected payload and quality flag of each satellite pass
+        decoder : argosMessage.ArgosMessageDecoder
+            decoder of the payloads, which are decoded in one go
+        fields : iterable of string or None (optional) Default : None
+            fields of the GPS location to decode. If None, all fields are.
+            The date is not a column.
+
+        Returns
+        -------
+        FixColumns
+        '''
+        builder = ColumnBuilder()
+        builder.extend(passes)
+        return builder.to_columns(decoder, fields)
+
+    @property
+    def nbytes(self):
+        ''' Number of bytes used by the data '''
+        return self.data.nbytes
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.data[key]
+        return self._make_fixes(self.data[key:key+1 or None])[0]
+
+    def __iter__(self):
+        return iter(self.to_records())
+
+    def to_records(self):
+        ''' Returns the fixes as a list of Fix records '''
+        return self._make_fixes(self.data)
+
+    def to_dicts(self):
+        ''' Returns the fixes as dictionaries, as returned by ArgosPlatformInfo.get_info() '''
+        return [fix.to_dict() for fix in self.to_records()]
+
+    def _make_fixes(self, data):
+        names = self.names if len(self.names) < len(self.codec.names) + 1 else None
+        record_type = gps_location_type(self.codec, names)
+        gps_columns = [data[k].tolist() for k in record_type._fields]
+        fixes = []
+        for gps, qf, latitude, longitude, date in zip(zip(*gps_columns),
+                                                      data['gps_location_qf'].tolist(),
+                                                      data['argos_latitude'].tolist(),
+                                                      data['argos_longitude'].tolist(),
+                                                      data['argos_date'].tolist()):
+            argos_location = ArgosLocation(latitude, longitude, date.decode()) if date else None
+            gps_location = record_type._make(gps) if qf else None
+            fixes.append(Fix(argos_location, gps_location, qf))
+        return fixes
@@ -0,0 +1,188 @@
+''' Offline reprocessing of archived getXml responses
+
+Responses returned by the getXml call of the webservice, saved one per
+file, are parsed and decoded in parallel by a pool of processes. Files
+are handed out in chunks. The results of each chunk are sorted and
+spilled to a temporary file, and the spill files are merged into a single
+output file, sorted by platform and bestMsgDate. Identical satellite
+passes found in several (overlapping) responses are written once. Memory
+use is bounded by the size of a chunk, not by the size of the archive.
+
+The output is written as JSON lines, each holding the platformId and
+bestMsgDate of a satellite pass and the dictionary ArgosPlatformInfo.get_info()
+returns for it.
+'''
+
+import glob
+import heapq
+import json
+import logging
+import os
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from . import argosClient
+
+logger = logging.getLogger("Argos")
+
+# Number of spill files merged at once
+MERGE_FANIN = 64
+
+
+class ArgosResponseParser(argosClient.ArgosPlatformInfo):
+    ''' ArgosPlatformInfo for parsing saved responses, without access to the webservice '''
+    def service_factory(self, wsdl):
+        return None
+
+
+def expand_sources(sources):
+    ''' Expands directories and glob patterns into a sorted list of files
+
+    Parameters
+    ----------
+    sources : string or list of string
+        file names, directory names or glob patterns
+
+    Returns
+    -------
+    list of string
+    '''
+    if isinstance(sources, str):
+        sources = [sources]
+    filenames = set()
+    for source in sources:
+        if os.path.isdir(source):
+            source = os.path.join(source, "*")
+        filenames.update(f for f in glob.glob(source) if os.path.isfile(f))
+    return sorted(filenames)
+
+
+def process_files(filenames, minimum_quality_flag=argosClient.CRC):
+    ''' Parses and decodes saved responses
+
+    Parameters
+    ----------
+    filenames : list of string
+        files holding a response each
+    minimum_quality_flag : int (optional) Default : argosClient.CRC
+        satellite passes with a lower quality flag are skipped.
+
+    Returns
+    -------
+    (list of string, int, int)
+        sorted output lines, number of satellite passes and number of messages
+    '''
+    lines = []
+    n_passes = n_messages = 0
+    for filename in filenames:
+        parser = ArgosResponseParser()
+        try:
+            with open(filename, 'rb') as fp:
+                for sp in parser._iter_satellite_passes(fp):
+                    n_passes += 1
+                    n_messages += len(sp.findall('message'))
+                    argos_location, bestMsgDate, best_payload, quality_flag = parser._select_pass(sp)
+                    if quality_flag < minimum_quality_flag:
+                        continue
+                    info = parser._decode_pass(argos_location, best_payload, quality_flag)
+                    record = json.dumps(dict(platformId=parser.platformId, bestMsgDate=bestMsgDate, **info))
+                    # The prefix makes lines sort by platform and time.
+                    lines.append(f"{parser.platformId}\t{bestMsgDate}\t{record}\n")
+        except Exception as e:
+            logger.error(f"Failed to process {filename}: {e!r}")
+    lines.sort()
+    return lines, n_passes, n_messages
+
+
+def reprocess(sources, output, max_workers=None, chunksize=16, minimum_quality_flag=argosClient.CRC):
+    ''' Reprocesses archived responses
+
+    Parameters
+    ----------
+    sources : string or list of string
+        file names, directory names or glob patterns of saved responses
+    output : string
+        name of the JSON lines file to write
+    max_workers : int or None (optional) Default : None
+        number of processes. If None, the number of processors is used.
+    chunksize : int (optional) Default : 16
+        number of files processed per work unit
+    minimum_quality_flag : int (optional) Default : argosClient.CRC
+        satellite passes with a lower quality flag are skipped.
+
+    Returns
+    -------
+    dict
+        statistics: number of files, passes, messages and records written,
+        elapsed time, and files and messages processed per second.
+    '''
+    t0 = time.perf_counter()
+    max_workers = max_workers or os.cpu_count() or 1
+    filenames = expand_sources(sources)
+    chunks = [filenames[i:i+chunksize] for i in range(0, len(filenames), chunksize)]
+    n_passes = n_messages = 0
+    with tempfile.TemporaryDirectory(prefix="argos-") as spill_dir:
+        spills = []
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            max_pending = 2 * max_workers
+            pending = set()
+            chunks = iter(chunks)
+            while True:
+                for chunk in chunks:
+                    pending.add(executor.submit(process_files, chunk, minimum_quality_flag))
+                    if len(pending) >= max_pending:
+                        break
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    lines, passes, messages = future.result()
+                    n_passes += passes
+                    n_messages += messages
+                    spills.append(_write_spill(spill_dir, lines))
+                    if len(spills) >= MERGE_FANIN:
+                        merged = _spill_name(spill_dir)
+                        _merge(spills, merged)
+                        spills = [merged]
+        n_records = _merge(spills, output, strip=True)
+    elapsed = time.perf_counter() - t0
+    return dict(files=len(filenames), passes=n_passes, messages=n_messages, records=n_records,
+                elapsed=elapsed, files_per_second=len(filenames)/elapsed,
+                messages_per_second=n_messages/elapsed)
+
+
+def _spill_name(spill_dir):
+    fd, filename = tempfile.mkstemp(dir=spill_dir, suffix=".spill")
+    os.close(fd)
+    return filename
+
+
+def _write_spill(spill_dir, lines):
+    filename = _spill_name(spill_dir)
+    with open(filename, 'w') as fp:
+        fp.writelines(lines)
+    return filename
+
+
+def _merge(spills, output, strip=False):
+    # Merges sorted spill files, dropping duplicate lines. If strip is
+    # True, the sort prefix is removed. Returns the number of lines written.
+    n = 0
+    previous = None
+    fps = [open(f, 'r') for f in spills]
+    try:
+        with open(output, 'w') as out:
+            for line in heapq.merge(*fps):
+                if line == previous:
+                    continue
+                previous = line
+                out.write(line.split("\t", 2)[2] if strip else line)
+                n += 1
+    finally:
+        for fp in fps:
+            fp.close()
+        for f in spills:
+            if f != output:
+                os.remove(f)
+    return n
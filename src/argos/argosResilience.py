@@ -0,0 +1,516 @@
+''' Deadlines, retries, hedging and circuit breaking of webservice calls
+
+A Resilience object passed to ArgosPlatformInfo, ArgosProgramInfo or
+ArgosFleetClient as resilience wraps the service they call (getXml or
+getPlatformList) in a ResilientService, which
+
+- gives each call a deadline: the call fails with DeadlineExceeded if no
+  answer arrives in time, retries included;
+- retries calls that failed with a transient fault (connection errors,
+  timeouts, HTTP 5xx and 429 answers), after a random delay that doubles
+  with each attempt ("full jitter"). SOAP faults are answers of the
+  service, and are not retried;
+- optionally sends a duplicate request if the first has not been
+  answered after the hedge_quantile (p95) of recent latencies, and uses
+  whichever answers first;
+- keeps a circuit breaker per endpoint, which rejects calls with
+  CircuitOpenError after failure_threshold consecutive failures, until
+  reset_timeout has passed. A single trial call is then let through,
+  which closes the circuit again if it succeeds.
+
+Calls are run in a thread pool, so that the caller can stop waiting for
+them. A call that is given up on keeps running until the operation
+timeout of the transport ends it; its answer is discarded. The asyncio
+clients of argosAsync use an AsyncResilientService instead, which runs
+calls as tasks of the event loop and cancels those given up on.
+
+    resilience = Resilience(deadline=30, retries=2, hedge=True)
+    api = ArgosPlatformInfo(credentials="argos_login.txt", resilience=resilience)
+    ...
+    resilience.stats()
+
+stats() reports, per endpoint, the success rate, the number of retries,
+hedged requests and rejections, and the quantiles of the latency.
+'''
+
+import logging
+import random
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+logger = logging.getLogger("Argos")
+
+# Time in seconds a call may take, retries included
+DEADLINE = 120.
+# Number of retries of calls that failed with a transient fault
+RETRIES = 2
+# Delay in seconds before the first retry, and maximum delay between retries
+BACKOFF = 1.
+MAX_BACKOFF = 30.
+# Quantile of the latency after which a duplicate request is sent
+HEDGE_QUANTILE = 0.95
+# Delay in seconds before a duplicate request is sent, until enough latencies are known
+HEDGE_DELAY = 5.
+# Number of latencies known before the hedge delay follows them
+MIN_SAMPLES = 20
+# Number of consecutive failures that open the circuit, and time in seconds it stays open
+FAILURE_THRESHOLD = 5
+RESET_TIMEOUT = 60.
+# Number of latencies kept for the quantiles
+WINDOW = 1000
+
+
+class DeadlineExceeded(TimeoutError):
+    ''' Raised when a call is not answered before its deadline '''
+
+
+class CircuitOpenError(RuntimeError):
+    ''' Raised when a call is rejected because the circuit of its endpoint is open '''
+
+
+def is_transient(error):
+    ''' Tells whether a failed call may succeed if repeated
+
+    Parameters
+    ----------
+    error : Exception
+        exception raised by the call
+
+    Returns
+    -------
+    bool
+        True for connection errors and timeouts, including those of requests
+        and of httpx (used by the asyncio clients), and for HTTP answers
+        with status 429 or 5xx that are not SOAP faults.
+    '''
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    # requests, httpx and zeep are only looked at if they were imported, in
+    # which case the error can be one of theirs.
+    requests = sys.modules.get("requests")
+    if requests is not None and isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    httpx = sys.modules.get("httpx")
+    if httpx is not None and isinstance(error, httpx.TransportError):
+        return True
+    zeep_exceptions = sys.modules.get("zeep.exceptions")
+    if zeep_exceptions is not None and isinstance(error, zeep_exceptions.TransportError):
+        return error.status_code == 429 or error.status_code >= 500
+    return False
+
+
+class CircuitBreaker(object):
+    ''' Circuit breaker of an endpoint
+
+    Parameters
+    ----------
+    failure_threshold : int (optional) Default : FAILURE_THRESHOLD
+        number of consecutive failures that open the circuit
+    reset_timeout : float (optional) Default : RESET_TIMEOUT
+        time in seconds the circuit stays open, before a trial call is let through
+
+    The attribute state is "closed", "open" or "half-open".
+    '''
+    def __init__(self, failure_threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened = None
+        self.lock = threading.Lock()
+
+    def allow(self):
+        ''' Returns True if a call may be made '''
+        with self.lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self.opened >= self.reset_timeout:
+                self.state = "half-open"
+                return True
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.state = "closed"
+            self.failures = 0
+
+    def record_abandoned(self):
+        # A trial call that ends without result, for example because it was
+        # cancelled, opens the circuit again until another trial is let through.
+        with self.lock:
+            if self.state == "half-open":
+                self.state = "open"
+                self.opened = time.monotonic()
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.state == "half-open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    logger.warning(f"Opening circuit after {self.failures} consecutive failures.")
+                self.state = "open"
+                self.opened = time.monotonic()
+
+
+class _EndpointStats(object):
+    # Counters and recent latencies of the calls to an endpoint.
+    def __init__(self):
+        self.calls = 0
+        self.successes = 0
+        self.failures = 0
+        self.retries = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.deadline_exceeded = 0
+        self.rejected = 0
+        self.latencies = deque(maxlen=WINDOW)
+        self.attempt_latencies = deque(maxlen=WINDOW)
+        self.hedge_delay = None
+
+
+def _quantile(values, q):
+    values = sorted(values)
+    if not values:
+        return None
+    return values[min(int(q*len(values)), len(values) - 1)]
+
+
+class Resilience(object):
+    ''' Policy of deadlines, retries, hedging and circuit breaking
+
+    Parameters
+    ----------
+    deadline : float or None (optional) Default : DEADLINE
+        time in seconds a call may take, retries included. None for no deadline.
+    retries : int (optional) Default : RETRIES
+        number of retries of calls that failed with a transient fault
+    backoff : float (optional) Default : BACKOFF
+        delay in seconds before the first retry. Each retry waits a random
+        time up to backoff times 2 to the power of the number of earlier retries.
+    max_backoff : float (optional) Default : MAX_BACKOFF
+        maximum delay in seconds between retries
+    hedge : bool (optional) Default : False
+        if True, a duplicate request is sent if a call is not answered
+        within the hedge_quantile of recent latencies
+    hedge_quantile : float (optional) Default : HEDGE_QUANTILE
+        quantile of the latency after which a duplicate request is sent
+    failure_threshold : int (optional) Default : FAILURE_THRESHOLD
+        number of consecutive failures that open the circuit of an endpoint
+    reset_timeout : float (optional) Default : RESET_TIMEOUT
+        time in seconds the circuit stays open
+    max_workers : int (optional) Default : 32
+        number of threads running calls
+    metrics : argosMetrics.Metrics or None
+        if given, receives the latency of calls (resilience.call) and the
+        counters resilience.failures, resilience.retries, resilience.hedged,
+        resilience.deadline_exceeded and resilience.rejected.
+
+    A Resilience object can be shared by several clients and threads.
+    Each endpoint has its own circuit breaker and statistics.
+    '''
+    def __init__(self, deadline=DEADLINE, retries=RETRIES, backoff=BACKOFF, max_backoff=MAX_BACKOFF,
+                 hedge=False, hedge_quantile=HEDGE_QUANTILE, failure_threshold=FAILURE_THRESHOLD,
+                 reset_timeout=RESET_TIMEOUT, max_workers=32, metrics=None):
+        self.deadline = deadline
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.metrics = metrics
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="argos-resilience")
+        self.lock = threading.Lock()
+        self._breakers = dict()
+        self._stats = dict()
+
+    def close(self):
+        ''' Stops the threads, without waiting for calls in progress '''
+        self.executor.shutdown(wait=False)
+
+    def wrap(self, service, endpoint):
+        ''' Returns a ResilientService calling service
+
+        Parameters
+        ----------
+        service : callable
+            service to call, for example client.service.getXml
+        endpoint : string
+            name of the endpoint, which selects the circuit breaker and statistics
+
+        Returns
+        -------
+        ResilientService
+        '''
+        return ResilientService(service, self, endpoint)
+
+    def wrap_async(self, service, endpoint):
+        ''' Returns an AsyncResilientService calling service
+
+        As wrap(), for a coroutine function such as the operations of a
+        zeep.AsyncClient.
+
+        Returns
+        -------
+        AsyncResilientService
+        '''
+        return AsyncResilientService(service, self, endpoint)
+
+    def breaker(self, endpoint):
+        ''' Returns the circuit breaker of an endpoint '''
+        with self.lock:
+            breaker = self._breakers.get(endpoint)
+            if breaker is None:
+                breaker = self._breakers[endpoint] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+                self._stats[endpoint] = _EndpointStats()
+            return breaker
+
+    def stats(self, endpoint=None):
+        ''' Returns the statistics of the calls
+
+        Parameters
+        ----------
+        endpoint : string or None (optional) Default : None
+            endpoint. If None, the statistics of all endpoints are returned.
+
+        Returns
+        -------
+        dict
+            for an endpoint: the numbers of calls, successes, failures,
+            retries, hedged requests, hedge_wins (calls answered by the
+            duplicate), deadline_exceeded and rejected (circuit open); the
+            success_rate; the state of the circuit; and the quantiles p50,
+            p95 and p99 and the maximum of the latency of successful calls,
+            in seconds (None if there were none). For all endpoints, a
+            dictionary of these by endpoint.
+        '''
+        if endpoint is None:
+            with self.lock:
+                endpoints = list(self._stats)
+            return dict((e, self.stats(e)) for e in endpoints)
+        breaker = self.breaker(endpoint)
+        with self.lock:
+            s = self._stats[endpoint]
+            latencies = list(s.latencies)
+            result = dict(calls=s.calls, successes=s.successes, failures=s.failures, retries=s.retries,
+                          hedged=s.hedged, hedge_wins=s.hedge_wins, deadline_exceeded=s.deadline_exceeded,
+                          rejected=s.rejected, success_rate=s.successes/s.calls if s.calls else 0.)
+        result['state'] = breaker.state
+        for name, q in [('p50', 0.5), ('p95', 0.95), ('p99', 0.99)]:
+            result[name] = _quantile(latencies, q)
+        result['max'] = max(latencies, default=None)
+        return result
+
+    def _count(self, endpoint, name, value=1):
+        with self.lock:
+            s = self._stats[endpoint]
+            setattr(s, name, getattr(s, name) + value)
+        if self.metrics is not None and name not in ('calls', 'successes'):
+            self.metrics.count(f"resilience.{name}", value)
+
+    def _record_latency(self, endpoint, seconds, attempt):
+        with self.lock:
+            s = self._stats[endpoint]
+            latencies = s.attempt_latencies if attempt else s.latencies
+            latencies.append(seconds)
+            if attempt:
+                s.hedge_delay = None
+        if not attempt and self.metrics is not None:
+            self.metrics.timing("resilience.call", seconds)
+
+    def _hedge_delay(self, endpoint):
+        # The hedge_quantile of recent attempt latencies, recomputed when they change.
+        with self.lock:
+            s = self._stats[endpoint]
+            if len(s.attempt_latencies) < MIN_SAMPLES:
+                return HEDGE_DELAY
+            if s.hedge_delay is None:
+                s.hedge_delay = _quantile(s.attempt_latencies, self.hedge_quantile)
+            return s.hedge_delay
+
+
+class ResilientService(object):
+    ''' A service called under a Resilience policy
+
+    Parameters
+    ----------
+    service : callable
+        service to call
+    resilience : Resilience
+        policy
+    endpoint : string
+        name of the endpoint
+
+    Calling the object calls the service with the same keywords.
+    '''
+    def __init__(self, service, resilience, endpoint):
+        self.service = service
+        self.resilience = resilience
+        self.endpoint = endpoint
+        self.breaker = resilience.breaker(endpoint)
+
+    def __call__(self, **kwds):
+        t0 = time.monotonic()
+        deadline = self._start(t0)
+        for attempt in range(self.resilience.retries + 1):
+            self._admit()
+            try:
+                result = self._attempt(kwds, deadline)
+            except Exception as e:
+                time.sleep(self._retry_delay(e, attempt, deadline))
+            except BaseException:
+                self.breaker.record_abandoned()
+                raise
+            else:
+                return self._succeeded(result, t0)
+
+    def _start(self, t0):
+        # Counts a call, and returns its deadline.
+        policy = self.resilience
+        policy._count(self.endpoint, 'calls')
+        return None if policy.deadline is None else t0 + policy.deadline
+
+    def _admit(self):
+        # Raises CircuitOpenError if the circuit does not let an attempt through.
+        if not self.breaker.allow():
+            self.resilience._count(self.endpoint, 'rejected')
+            raise CircuitOpenError(f"Circuit of {self.endpoint} is open.")
+
+    def _succeeded(self, result, t0):
+        policy = self.resilience
+        self.breaker.record_success()
+        policy._count(self.endpoint, 'successes')
+        policy._record_latency(self.endpoint, time.monotonic() - t0, attempt=False)
+        return result
+
+    def _retry_delay(self, error, attempt, deadline):
+        # Records a failed attempt. Returns the delay before the next
+        # attempt, or raises if there is to be none.
+        policy = self.resilience
+        if isinstance(error, DeadlineExceeded):
+            self.breaker.record_failure()
+            policy._count(self.endpoint, 'deadline_exceeded')
+            policy._count(self.endpoint, 'failures')
+            raise error
+        if not is_transient(error):
+            # The service answered, with a fault of its own.
+            self.breaker.record_success()
+            policy._count(self.endpoint, 'failures')
+            raise error
+        self.breaker.record_failure()
+        if attempt == policy.retries:
+            policy._count(self.endpoint, 'failures')
+            raise error
+        delay = random.uniform(0, min(policy.backoff*2**attempt, policy.max_backoff))
+        if deadline is not None and time.monotonic() + delay >= deadline:
+            policy._count(self.endpoint, 'deadline_exceeded')
+            policy._count(self.endpoint, 'failures')
+            raise DeadlineExceeded(f"No time left to retry call to {self.endpoint}.") from error
+        logger.info(f"Retrying call to {self.endpoint} in {delay:.2f} s after {error!r}.")
+        policy._count(self.endpoint, 'retries')
+        return delay
+
+    def _attempt(self, kwds, deadline):
+        # Runs a single attempt, hedged if the policy asks for it.
+        policy = self.resilience
+        if deadline is None and not policy.hedge:
+            return self._timed(kwds)
+        futures = [policy.executor.submit(self._timed, kwds)]
+        if policy.hedge:
+            delay = policy._hedge_delay(self.endpoint)
+            if deadline is not None:
+                delay = min(delay, max(deadline - time.monotonic(), 0))
+            done, _ = wait(futures, timeout=delay)
+            if not done and (deadline is None or time.monotonic() < deadline):
+                policy._count(self.endpoint, 'hedged')
+                futures.append(policy.executor.submit(self._timed, kwds))
+        error = None
+        pending = set(futures)
+        while pending:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                raise DeadlineExceeded(f"Call to {self.endpoint} was not answered within "
+                                       f"{policy.deadline} s.")
+            for future in done:
+                if future.exception() is None:
+                    if future is not futures[0]:
+                        policy._count(self.endpoint, 'hedge_wins')
+                    return future.result()
+                error = error or future.exception()
+        raise error
+
+    def _timed(self, kwds):
+        t0 = time.monotonic()
+        result = self.service(**kwds)
+        self.resilience._record_latency(self.endpoint, time.monotonic() - t0, attempt=True)
+        return result
+
+
+class AsyncResilientService(ResilientService):
+    ''' A coroutine service called under a Resilience policy
+
+    Parameters are as for ResilientService, except that service must be a
+    coroutine function. Calling the object returns a coroutine. Attempts
+    run as tasks in the event loop instead of the thread pool, and attempts
+    given up on are cancelled.
+    '''
+    async def __call__(self, **kwds):
+        import asyncio
+        t0 = time.monotonic()
+        deadline = self._start(t0)
+        for attempt in range(self.resilience.retries + 1):
+            self._admit()
+            try:
+                result = await self._attempt(kwds, deadline)
+            except Exception as e:
+                await asyncio.sleep(self._retry_delay(e, attempt, deadline))
+            except BaseException:
+                # Cancelled (asyncio.CancelledError is not an Exception).
+                self.breaker.record_abandoned()
+                raise
+            else:
+                return self._succeeded(result, t0)
+
+    async def _attempt(self, kwds, deadline):
+        # Runs a single attempt, hedged if the policy asks for it.
+        import asyncio
+        policy = self.resilience
+        tasks = [asyncio.ensure_future(self._timed(kwds))]
+        try:
+            if policy.hedge:
+                delay = policy._hedge_delay(self.endpoint)
+                if deadline is not None:
+                    delay = min(delay, max(deadline - time.monotonic(), 0))
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done and (deadline is None or time.monotonic() < deadline):
+                    policy._count(self.endpoint, 'hedged')
+                    tasks.append(asyncio.ensure_future(self._timed(kwds)))
+            error = None
+            pending = set(tasks)
+            while pending:
+                timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    raise DeadlineExceeded(f"Call to {self.endpoint} was not answered within "
+                                           f"{policy.deadline} s.")
+                for task in done:
+                    if task.exception() is None:
+                        if task is not tasks[0]:
+                            policy._count(self.endpoint, 'hedge_wins')
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _timed(self, kwds):
+        t0 = time.monotonic()
+        result = await self.service(**kwds)
+        self.resilience._record_latency(self.endpoint, time.monotonic() - t0, attempt=True)
+        return result
@@ -0,0 +1,135 @@
+import json
+import sqlite3
+import threading
+
+
+class ArgosPassStore(object):
+    ''' Persistent store of satellite passes, backed by an SQLite database.
+
+    Satellite passes are keyed by platform identifier, bestMsgDate and the
+    selected raw payload. Together with the time of the last successful
+    poll of each platform, this allows ArgosPlatformInfo.poll() to return
+    only satellite passes not seen before.
+
+    Parameters
+    ----------
+    filename : string (optional) Default : ":memory:"
+        name of the database file. The default keeps the store in memory.
+
+    The store can be shared by several threads.
+    '''
+    SCHEMA = ["""CREATE TABLE IF NOT EXISTS passes (
+                     platformId TEXT NOT NULL,
+                     bestMsgDate TEXT NOT NULL,
+                     payload TEXT NOT NULL,
+                     quality_flag INTEGER NOT NULL,
+                     info TEXT NOT NULL,
+                     PRIMARY KEY (platformId, bestMsgDate, payload))""",
+              """CREATE TABLE IF NOT EXISTS polls (
+                     platformId TEXT PRIMARY KEY,
+                     last_poll REAL NOT NULL)"""]
+
+    def __init__(self, filename=":memory:"):
+        self.filename = filename
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(filename, check_same_thread=False)
+        with self.lock, self.connection:
+            for statement in self.SCHEMA:
+                self.connection.execute(statement)
+
+    def close(self):
+        ''' Closes the database '''
+        with self.lock:
+            self.connection.close()
+
+    def has_pass(self, platformId, bestMsgDate, payload):
+        ''' Checks whether a satellite pass is stored
+
+        Parameters
+        ----------
+        platformId : string
+            platform identifier
+        bestMsgDate : string
+            bestMsgDate of the satellite pass
+        payload : string or None
+            selected raw payload
+
+        Returns
+        -------
+        bool
+        '''
+        with self.lock:
+            cursor = self.connection.execute("SELECT 1 FROM passes WHERE platformId=? AND bestMsgDate=? AND payload=?",
+                                             (platformId, bestMsgDate, payload or ""))
+            return cursor.fetchone() is not None
+
+    def add_pass(self, platformId, bestMsgDate, payload, info):
+        ''' Adds a satellite pass
+
+        Parameters
+        ----------
+        platformId : string
+            platform identifier
+        bestMsgDate : string
+            bestMsgDate of the satellite pass
+        payload : string or None
+            selected raw payload
+        info : dict
+            payload information as returned by ArgosPlatformInfo.get_info()
+        '''
+        with self.lock, self.connection:
+            self.connection.execute("INSERT OR IGNORE INTO passes VALUES (?, ?, ?, ?, ?)",
+                                    (platformId, bestMsgDate, payload or "",
+                                     info['gps_location_qf'], json.dumps(info)))
+
+    def get_passes(self, platformId, minimum_quality_flag=0):
+        ''' Gets the stored satellite passes of a platform
+
+        Parameters
+        ----------
+        platformId : string
+            platform identifier
+        minimum_quality_flag : int (optional) Default : 0
+            satellite passes with a lower quality flag are skipped.
+
+        Returns
+        -------
+        list of dict
+           dictionaries with payload information, latest first.
+        '''
+        with self.lock:
+            cursor = self.connection.execute("SELECT info FROM passes WHERE platformId=? AND quality_flag>=? "
+                                             "ORDER BY bestMsgDate DESC",
+                                             (platformId, minimum_quality_flag))
+            return [json.loads(info) for (info,) in cursor]
+
+    def last_poll(self, platformId):
+        ''' Gets the time of the last successful poll of a platform
+
+        Parameters
+        ----------
+        platformId : string
+            platform identifier
+
+        Returns
+        -------
+        float or None
+            time in seconds since epoch, or None if the platform was never polled.
+        '''
+        with self.lock:
+            cursor = self.connection.execute("SELECT last_poll FROM polls WHERE platformId=?", (platformId,))
+            row = cursor.fetchone()
+        return row and row[0]
+
+    def set_last_poll(self, platformId, t):
+        ''' Sets the time of the last successful poll of a platform
+
+        Parameters
+        ----------
+        platformId : string
+            platform identifier
+        t : float
+            time in seconds since epoch
+        '''
+        with self.lock, self.connection:
+            self.connection.execute("INSERT OR REPLACE INTO polls VALUES (?, ?)", (platformId, t))
@@ -0,0 +1,412 @@
+''' Synthetic data and a local stand-in for the Argos webservice
+
+This module provides the means to exercise the package without access to
+the CLS webservice, for tests, benchmarks and profiling:
+
+* encode_payload() builds hexadecimal payloads for a codec profile;
+* synthetic_response() and synthetic_platform_list() build responses in
+  the format returned by the getXml and getPlatformList calls, of any size;
+* SoapStandin is a local HTTP server that serves a WSDL and answers
+  getXml and getPlatformList calls, with a configurable latency, and
+  faults injected by random_faults() or any other policy.
+
+Example
+-------
+
+    with SoapStandin(responses={'260603': synthetic_response('260603', 100)},
+                     latency=0.05) as standin:
+        api = ArgosPlatformInfo(wsdl=standin.wsdl_url)
+        api.retrieve('260603', username='user', password='secret')
+'''
+
+import random
+import threading
+import time
+import xml.etree.ElementTree as ET
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from xml.sax.saxutils import escape
+
+from . import argosCodec
+from . import argosMessage
+
+NAMESPACE = "http://service.dataxmldistribution.argos.cls.fr/types"
+SOAP_NAMESPACE = "http://schemas.xmlsoap.org/soap/envelope/"
+
+WSDL = '''<?xml version="1.0" encoding="UTF-8"?>
+<definitions xmlns="http://schemas.xmlsoap.org/wsdl/"
+             xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/"
+             xmlns:xsd="http://www.w3.org/2001/XMLSchema"
+             xmlns:tns="{namespace}"
+             targetNamespace="{namespace}">
+  <types>
+    <xsd:schema targetNamespace="{namespace}" elementFormDefault="qualified">
+      <xsd:element name="xmlRequest">
+        <xsd:complexType><xsd:sequence>
+          <xsd:element name="username" type="xsd:string"/>
+          <xsd:element name="password" type="xsd:string"/>
+          <xsd:element name="platformId" type="xsd:string" minOccurs="0"/>
+          <xsd:element name="nbDaysFromNow" type="xsd:int" minOccurs="0"/>
+          <xsd:element name="displayLocation" type="xsd:boolean" minOccurs="0"/>
+          <xsd:element name="displayRawData" type="xsd:boolean" minOccurs="0"/>
+        </xsd:sequence></xsd:complexType>
+      </xsd:element>
+      <xsd:element name="platformListRequest">
+        <xsd:complexType><xsd:sequence>
+          <xsd:element name="username" type="xsd:string"/>
+          <xsd:element name="password" type="xsd:string"/>
+        </xsd:sequence></xsd:complexType>
+      </xsd:element>
+      <xsd:element name="stringResponse">
+        <xsd:complexType><xsd:sequence>
+          <xsd:element name="return" type="xsd:string"/>
+        </xsd:sequence></xsd:complexType>
+      </xsd:element>
+    </xsd:schema>
+  </types>
+  <message name="getXmlRequest"><part name="parameters" element="tns:xmlRequest"/></message>
+  <message name="getPlatformListRequest"><part name="parameters" element="tns:platformListRequest"/></message>
+  <message name="stringResponse"><part name="parameters" element="tns:stringResponse"/></message>
+  <portType name="DixServicePortType">
+    <operation name="getXml"><input message="tns:getXmlRequest"/><output message="tns:stringResponse"/></operation>
+    <operation name="getPlatformList"><input message="tns:getPlatformListRequest"/><output message="tns:stringResponse"/></operation>
+  </portType>
+  <binding name="DixServiceBinding" type="tns:DixServicePortType">
+    <soap:binding style="document" transport="http://schemas.xmlsoap.org/soap/http"/>
+    <operation name="getXml"><soap:operation soapAction="getXml"/><input><soap:body use="literal"/></input><output><soap:body use="literal"/></output></operation>
+    <operation name="getPlatformList"><soap:operation soapAction="getPlatformList"/><input><soap:body use="literal"/></input><output><soap:body use="literal"/></output></operation>
+  </binding>
+  <service name="DixService">
+    <port name="DixServicePort" binding="tns:DixServiceBinding"><soap:address location="{location}"/></port>
+  </service>
+</definitions>
+'''
+
+ENVELOPE = ('<?xml version="1.0" encoding="UTF-8"?>'
+            '<soap:Envelope xmlns:soap="{soap}"><soap:Body>{body}</soap:Body></soap:Envelope>')
+
+RESPONSE = '<tns:stringResponse xmlns:tns="{namespace}"><tns:return>{value}</tns:return></tns:stringResponse>'
+
+FAULT = '<soap:Fault><faultcode>soap:Server</faultcode><faultstring>{message}</faultstring></soap:Fault>'
+
+
+def encode_payload(values, profile=None, valid_crc=True):
+    ''' Encodes values into a hexadecimal payload
+
+    Parameters
+    ----------
+    values : dict
+        value of each field of the codec profile. Missing fields are 0.
+    profile : string, argosCodec.CodecProfile or None (optional) Default : None
+        codec profile. If None, the default profile is used.
+    valid_crc : bool (optional) Default : True
+        if False, the checksum is deliberately wrong
+
+    Returns
+    -------
+    str
+        payload, such that ArgosMessageDecoder(profile) decodes it into values
+    '''
+    codec = argosCodec.compile_profile(argosCodec.get_profile(profile))
+    digits = []
+    for name, size, factor in zip(codec.names, codec.sizes, codec.factors):
+        x = int(round(values.get(name, 0)/factor)) % 16**size
+        digits.append(f"{x:0{size}X}")
+    message = "".join(digits)
+    crc8 = (256 - sum(bytes.fromhex(message)) % 256) % 256
+    if not valid_crc:
+        crc8 = (crc8 + 1) % 256
+    return message + f"{crc8:02X}"
+
+
+def _iso(t):
+    return argosMessage.format_date(t)[:-1] + ".000Z"
+
+
+def synthetic_response(platformId, number_of_passes, messages_per_pass=4, start=1.7e9,
+                       pass_interval=3600., bad_crc_fraction=0.2, location_fraction=0.5,
+                       programNumber="3932", seed=0, displayRawData=True, displayLocation=True):
+    ''' Builds a getXml response with synthetic satellite passes
+
+    Parameters
+    ----------
+    platformId : string
+        platform identifier
+    number_of_passes : int
+        number of satellite passes
+    messages_per_pass : int (optional) Default : 4
+        number of messages of each satellite pass
+    start : float (optional) Default : 1.7e9
+        time of the first satellite pass, in seconds since 1970-01-01
+    pass_interval : float (optional) Default : 3600.
+        time in seconds between satellite passes
+    bad_crc_fraction : float (optional) Default : 0.2
+        fraction of the messages with a wrong checksum
+    location_fraction : float (optional) Default : 0.5
+        fraction of the satellite passes that have an Argos location
+    programNumber : string (optional) Default : "3932"
+        program number
+    seed : int (optional) Default : 0
+        seed of the random number generator
+    displayRawData, displayLocation : bool (optional) Default : True
+        if False, the messages, respectively the Argos locations, are
+        left out, as the flags of the getXml call ask for
+
+    Returns
+    -------
+    str
+        response in the format returned by the getXml call
+
+    The platform drifts along a random walk around 54N, 7E. Payloads
+    are encoded with the codec profile of the platform.
+    '''
+    rng = random.Random(seed)
+    profile = argosCodec.platform_profile(platformId)
+    lat, lon = 5400.0, 700.0
+    parts = ['<?xml version="1.0" encoding="ISO-8859-1"?><data version="1.0"><program>',
+             f'<programNumber>{programNumber}</programNumber><platform>',
+             f'<platformId>{platformId}</platformId><platformType>GLIDER</platformType>',
+             '<platformModel>SLOC</platformModel>']
+    for i in range(number_of_passes):
+        t = start + i*pass_interval
+        lat += rng.uniform(-2, 2)
+        lon += rng.uniform(-2, 2)
+        parts.append(f'<satellitePass><satellite>MB</satellite>'
+                     f'<bestMsgDate>{_iso(t + 60*(messages_per_pass-1))}</bestMsgDate>'
+                     f'<duration>{60*messages_per_pass}</duration><nbMessage>{messages_per_pass}</nbMessage>'
+                     f'<message120>0</message120><bestLevel>-125</bestLevel><frequency>4.0165E8</frequency>')
+        if rng.random() < location_fraction:
+            location_class = rng.choice("ABZ0123")
+            if displayLocation:
+                parts.append(f'<location><locationDate>{_iso(t)}</locationDate>'
+                             f'<latitude>{lat/100:.3f}</latitude><longitude>{lon/100:.3f}</longitude>'
+                             f'<altitude>0</altitude><locationClass>{location_class}</locationClass>'
+                             f'</location>')
+        values = dict(present_time=t, lat=lat, lon=lon, fixtime=rng.randint(0, 300),
+                      latInvalid=-0.01, lonInvalid=-0.01, latToofar=-0.01, lonToofar=-0.01,
+                      U=rng.uniform(-0.5, 0.5), V=rng.uniform(-0.5, 0.5))
+        for j in range(messages_per_pass):
+            values['present_time'] = t + 60*j
+            payload = encode_payload(values, profile, valid_crc=rng.random() >= bad_crc_fraction)
+            date = _iso(t + 60*j)
+            if displayRawData:
+                parts.append(f'<message><bestDate>{date}</bestDate><compression>1</compression>'
+                             f'<collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated>'
+                             f'<date>{date}</date><level>-125.0</level><doppler>0.0</doppler>'
+                             f'<rawData>{payload}</rawData></collect></message>')
+        parts.append('</satellitePass>')
+    parts.append('</platform></program></data>')
+    return "".join(parts)
+
+
+def synthetic_platform_list(programs):
+    ''' Builds a getPlatformList response
+
+    Parameters
+    ----------
+    programs : dict
+        list of platform identifiers for each program number
+
+    Returns
+    -------
+    str
+        response in the format returned by the getPlatformList call
+    '''
+    parts = ['<?xml version="1.0" encoding="ISO-8859-1"?><data version="1.0">']
+    for programNumber, platform_ids in programs.items():
+        parts.append(f'<program><programNumber>{programNumber}</programNumber>')
+        for platformId in platform_ids:
+            parts.append(f'<platform><platformId>{platformId}</platformId>'
+                         f'<platformType>GLIDER</platformType><platformModel>SLOC</platformModel>'
+                         f'<lastCollectDate>2024-08-25T17:36:50.000Z</lastCollectDate></platform>')
+        parts.append('</program>')
+    parts.append('</data>')
+    return "".join(parts)
+
+
+class SoapStandin(object):
+    ''' Local HTTP stand-in for the Argos webservice
+
+    Parameters
+    ----------
+    responses : dict or callable or None (optional) Default : None
+        getXml responses, by platform identifier. A callable is called
+        with the request parameters as keywords and returns the response.
+        If None, synthetic responses of 10 satellite passes are served.
+    platform_list : string or None (optional) Default : None
+        getPlatformList response. If None, a list of the platforms in
+        responses (if a dict) is served.
+    latency : float or callable (optional) Default : 0
+        time in seconds to wait before answering a request, or a callable
+        returning it
+    host : string (optional) Default : "127.0.0.1"
+        address to listen on. The port is chosen by the operating system.
+    faults : callable or None (optional) Default : None
+        called with the operation and the request parameters before each
+        request is answered. It returns None to answer normally, or the
+        fault to inject instead: "unavailable" (HTTP 503 without SOAP
+        envelope), "reset" (the connection is closed without answer) or
+        "fault" (a SOAP fault).
+
+    The server runs in a background thread between start() and stop(), or
+    within a with block. The WSDL is served at wsdl_url. The number of
+    requests answered is counted per operation in the attribute calls,
+    and the faults injected per kind in the attribute faults_injected.
+    Unknown platforms are answered with a SOAP fault.
+    '''
+    def __init__(self, responses=None, platform_list=None, latency=0, host="127.0.0.1", faults=None):
+        self.responses = responses
+        self.platform_list = platform_list
+        self.latency = latency
+        self.host = host
+        self.faults = faults
+        self.calls = dict(getXml=0, getPlatformList=0)
+        self.faults_injected = dict(unavailable=0, reset=0, fault=0)
+        self.lock = threading.Lock()
+        self.server = None
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    @property
+    def wsdl_url(self):
+        return self.url + "?wsdl"
+
+    def start(self):
+        ''' Starts serving in a background thread '''
+        standin = self
+        class Handler(_Handler):
+            pass
+        Handler.standin = standin
+        self.server = ThreadingHTTPServer((self.host, 0), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        ''' Stops serving '''
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def wsdl(self):
+        return WSDL.format(namespace=NAMESPACE, location=self.url)
+
+    def delay(self):
+        latency = self.latency() if callable(self.latency) else self.latency
+        if latency:
+            time.sleep(latency)
+
+    def fault(self, operation, parameters):
+        ''' Returns the fault to inject in the answer to a request, or None '''
+        if self.faults is None:
+            return None
+        fault = self.faults(operation, parameters)
+        if fault is not None:
+            if fault not in self.faults_injected:
+                raise ValueError(f"Unknown fault {fault}")
+            with self.lock:
+                self.faults_injected[fault] += 1
+        return fault
+
+    def answer(self, operation, parameters):
+        ''' Returns the response string of an operation; raises LookupError if there is none '''
+        with self.lock:
+            self.calls[operation] = self.calls.get(operation, 0) + 1
+        if operation == "getXml":
+            if self.responses is None:
+                return synthetic_response(parameters.get("platformId"), 10)
+            if callable(self.responses):
+                return self.responses(**parameters)
+            try:
+                return self.responses[parameters.get("platformId")]
+            except KeyError:
+                raise LookupError(f"Unknown platform {parameters.get('platformId')}")
+        elif operation == "getPlatformList":
+            if self.platform_list is not None:
+                return self.platform_list
+            platform_ids = list(self.responses) if isinstance(self.responses, dict) else []
+            return synthetic_platform_list({"3932": platform_ids})
+        raise LookupError(f"Unknown operation {operation}")
+
+
+def random_faults(fraction, kinds=("unavailable", "reset"), seed=None):
+    ''' Returns a fault policy for SoapStandin injecting random faults
+
+    Parameters
+    ----------
+    fraction : float
+        fraction of the requests answered with a fault
+    kinds : sequence of string (optional) Default : ("unavailable", "reset")
+        kinds of faults, drawn with equal probability
+    seed : int or None (optional) Default : None
+        seed of the random generator
+
+    Returns
+    -------
+    callable
+    '''
+    rng = random.Random(seed)
+    lock = threading.Lock()
+    def faults(operation, parameters):
+        with lock:
+            if rng.random() < fraction:
+                return rng.choice(kinds)
+        return None
+    return faults
+
+
+class _Handler(BaseHTTPRequestHandler):
+    standin = None
+    protocol_version = "HTTP/1.1"
+
+    OPERATIONS = {"xmlRequest": "getXml", "platformListRequest": "getPlatformList"}
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._send(200, self.standin.wsdl(), "text/xml")
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.standin.delay()
+        try:
+            request = ET.fromstring(body).find(f"{{{SOAP_NAMESPACE}}}Body")[0]
+            operation = self.OPERATIONS[request.tag.split("}")[-1]]
+            parameters = dict((e.tag.split("}")[-1], e.text) for e in request)
+            if "nbDaysFromNow" in parameters:
+                parameters["nbDaysFromNow"] = int(parameters["nbDaysFromNow"])
+            fault = self.standin.fault(operation, parameters)
+            if fault == "unavailable":
+                self._send(503, "Service Unavailable", "text/plain")
+                return
+            if fault == "reset":
+                self.close_connection = True
+                return
+            if fault == "fault":
+                raise RuntimeError("Injected fault")
+            value = self.standin.answer(operation, parameters)
+        except Exception as e:
+            envelope = ENVELOPE.format(soap=SOAP_NAMESPACE, body=FAULT.format(message=escape(str(e))))
+            self._send(500, envelope, "text/xml")
+            return
+        body = RESPONSE.format(namespace=NAMESPACE, value=escape(value))
+        self._send(200, ENVELOPE.format(soap=SOAP_NAMESPACE, body=body), "text/xml")
+
+    def _send(self, status, text, content_type):
+        data = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
@@ -0,0 +1,332 @@
+''' Trajectory analytics of decoded fixes
+
+analyse() takes the fixes of a platform in columnar form, as returned by
+ArgosPlatformInfo.get_info(output="columns"), and computes in one pass,
+with numpy:
+
+- the great-circle distance, time step, speed and bearing from the
+  previous fix with a position, and the eastward and northward velocity
+  over ground (drift_u, drift_v);
+- the time since the previous fix with a position;
+- spikes: fixes that are further than max_speed allows from both the
+  fixes before and after them;
+- outliers of the depth-averaged current (U, V): currents faster than
+  max_current, or more than CURRENT_SIGMAS standard deviations away from
+  the mean current of the platform.
+
+analyse_fleet() does the same for a whole fleet at once, for example for
+the result of ArgosFleetClient.retrieve_many(..., output="columns"):
+the fixes of all platforms are concatenated and processed together, with
+the differences taken within platforms only.
+
+Payloads are used if the quality flag is at least minimum_quality_flag.
+The time of a fix is then the time of the decoded message (the time
+field of the codec profile), and its position the GPS position,
+converted from DDMM.mm to decimal degrees. Otherwise, the date and
+position of the Argos location are used. The GPS position and currents are read from
+the columns lat, lon, U and V, where present.
+'''
+
+import numpy as np
+
+from . import argosClient
+from . import argosMessage
+
+# Mean radius of the earth in m
+EARTH_RADIUS = 6371008.8
+# Speed in m/s above which a fix is a spike
+MAX_SPEED = 2.0
+# Speed of the depth-averaged current in m/s above which it is an outlier
+MAX_CURRENT = 1.5
+# Number of standard deviations from the mean current beyond which a current is an outlier
+CURRENT_SIGMAS = 4.0
+
+
+def ddmm_to_degrees(values):
+    ''' Converts latitudes or longitudes from DDMM.mm to decimal degrees
+
+    Vectorised form of argosMessage.ddmm_to_degrees().
+
+    Parameters
+    ----------
+    values : array of float
+        positions in DDMM.mm
+
+    Returns
+    -------
+    numpy array of float
+        positions in decimal degrees, NaN where missing
+    '''
+    values = np.asarray(values, dtype=np.float64)
+    values = np.where(values == argosMessage.MISSING_POSITION, np.nan, values)
+    degrees, minutes = np.divmod(np.abs(values), 100)
+    return np.copysign(degrees + minutes/60, values)
+
+
+def distance(lat0, lon0, lat1, lon1):
+    ''' Returns the great-circle distance in m between positions in decimal degrees '''
+    lat0, lon0, lat1, lon1 = map(np.radians, (lat0, lon0, lat1, lon1))
+    a = np.sin((lat1 - lat0)/2)**2 + np.cos(lat0)*np.cos(lat1)*np.sin((lon1 - lon0)/2)**2
+    return 2*EARTH_RADIUS*np.arcsin(np.sqrt(np.minimum(a, 1.)))
+
+
+def bearing(lat0, lon0, lat1, lon1):
+    ''' Returns the initial bearing in degrees (clockwise from north, 0 to 360) from one position to another '''
+    lat0, lon0, lat1, lon1 = map(np.radians, (lat0, lon0, lat1, lon1))
+    y = np.sin(lon1 - lon0)*np.cos(lat1)
+    x = np.cos(lat0)*np.sin(lat1) - np.sin(lat0)*np.cos(lat1)*np.cos(lon1 - lon0)
+    return np.degrees(np.arctan2(y, x)) % 360
+
+
+class Trajectory(object):
+    ''' Trajectories of one or more platforms
+
+    Parameters
+    ----------
+    data : numpy structured array
+        one row per fix, with the dtype Trajectory.DTYPE, sorted by platform and time
+    platform_ids : list of string
+        platform identifiers, indexed by the column platform
+
+    A column is obtained by indexing with its name. The columns are
+
+    platform          index of the platform identifier in platform_ids
+    time              time of the fix in seconds since 1970-01-01
+    latitude          decimal degrees, NaN if the fix has no position
+    longitude         decimal degrees, NaN if the fix has no position
+    gps               True if the position is the GPS position
+    distance          m from the previous fix with a position
+    time_step         s from the previous fix with a position
+    speed             speed over ground in m/s
+    bearing           degrees, clockwise from north
+    drift_u, drift_v  eastward and northward velocity over ground in m/s
+    time_since_fix    s since the previous fix with a position
+    U, V              depth-averaged current in m/s, NaN if not valid
+    spike             True if the position is a spike
+    current_outlier   True if the current is an outlier
+
+    distance, time_step, speed, bearing, drift_u and drift_v are NaN for
+    fixes without a position and for the first fix with a position of
+    each platform; time_since_fix is NaN before the first fix with a position.
+    '''
+    DTYPE = np.dtype([('platform', np.int32), ('time', np.float64),
+                      ('latitude', np.float64), ('longitude', np.float64), ('gps', np.bool_),
+                      ('distance', np.float64), ('time_step', np.float64), ('speed', np.float64),
+                      ('bearing', np.float64), ('drift_u', np.float64), ('drift_v', np.float64),
+                      ('time_since_fix', np.float64), ('U', np.float64), ('V', np.float64),
+                      ('spike', np.bool_), ('current_outlier', np.bool_)])
+
+    def __init__(self, data, platform_ids):
+        self.data = data
+        self.platform_ids = platform_ids
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def platform(self, platformId):
+        ''' Returns the trajectory of a single platform
+
+        Parameters
+        ----------
+        platformId : string
+            platform identifier
+
+        Returns
+        -------
+        Trajectory
+        '''
+        i = self.platform_ids.index(platformId)
+        start, end = np.searchsorted(self.data['platform'], [i, i + 1])
+        data = self.data[start:end].copy()
+        data['platform'] = 0
+        return Trajectory(data, [platformId])
+
+    def split(self):
+        ''' Returns the trajectory of each platform, by platform identifier '''
+        return dict((platformId, self.platform(platformId)) for platformId in self.platform_ids)
+
+    def current_statistics(self):
+        ''' Returns statistics of the depth-averaged current of each platform
+
+        Currents that are not valid, or are outliers, are left out.
+
+        Returns
+        -------
+        dict
+            for each platform identifier, a dictionary with the number of
+            currents n, the means mean_U and mean_V, the standard deviations
+            std_U and std_V, the mean speed of the currents mean_speed, and the
+            speed of the mean current speed_of_mean. Values are NaN if n is 0.
+        '''
+        n, mean_U, mean_V, std_U, std_V, mean_speed = _current_moments(
+            self.data['platform'], self.data['U'], self.data['V'], ~self.data['current_outlier'],
+            len(self.platform_ids))
+        speed_of_mean = np.hypot(mean_U, mean_V)
+        return dict((platformId, dict(n=int(n[i]), mean_U=float(mean_U[i]), mean_V=float(mean_V[i]),
+                                      std_U=float(std_U[i]), std_V=float(std_V[i]),
+                                      mean_speed=float(mean_speed[i]), speed_of_mean=float(speed_of_mean[i])))
+                    for i, platformId in enumerate(self.platform_ids))
+
+
+def analyse(columns, platformId=None, minimum_quality_flag=argosClient.CRC, max_speed=MAX_SPEED,
+            max_current=MAX_CURRENT):
+    ''' Computes the trajectory of a platform
+
+    Parameters
+    ----------
+    columns : argosRecords.FixColumns
+        fixes of the platform, as returned by ArgosPlatformInfo.get_info(output="columns")
+    platformId : string or None (optional) Default : None
+        platform identifier, used in the result
+    minimum_quality_flag : int (optional) Default : argosClient.CRC
+        GPS positions and currents with a lower quality flag are not used
+    max_speed : float (optional) Default : MAX_SPEED
+        speed in m/s above which a fix is a spike
+    max_current : float (optional) Default : MAX_CURRENT
+        speed in m/s above which a depth-averaged current is an outlier
+
+    Returns
+    -------
+    Trajectory
+        fixes sorted by time. Fixes without a time are left out.
+    '''
+    return analyse_fleet({platformId: columns}, minimum_quality_flag, max_speed, max_current)
+
+
+def analyse_fleet(fleet, minimum_quality_flag=argosClient.CRC, max_speed=MAX_SPEED, max_current=MAX_CURRENT):
+    ''' Computes the trajectories of a fleet of platforms at once
+
+    Parameters
+    ----------
+    fleet : dict
+        fixes of each platform identifier, as argosRecords.FixColumns or
+        as the argosClient.FleetResult holding them. Platforms whose
+        retrieval failed are left out.
+
+    See analyse() for the other parameters.
+
+    Returns
+    -------
+    Trajectory
+        fixes sorted by platform, in the order given, and time
+    '''
+    platform_ids = []
+    parts = []
+    for platformId, columns in fleet.items():
+        if isinstance(columns, argosClient.FleetResult):
+            columns = columns.info
+        if columns is None:
+            continue
+        parts.append(_extract(columns, len(platform_ids), minimum_quality_flag))
+        platform_ids.append(platformId)
+    if not parts:
+        return Trajectory(np.zeros(0, dtype=Trajectory.DTYPE), platform_ids)
+    platform, t, latitude, longitude, gps, U, V = [np.concatenate(c) for c in zip(*parts)]
+    keep = ~np.isnan(t)
+    order = np.lexsort((t[keep], platform[keep]))
+    data = np.zeros(len(order), dtype=Trajectory.DTYPE)
+    for k, values in [('platform', platform), ('time', t), ('latitude', latitude), ('longitude', longitude),
+                      ('gps', gps), ('U', U), ('V', V)]:
+        data[k] = values[keep][order]
+    _differentiate(data, max_speed)
+    _flag_currents(data, len(platform_ids), max_current)
+    return Trajectory(data, platform_ids)
+
+
+def _extract(columns, index, minimum_quality_flag):
+    # Returns the platform index, time, position, position source and
+    # current of each fix, as arrays.
+    codec = columns.codec
+    names = columns.names
+    n = len(columns)
+    nan = np.full(n, np.nan)
+    trusted = columns['gps_location_qf'] >= max(minimum_quality_flag, argosClient.BESTMGS)
+    if codec.time_field in names:
+        t = np.where(trusted, columns[codec.time_field] + codec.epoch, np.nan)
+    else:
+        t = nan.copy()
+    # Only the dates of the Argos locations that are needed are parsed.
+    dates = columns['argos_date']
+    needed = np.flatnonzero((dates != b'') & np.isnan(t))
+    argos_time = np.char.rstrip(dates[needed], b'Z').astype('U').astype('datetime64[ms]')
+    t[needed] = argos_time.astype(np.int64)/1000.
+    if 'lat' in names and 'lon' in names:
+        latitude = np.where(trusted, ddmm_to_degrees(columns['lat']), np.nan)
+        longitude = np.where(trusted, ddmm_to_degrees(columns['lon']), np.nan)
+    else:
+        latitude, longitude = nan, nan
+    gps = ~(np.isnan(latitude) | np.isnan(longitude))
+    latitude = np.where(gps, latitude, columns['argos_latitude'])
+    longitude = np.where(gps, longitude, columns['argos_longitude'])
+    if 'U' in names and 'V' in names:
+        U = np.where(trusted, columns['U'], np.nan)
+        V = np.where(trusted, columns['V'], np.nan)
+    else:
+        U, V = nan, nan
+    return np.full(n, index, dtype=np.int32), t, latitude, longitude, gps, U, V
+
+
+def _differentiate(data, max_speed):
+    # Differences between consecutive fixes with a position of the same platform.
+    platform, t = data['platform'], data['time']
+    latitude, longitude = data['latitude'], data['longitude']
+    for k in ('distance', 'time_step', 'speed', 'bearing', 'drift_u', 'drift_v', 'time_since_fix'):
+        data[k] = np.nan
+    has_position = ~(np.isnan(latitude) | np.isnan(longitude))
+    rows = np.flatnonzero(has_position)
+    if not len(rows):
+        return
+    # Time since the previous fix with a position, for all fixes
+    previous = np.where(has_position, np.arange(len(data)), -1)
+    previous = np.concatenate([[-1], np.maximum.accumulate(previous)[:-1]])
+    has_previous = previous >= 0
+    has_previous[has_previous] = platform[previous[has_previous]] == platform[has_previous]
+    data['time_since_fix'][has_previous] = t[has_previous] - t[previous[has_previous]]
+    # Steps between fixes with a position
+    i0, i1 = rows[:-1], rows[1:]
+    same = platform[i0] == platform[i1]
+    i0, i1 = i0[same], i1[same]
+    step = distance(latitude[i0], longitude[i0], latitude[i1], longitude[i1])
+    time_step = t[i1] - t[i0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        speed = np.where(time_step > 0, step/time_step, np.nan)
+    direction = bearing(latitude[i0], longitude[i0], latitude[i1], longitude[i1])
+    data['distance'][i1] = step
+    data['time_step'][i1] = time_step
+    data['speed'][i1] = speed
+    data['bearing'][i1] = direction
+    data['drift_u'][i1] = speed*np.sin(np.radians(direction))
+    data['drift_v'][i1] = speed*np.cos(np.radians(direction))
+    # A spike is too far from both its neighbours: the speed into it and
+    # the speed out of it (the speed into the next fix) are too high.
+    too_fast = speed > max_speed
+    spike = too_fast[:-1] & too_fast[1:] & (i1[:-1] == i0[1:])
+    data['spike'][i1[:-1][spike]] = True
+
+
+def _current_moments(platform, U, V, selected, number_of_platforms):
+    # Number, means, standard deviations and mean speed of the valid currents of each platform.
+    valid = selected & ~(np.isnan(U) | np.isnan(V))
+    platform, U, V = platform[valid], U[valid], V[valid]
+    n = np.bincount(platform, minlength=number_of_platforms)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_U = np.bincount(platform, U, number_of_platforms)/n
+        mean_V = np.bincount(platform, V, number_of_platforms)/n
+        std_U = np.sqrt(np.maximum(np.bincount(platform, U*U, number_of_platforms)/n - mean_U**2, 0))
+        std_V = np.sqrt(np.maximum(np.bincount(platform, V*V, number_of_platforms)/n - mean_V**2, 0))
+        mean_speed = np.bincount(platform, np.hypot(U, V), number_of_platforms)/n
+    return n, mean_U, mean_V, std_U, std_V, mean_speed
+
+
+def _flag_currents(data, number_of_platforms, max_current):
+    # Flags currents that are too fast, or too far from the mean of their platform.
+    platform, U, V = data['platform'], data['U'], data['V']
+    _, mean_U, mean_V, std_U, std_V, _ = _current_moments(platform, U, V, np.ones(len(data), dtype=bool),
+                                                          number_of_platforms)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z_U = np.abs(U - mean_U[platform])/std_U[platform]
+        z_V = np.abs(V - mean_V[platform])/std_V[platform]
+    data['current_outlier'] = (np.hypot(U, V) > max_current) | (z_U > CURRENT_SIGMAS) | (z_V > CURRENT_SIGMAS)
@@ -30,8 +30,44 @@ else:
         return decorator
 
 
-from argos.argosMessage import ArgosMessageDecoder
-from argos.argosClient import ArgosProgramInfo, ArgosPlatformInfo
+import asyncio
+import csv
+import datetime
+import io
+import json
+import math
+import os
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from argos import argosCodec
+from argos import argosMessage
+from argos.argosMessage import ArgosMessageDecoder, PayloadCache
+from argos import argosClient
+from argos import argosAsync
+from argos.argosStore import ArgosPassStore
+from argos.argosDaemon import ArgosDaemon, JsonLinesSink
+from argos import argosReprocess
+from argos import argosExport
+from argos.argosArchive import ArgosArchive
+from argos.argosIndex import FixIndex, to_seconds
+from argos import argosTrajectory
+from argos import argosTesting
+from argos import argosProfile
+from argos import argosCli
+from argos.argosResilience import Resilience, CircuitOpenError, DeadlineExceeded
+from argos.argosCatalogue import ArgosCatalogue
+from argos.argosCache import ResponseCache
+from argos.argosMetrics import MetricsRecorder
+from argos.argosRecords import FixColumns
+from argos.argosClient import ArgosProgramInfo, ArgosPlatformInfo, ArgosFleetClient, CRC
+
+WSDL = os.path.join(os.path.dirname(__file__), "data", "argos_service.wsdl")
 
 @fixture()
 def load_hexstring_data():
@@ -76,12 +112,34 @@ class ArgosPlatformInfoNoDownload(ArgosPlatformInfo):
     def service_factory(self, wsdl):
         return self._service
 
-    def _service(self, username=None, password=None, platformId=None, displayRawData=True, nbDaysFromNow=20):
+    def _service(self, username=None, password=None, platformId=None, displayRawData=True, displayLocation=True, nbDaysFromNow=20):
         data = {'27011':
                 '<?xml version="1.0" encoding="ISO-8859-1"?><data version="1.0"><program><programNumber>3932</programNumber><platform><platformId>27011</platformId><platformType>GLIDER</platformType><platformModel>UNKOWN</platformModel><platformName>AMADEUS</platformName><satellitePass><satellite>CS</satellite><bestMsgDate>2024-08-25T17:36:50.000Z</bestMsgDate><duration>0</duration><nbMessage>1</nbMessage><message120>0</message120><bestLevel>-138</bestLevel><frequency>4.0165E8</frequency><message><bestDate>2024-08-25T17:36:50.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-25T17:36:50.000Z</date><level>-139.0</level><doppler>22694.703</doppler><rawData>997F00EAF79DEC0FA84723DF71F761C290FD64C1</rawData></collect></message></satellitePass><satellitePass><satellite>NP</satellite><bestMsgDate>2024-09-02T07:09:27.000Z</bestMsgDate><duration>0</duration><nbMessage>1</nbMessage><message120>0</message120><bestLevel>-129</bestLevel><frequency>4.0165E8</frequency><message><bestDate>2024-09-02T07:09:27.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-09-02T07:09:27.000Z</date><level>-129.0</level><doppler>-987.333</doppler><rawData>C62C9F564B0D40D4</rawData></collect></message></satellitePass><satellitePass><satellite>NN</satellite><bestMsgDate>2024-09-02T11:23:52.000Z</bestMsgDate><duration>0</duration><nbMessage>1</nbMessage><message120>0</message120><bestLevel>-135</bestLevel><frequency>4.0165E8</frequency><message><bestDate>2024-09-02T11:23:52.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-09-02T11:23:52.000Z</date><level>-135.0</level><doppler>-8037.372</doppler><rawData>66D5A108081FC10190AC0000081FD60190AC0024FCFFFFFFFFFFFFFF00009200</rawData></collect></message></satellitePass><satellitePass><satellite>O3</satellite><bestMsgDate>2024-09-02T13:23:53.000Z</bestMsgDate><duration>0</duration><nbMessage>1</nbMessage><message120>0</message120><bestLevel>-134</bestLevel><frequency>4.0165E8</frequency><message><bestDate>2024-09-02T13:23:53.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-09-02T13:23:53.000Z</date><level>-135.0</level><doppler>-5393.731</doppler><rawData>66D5BD24081FD00190AC0000081FD00190AC0006FFFFFFFFFFFFFFFF00007E00</rawData></collect></message></satellitePass></platform></program></data>',
                 '260603':'<?xml version="1.0" encoding="ISO-8859-1"?><data version="1.0"><program><programNumber>3932</programNumber><platform><platformId>260603</platformId><platformType>GLIDER</platformType><platformModel>SLOC</platformModel><satellitePass><satellite>SR</satellite><bestMsgDate>2024-08-21T20:15:51.000Z</bestMsgDate><duration>634</duration><nbMessage>7</nbMessage><message120>0</message120><bestLevel>-124</bestLevel><frequency>4.0165002806E8</frequency><message><bestDate>2024-08-21T20:06:44.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-21T20:06:44.000Z</date><level>-134.0</level><doppler>8076.428</doppler><rawData>66C6487501B951FC9099000001B9FCFC90640002FFFFFFFFFFFF000000FF46</rawData></collect></message><message><bestDate>2024-08-21T20:08:10.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-21T20:08:10.000Z</date><level>-127.0</level><doppler>7338.578</doppler><rawData>66C648CF01B951FC9099000201B9FCFC90640003FFFFFFFFFFFF000000FFE9</rawData></collect></message><message><bestDate>2024-08-21T20:11:10.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-21T20:11:10.000Z</date><level>-124.0</level><doppler>2726.588</doppler><rawData>66C6497D01B951FC9099000501B9FCFC90640006FFFFFFFFFFFF000000FF34</rawData></collect></message><message><bestDate>2024-08-21T20:15:51.000Z</bestDate><compression>3</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-21T20:12:50.000Z</date><level>-125.0</level><doppler>-1997.692</doppler><rawData>66C649D701B951FC9099000601B9FCFC90640008FFFFFFFFFFFF000000FFD7</rawData></collect><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-21T20:14:16.000Z</date><level>-125.0</level><doppler>-5175.337</doppler><rawData>66C649D701B951FC9099000601B9FCFC90640008FFFFFFFFFFFF000000FFD7</rawData></collect><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-21T20:15:51.000Z</date><level>-131.0</level><doppler>-7074.847</doppler><rawData>66C649D701B951FC9099000601B9FCFC90640008FFFFFFFFFFFF000000FFD7</rawData></collect></message><message><bestDate>2024-08-21T20:17:18.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-21T20:17:18.000Z</date><level>-128.0</level><doppler>-7896.427</doppler><rawData>66C64B2B01B951FC9099000C01B9FCFC9064000DFFFFFFFFFFFF000000FF76</rawData></collect></message></satellitePass><satellitePass><satellite>MC</satellite><bestMsgDate>2024-08-21T23:05:22.000Z</bestMsgDate><duration>0</duration><nbMessage>1</nbMessage><message120>0</message120><bestLevel>-129</bestLevel><frequency>4.0165004181E8</frequency><message><bestDate>2024-08-21T23:05:22.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-21T23:05:22.000Z</date><level>-129.0</level><doppler>-8885.754</doppler><rawData>010203</rawData></collect></message></satellitePass><satellitePass><satellite>NK</satellite><bestMsgDate>2024-08-22T08:03:52.000Z</bestMsgDate><duration>359</duration><nbMessage>3</nbMessage><message120>0</message120><bestLevel>-121</bestLevel><frequency>4.016500321E8</frequency><message><bestDate>2024-08-22T07:59:25.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-22T07:59:25.000Z</date><level>-135.0</level><doppler>7599.783</doppler><rawData>66C6EF1601B771FC9047000501B7E0FC907D0006FFFFFFFFFFFF000000003F</rawData></collect></message><message><bestDate>2024-08-22T08:03:52.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-22T08:03:52.000Z</date><level>-125.0</level><doppler>3252.609</doppler><rawData>66C6F0B501B771FC9047000C01B7E0FC907D000DFFFFFFFFFFFF000000007F</rawData></collect></message><message><bestDate>2024-08-22T08:05:24.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-22T08:05:24.000Z</date><level>-122.0</level><doppler>-45.336</doppler><rawData>739989C673309CE66735BB3198A91538C66B399FFFEF5555555554AAD54AA5</rawData></collect></message></satellitePass><satellitePass><satellite>O3</satellite><bestMsgDate>2024-08-22T13:46:38.000Z</bestMsgDate><duration>266</duration><nbMessage>3</nbMessage><message120>0</message120><bestLevel>-120</bestLevel><frequency>4.0165003394E8</frequency><message><bestDate>2024-08-22T13:43:45.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-22T13:43:45.000Z</date><level>-120.0</level><doppler>-5970.016</doppler><rawData>66C7403101B6FDFC8FCA000001B727FC901B0002FFFFFFFFFFFF00000000D7</rawData></collect></message><message><bestDate>2024-08-22T13:46:38.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-22T13:46:38.000Z</date><level>-130.0</level><doppler>-8788.816</doppler><rawData>66C740E201B6FDDDBB35EE0273339A3CC0CCAEB2AAFD1822CF8F8E60ABF073</rawData></collect></message><message><bestDate>2024-08-22T13:48:11.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-22T13:48:11.000Z</date><level>-136.0</level><doppler>-9016.576</doppler><rawData>66C7413701B6FDFC8FCA000501B727FC901B0006FFFFFFFFFFFF0000000047</rawData></collect></message></satellitePass><satellitePass><satellite>NN</satellite><bestMsgDate>2024-08-22T13:52:52.000Z</bestMsgDate><duration>281</duration><nbMessage>4</nbMessage><message120>0</message120><bestLevel>-129</bestLevel><frequency>4.0165001226E8</frequency><message><bestDate>2024-08-22T13:52:52.000Z</bestDate><compression>4</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-22T13:48:11.000Z</date><level>-135.0</level><doppler>4419.579</doppler><rawData>66C7413701B6FDFC8FCA000501B727FC901B0006FFFFFFFFFFFF00000000C7</rawData></collect><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-22T13:49:51.000Z</date><level>-130.0</level><doppler>2581.512</doppler><rawData>66C7413701B6FDFC8FCA000501B727FC901B0006FFFFFFFFFFFF00000000C7</rawData></collect><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-22T13:51:17.000Z</date><level>-135.0</level><doppler>672.197</doppler><rawData>66C7413701B6FDFC8FCA000501B727FC901B0006FFFFFFFFFFFF00000000C7</rawData></collect><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-22T13:52:52.000Z</date><level>-137.0</level><doppler>-1541.595</doppler><rawData>66C7413701B6FDFC8FCA000501B727FC901B0006FFFFFFFFFFFF00000000C7</rawData></collect></message></satellitePass><satellitePass><satellite>SR</satellite><bestMsgDate>2024-08-22T19:43:15.000Z</bestMsgDate><duration>548</duration><nbMessage>5</nbMessage><message120>0</message120><bestLevel>-125</bestLevel><frequency>4.0165002194E8</frequency><message><bestDate>2024-08-22T19:37:09.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-22T19:37:09.000Z</date><level>-127.0</level><doppler>8447.373</doppler><rawData>66C7930901B697FC8F2C000201B6D0FC8F920004FFFFFFFFFFFF000000008E</rawData></collect></message><message><bestDate>2024-08-22T19:43:15.000Z</bestDate><compression>2</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-22T19:41:50.000Z</date><level>-125.0</level><doppler>-4348.542</doppler><rawData>66C7936101B697FC8F2C000301B6D0FC8F920005FFFFFFFFFFFF0000000034</rawData></collect><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-22T19:43:15.000Z</date><level>-134.0</level><doppler>-7429.332</doppler><rawData>66C7936101B697FC8F2C000301B6D0FC8F920005FFFFFFFFFFFF0000000034</rawData></collect></message><message><bestDate>2024-08-22T19:44:51.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-22T19:44:51.000Z</date><level>-128.0</level><doppler>-8518.782</doppler><rawData>66C794EA01B697FC8F2C000A01B6D0FC8F92000BFFFFFFFFFFFF000000009D</rawData></collect></message><message><bestDate>2024-08-22T19:46:17.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-22T19:46:17.000Z</date><level>-133.0</level><doppler>-8854.077</doppler><rawData>66C7952C01B697FC8F2C000B01B6D0FC8F92000DFFFFFFFFFFFF0000000057</rawData></collect></message></satellitePass><satellitePass><satellite>NP</satellite><bestMsgDate>2024-08-22T22:30:02.000Z</bestMsgDate><duration>0</duration><nbMessage>1</nbMessage><message120>0</message120><bestLevel>-130</bestLevel><frequency>4.0165002233E8</frequency><message><bestDate>2024-08-22T22:30:02.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-22T22:30:02.000Z</date><level>-130.0</level><doppler>-8371.923</doppler><rawData>66C7BB8B01B65EFC8EC1000101B68CFC8F3B0002FFFFFFFFFFFF0000000027</rawData></collect></message></satellitePass><satellitePass><satellite>MC</satellite><bestMsgDate>2024-08-22T22:39:09.000Z</bestMsgDate><duration>444</duration><nbMessage>4</nbMessage><message120>1</message120><bestLevel>-115</bestLevel><frequency>4.0164999975E8</frequency><message><bestDate>2024-08-22T22:37:34.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-22T22:37:34.000Z</date><level>-116.0</level><doppler>-459.826</doppler><rawData>66C7BCEE01B65EF4A6F1FE030C1F841FC9FCFC178EA6FBE36C889C00189BCF</rawData></collect></message><message><bestDate>2024-08-22T22:39:09.000Z</bestDate><compression>2</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-22T22:36:08.000Z</date><level>-126.0</level><doppler>4747.784</doppler><rawData>66C7BCEE01B65EFC8EC1000601B68CFC8F3B0008FFFFFFFFFFFF00000000B8</rawData></collect><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-22T22:39:09.000Z</date><level>-116.0</level><doppler>-5658.001</doppler><rawData>66C7BCEE01B65EFC8EC1000601B68CFC8F3B0008FFFFFFFFFFFF00000000B8</rawData></collect></message><message><bestDate>2024-08-22T22:43:32.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-22T22:43:32.000Z</date><level>-124.0</level><doppler>-8738.446</doppler><rawData>66C7BE5D01B65EFC8EC1000D01B68CFC8F3B000EFFFFFFFFFFFF000000003A</rawData></collect></message></satellitePass><satellitePass><satellite>MB</satellite><bestMsgDate>2024-08-23T10:13:20.000Z</bestMsgDate><duration>181</duration><nbMessage>2</nbMessage><message120>0</message120><bestLevel>-125</bestLevel><frequency>4.0165001678E8</frequency><message><bestDate>2024-08-23T10:13:20.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-23T10:13:20.000Z</date><level>-126.0</level><doppler>7279.446</doppler><rawData>66C85FA401B5E8FC7D04000301B5D1FC7D8E0005FFFFFFFFFFFF0000000024</rawData></collect></message><message><bestDate>2024-08-23T10:16:21.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-23T10:16:21.000Z</date><level>-132.0</level><doppler>3238.671</doppler><rawData>66C0611101B5E8FC7D04000901B5D1FC7D8E000BFFBFFFFFFFFF0003FBFFBE</rawData></collect></message></satellitePass><satellitePass><satellite>O3</satellite><bestMsgDate>2024-08-23T13:00:58.000Z</bestMsgDate><duration>177</duration><nbMessage>3</nbMessage><message120>0</message120><bestLevel>-128</bestLevel><frequency>4.0165003761E8</frequency><message><bestDate>2024-08-23T12:59:26.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-23T12:59:26.000Z</date><level>-128.0</level><doppler>-5450.008</doppler><rawData>010203</rawData></collect></message><message><bestDate>2024-08-23T13:00:58.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-23T13:00:58.000Z</date><level>-128.0</level><doppler>-7114.168</doppler><rawData>66C887AA01B60BFC7C77000001B5CDFC7D000002FFFFFFFFFFFF00000000F8</rawData></collect></message><message><bestDate>2024-08-23T13:02:23.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-23T13:02:23.000Z</date><level>-133.0</level><doppler>-7893.868</doppler><rawData>66C8880501B60BFC7C77000201B1CDFC7C000003FFFFFFFFFFFF0000000099</rawData></collect></message></satellitePass><satellitePass><satellite>SR</satellite><bestMsgDate>2024-08-23T19:05:19.000Z</bestMsgDate><duration>84</duration><nbMessage>2</nbMessage><message120>0</message120><bestLevel>-121</bestLevel><frequency>4.0165003782E8</frequency><message><bestDate>2024-08-23T19:05:19.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-23T19:05:19.000Z</date><level>-124.0</level><doppler>8147.957</doppler><rawData>66C8DC4E01FFC2FC0FFC0014FE00FF03C01FA003FDFFF6FEBFFF8100080443</rawData></collect></message><message><bestDate>2024-08-23T19:06:44.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-23T19:06:44.000Z</date><level>-122.0</level><doppler>7081.157</doppler><rawData>66C8DD9E01B6CAFC7BBC000901B644FC7BEA000AFFFFFFFFFFFF000000003A</rawData></collect></message></satellitePass><satellitePass><satellite>NK</satellite><bestMsgDate>2024-08-23T21:58:05.000Z</bestMsgDate><duration>0</duration><nbMessage>1</nbMessage><message120>0</message120><bestLevel>-135</bestLevel><frequency>4.0164999149E8</frequency><message><bestDate>2024-08-23T21:58:05.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-23T21:58:05.000Z</date><level>-135.0</level><doppler>5611.825</doppler><rawData>66C905C201B750FC7B8D000A01B6C7FC7BB1000CFFFFFFFFFFFF0000FF0148</rawData></collect></message></satellitePass><satellitePass><satellite>NN</satellite><bestMsgDate>2024-08-24T00:49:25.000Z</bestMsgDate><duration>366</duration><nbMessage>5</nbMessage><message120>0</message120><bestLevel>-120</bestLevel><frequency>4.0165004043E8</frequency><message><bestDate>2024-08-24T00:43:19.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-24T00:43:19.000Z</date><level>-132.0</level><doppler>7978.372</doppler><rawData>66C92C4B01B7DCFC7B6F000201B74FFC7B7E0004FFFFFFFFFFFF00000000E4</rawData></collect></message><message><bestDate>2024-08-24T00:49:25.000Z</bestDate><compression>4</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-24T00:44:46.000Z</date><level>-132.0</level><doppler>7348.24</doppler><rawData>66C92CA201B7DCFC7B6F000301B74FFC7B7E0005FFFFFFFFFFFF000000008B</rawData></collect><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-24T00:46:19.000Z</date><level>-130.0</level><doppler>6031.095</doppler><rawData>66C92CA201B7DCFC7B6F000301B74FFC7B7E0005FFFFFFFFFFFF000000008B</rawData></collect><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-24T00:47:59.000Z</date><level>-120.0</level><doppler>3220.964</doppler><rawData>66C92CA201B7DCFC7B6F000301B74FFC7B7E0005FFFFFFFFFFFF000000008B</rawData></collect><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-24T00:49:25.000Z</date><level>-128.0</level><doppler>-381.65</doppler><rawData>66C92CA201B7DCFC7B6F000301B74FFC7B7E0005FFFFFFFFFFFF000000008B</rawData></collect></message></satellitePass><satellitePass><satellite>CS</satellite><bestMsgDate>2024-08-24T06:55:58.000Z</bestMsgDate><duration>712</duration><nbMessage>7</nbMessage><message120>0</message120><bestLevel>-126</bestLevel><frequency>4.0164998822E8</frequency><message><bestDate>2024-08-24T06:45:47.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-24T06:45:47.000Z</date><level>-131.0</level><doppler>8944.721</doppler><rawData>66C9813401B94AFC7B8B000A01B8ABFC7B5F000BFFFFFFFFFFFF00000001CC</rawData></collect></message><message><bestDate>2024-08-24T06:48:45.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-24T06:48:45.000Z</date><level>-127.0</level><doppler>7464.101</doppler><rawData>66C981EB01B94AFC7B8B000D01B8ABFC7B5F000EFFFFFFFFFFFF000000010F</rawData></collect></message><message><bestDate>2024-08-24T06:51:33.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-24T06:51:33.000Z</date><level>-130.0</level><doppler>-2899.22</doppler><rawData>66C9829901B94AFC7B8B000F01B8ABFC7B5F0011FFFFFFFFFFFF000000015B</rawData></collect></message><message><bestDate>2024-08-24T06:53:02.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-24T06:53:02.000Z</date><level>-127.0</level><doppler>-7223.12</doppler><rawData>66C982EE01B94AFC7B8B001101B8ABFC7B5F0012FFFFFFFFFFFF0000000103</rawData></collect></message><message><bestDate>2024-08-24T06:54:30.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-24T06:54:30.000Z</date><level>-128.0</level><doppler>-8496.26</doppler><rawData>66C9834901B94AFC7B8B001201B8ABFC7B5F0014FDFFFFFFFFFF00000001A4</rawData></collect></message><message><bestDate>2024-08-24T06:55:58.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-24T06:55:58.000Z</date><level>-134.0</level><doppler>-8918.48</doppler><rawData>66C9839F01B94AFC7B8B001401B8ABFC7B5F0015FFFFFFFFFFFF000000014B</rawData></collect></message><message><bestDate>2024-08-24T06:57:39.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-24T06:57:39.000Z</date><level>-137.0</level><doppler>-9057.74</doppler><rawData>66C983FA01B84AAAAAAAAAA5555557AAA92AAE2B21F0100CA5D7B65EEF1C99</rawData></collect></message></satellitePass><satellitePass><satellite>MB</satellite><bestMsgDate>2024-08-24T09:52:32.000Z</bestMsgDate><duration>86</duration><nbMessage>2</nbMessage><message120>0</message120><bestLevel>-131</bestLevel><frequency>4.0165008503E8</frequency><message><bestDate>2024-08-24T09:52:32.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-24T09:52:32.000Z</date><level>-132.0</level><doppler>6215.993</doppler><rawData>66C9AD4201B9EBFC7BC1000B01B96AFC7B81000CFBFFFFFFDFE2806FF80F0E</rawData></collect></message><message><bestDate>2024-08-24T09:53:59.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-24T09:53:59.000Z</date><level>-135.0</level><doppler>4826.047</doppler><rawData>66C9AD6801B9EBFC7BC1000B01B96EFD7381080CFFFFFFFFFFFF12120020C1</rawData></collect></message></satellitePass><satellitePass><satellite>SR</satellite><bestMsgDate>2024-08-24T18:33:18.000Z</bestMsgDate><duration>268</duration><nbMessage>3</nbMessage><message120>0</message120><bestLevel>-121</bestLevel><frequency>4.0165007363E8</frequency><message><bestDate>2024-08-24T18:31:52.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-24T18:31:52.000Z</date><level>-136.0</level><doppler>7589.208</doppler><rawData>66CA25FB01BB34FC7D25000301BB10FC7C920005E2AF7FA000BFAF42176434</rawData></collect></message><message><bestDate>2024-08-24T18:33:18.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-24T18:33:18.000Z</date><level>-133.0</level><doppler>6915.213</doppler><rawData>66CA25FB01BB34FC7D25000301BB10FC7C920C38010FFFF31811C71271033A</rawData></collect></message><message><bestDate>2024-08-24T18:36:20.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-24T18:36:20.000Z</date><level>-122.0</level><doppler>3433.518</doppler><rawData>66CA27C701BB34FC7D25000B01BB10FC7C92000DFFFFFFFFFFFF000000006C</rawData></collect></message></satellitePass><satellitePass><satellite>NK</satellite><bestMsgDate>2024-08-24T21:31:11.000Z</bestMsgDate><duration>0</duration><nbMessage>1</nbMessage><message120>0</message120><bestLevel>-133</bestLevel><frequency>4.0164995528E8</frequency><message><bestDate>2024-08-24T21:31:11.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-24T21:31:11.000Z</date><level>-133.0</level><doppler>7485.491</doppler><rawData>66CA50C201BB0BFC8D47000B01BB36FC7D25000DFFFFFFFFFFFF0000000085</rawData></collect></message></satellitePass><satellitePass><satellite>NN</satellite><bestMsgDate>2024-08-25T00:31:47.000Z</bestMsgDate><duration>265</duration><nbMessage>4</nbMessage><message120>0</message120><bestLevel>-127</bestLevel><frequency>4.016499875E8</frequency><message><bestDate>2024-08-25T00:31:47.000Z</bestDate><compression>2</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-25T00:30:18.000Z</date><level>-128.0</level><doppler>8409.321</doppler><rawData>66CA7A6B01BAEEFC8DFB000E01BB18FC8D5E0010FFFFFFFFFFFF00000100EA</rawData></collect><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-25T00:31:47.000Z</date><level>-130.0</level><doppler>8021.631</doppler><rawData>66CA7A6B01BAEEFC8DFB000E01BB18FC8D5E0010FFFFFFFFFFFF00000100EA</rawData></collect></message><message><bestDate>2024-08-25T00:33:15.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-25T00:33:15.000Z</date><level>-128.0</level><doppler>7178.983</doppler><rawData>66CA7A6B01BAEEFC8DFB000E013B1B136267FFED0900000018C0BC13477FB1</rawData></collect></message><message><bestDate>2024-08-25T00:34:43.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-25T00:34:43.000Z</date><level>-127.0</level><doppler>5317.75</doppler><rawData>66CA7BF401BAEEFC8DFB001501BB18FC8D5E0016FFFFFFFFFFFF0000010053</rawData></collect></message></satellitePass><satellitePass><satellite>CS</satellite><bestMsgDate>2024-08-25T06:15:05.000Z</bestMsgDate><duration>357</duration><nbMessage>5</nbMessage><message120>0</message120><bestLevel>-124</bestLevel><frequency>4.0165002545E8</frequency><message><bestDate>2024-08-25T06:10:40.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-25T06:10:40.000Z</date><level>-125.0</level><doppler>-1367.457</doppler><rawData>010203</rawData></collect></message><message><bestDate>2024-08-25T06:12:12.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-25T06:12:12.000Z</date><level>-124.0</level><doppler>-5144.037</doppler><rawData>66CACADB01BA8EFC8F3C000001BACDFC8EAE0002FFFFFFFFFFFF000000005F</rawData></collect></message><message><bestDate>2024-08-25T06:13:37.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-25T06:13:37.000Z</date><level>-125.0</level><doppler>-7019.637</doppler><rawData>66CACB3401BA8EFC8F3C000201BACDFC8EAE0004FFFFFFFFFFFF0000000001</rawData></collect></message><message><bestDate>2024-08-25T06:15:05.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-25T06:15:05.000Z</date><level>-128.0</level><doppler>-7938.117</doppler><rawData>66CACB8A01BA8EFC8F3C000301BACDFC8EAE0005FFFFFFFFFFFF00000000A9</rawData></collect></message><message><bestDate>2024-08-25T06:16:37.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-25T06:16:37.000Z</date><level>-136.0</level><doppler>-8389.437</doppler><rawData>66CACBE201BA8EFC8F3C000501BACDFC8EAE0006FFFFFFFFFFFF000000004E</rawData></collect></message></satellitePass><satellitePass><satellite>MC</satellite><bestMsgDate>2024-08-25T12:05:32.000Z</bestMsgDate><duration>0</duration><nbMessage>1</nbMessage><message120>0</message120><bestLevel>-123</bestLevel><frequency>4.016500348E8</frequency><message><bestDate>2024-08-25T12:05:32.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-25T12:05:32.000Z</date><level>-124.0</level><doppler>5914.3</doppler><rawData>66CB1DAD01B946FC8F94000901B9F4FC8FA0000BFFFFFFFFFFFF000000FF00</rawData></collect></message></satellitePass><satellitePass><satellite>A1</satellite><bestMsgDate>2024-08-25T20:49:12.000Z</bestMsgDate><duration>259</duration><nbMessage>4</nbMessage><message120>0</message120><bestLevel>-132</bestLevel><frequency>4.0164999796E8</frequency><message><bestDate>2024-08-25T20:46:16.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-25T20:46:16.000Z</date><level>-135.0</level><doppler>4338.29</doppler><rawData>66CB97BC00B75CFC8CE7000B01B7EEFC8F4C000DFFFFFFFFFFFF0000FFFF6A</rawData></collect></message><message><bestDate>2024-08-25T20:47:47.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-25T20:47:47.000Z</date><level>-141.0</level><doppler>942.396</doppler><rawData>66CB97BC01B75CFC8EE7000B01B7EEFC8F4C000DFFFFFFFFFFFF0800FFFF60</rawData></collect></message><message><bestDate>2024-08-25T20:49:12.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-25T20:49:12.000Z</date><level>-139.0</level><doppler>-2555.663</doppler><rawData>66CB97BC01B74CFC8EE7000F01B7E6FC8FCC004DFFFFFFFFFFFF0000FFFF6A</rawData></collect></message><message><bestDate>2024-08-25T20:50:35.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-25T20:50:35.000Z</date><level>-132.0</level><doppler>-5218.132</doppler><rawData>66CB98F501B55CFC8EE7001001B7EEFC8F4C0012FFFFFFFFFFFF0000FFFF26</rawData></collect></message></satellitePass><satellitePass><satellite>NK</satellite><bestMsgDate>2024-08-25T21:15:37.000Z</bestMsgDate><duration>264</duration><nbMessage>4</nbMessage><message120>0</message120><bestLevel>-123</bestLevel><frequency>4.0164993938E8</frequency><message><bestDate>2024-08-25T21:12:40.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-25T21:12:40.000Z</date><level>-124.0</level><doppler>-5335.671</doppler><rawData>010203</rawData></collect></message><message><bestDate>2024-08-25T21:14:11.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-25T21:14:11.000Z</date><level>-126.0</level><doppler>-7413.589</doppler><rawData>66CB9E4301B75CFC8EE7000001B7EEFC8F4C0000FFFFFFFFFFFF0000FFFFF4</rawData></collect></message><message><bestDate>2024-08-25T21:15:37.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-25T21:15:37.000Z</date><level>-126.0</level><doppler>-8240.199</doppler><rawData>66CB9E9D01B75CFC8EE7000001B7EEFC8F4C0000FFFFFFFFFFFF0000FFFF9A</rawData></collect></message><message><bestDate>2024-08-25T21:17:04.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-25T21:17:04.000Z</date><level>-134.0</level><doppler>-8599.266</doppler><rawData>66CB9EF201B75CFC8EE7000001B5EEFC8F4C0000FFFFFFFFFFFF0000FFFF45</rawData></collect></message></satellitePass><satellitePass><satellite>O3</satellite><bestMsgDate>2024-08-25T23:59:13.000Z</bestMsgDate><duration>0</duration><nbMessage>1</nbMessage><message120>0</message120><bestLevel>-132</bestLevel><frequency>4.0165003743E8</frequency><message><bestDate>2024-08-25T23:59:13.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-25T23:59:13.000Z</date><level>-132.0</level><doppler>111.409</doppler><rawData>66C8C0F01015A30771FA0000036E11F91D680005FFFFFFFFFFFE0001FE00CA</rawData></collect></message></satellitePass><satellitePass><satellite>MC</satellite><bestMsgDate>2024-08-26T11:55:05.000Z</bestMsgDate><duration>458</duration><nbMessage>6</nbMessage><message120>1</message120><bestLevel>-119</bestLevel><frequency>4.0165002426E8</frequency><message><bestDate>2024-08-26T11:47:27.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-26T11:47:27.000Z</date><level>-119.0</level><doppler>3226.364</doppler><rawData>010203</rawData></collect></message><message><bestDate>2024-08-26T11:48:59.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-26T11:48:59.000Z</date><level>-120.0</level><doppler>-1015.081</doppler><rawData>66CC6B4B01B746FC7D71000001B738FC8DAF0002FFFFFFFFFFFF0000FF010C</rawData></collect></message><message><bestDate>2024-08-26T11:50:24.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-26T11:50:24.000Z</date><level>-121.0</level><doppler>-4520.416</doppler><rawData>66CC6BA301B746FC7D71000201B738FC8DAF0004FFFFFFFFFFFF0000FF01B0</rawData></collect></message><message><bestDate>2024-08-26T11:51:52.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-26T11:51:52.000Z</date><level>-125.0</level><doppler>-6610.066</doppler><rawData>66CC6BFC01B707BC1F4180C3C1F638FC8DAF0005FFFFFBFFFFFF081F01CF0F</rawData></collect></message><message><bestDate>2024-08-26T11:55:05.000Z</bestDate><compression>2</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-26T11:53:25.000Z</date><level>-125.0</level><doppler>-7689.406</doppler><rawData>66CC6BFC01B746FC7D71000301B738FC8DAF0005FFFFFFFFFFFF0000FF0155</rawData></collect><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-26T11:55:05.000Z</date><level>-130.0</level><doppler>-8222.806</doppler><rawData>66CC6BFC01B746FC7D71000301B738FC8DAF0005FFFFFFFFFFFF0000FF0155</rawData></collect></message></satellitePass><satellitePass><satellite>NP</satellite><bestMsgDate>2024-08-26T11:59:32.000Z</bestMsgDate><duration>92</duration><nbMessage>2</nbMessage><message120>0</message120><bestLevel>-130</bestLevel><frequency>4.0165000449E8</frequency><message><bestDate>2024-08-26T11:59:32.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-26T11:59:32.000Z</date><level>-136.0</level><doppler>7304.145</doppler><rawData>66CC6DC601B746FC7D71252DB696D6DB4B4A496D0490D3DB6C92DB682D9B4D</rawData></collect></message><message><bestDate>2024-08-26T12:01:04.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-26T12:01:04.000Z</date><level>-131.0</level><doppler>6487.29</doppler><rawData>66CC6E1E01B746FC7D71000D01B738FC8DAF000EFFFFFFFFFFFF0000FF011D</rawData></collect></message></satellitePass><satellitePass><satellite>NK</satellite><bestMsgDate>2024-08-26T20:49:59.000Z</bestMsgDate><duration>638</duration><nbMessage>3</nbMessage><message120>0</message120><bestLevel>-126</bestLevel><frequency>4.0165001327E8</frequency><message><bestDate>2024-08-26T20:40:57.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-26T20:40:57.000Z</date><level>-129.0</level><doppler>8646.619</doppler><rawData>010203</rawData></collect></message><message><bestDate>2024-08-26T20:49:59.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-26T20:49:59.000Z</date><level>-126.0</level><doppler>-8735.362</doppler><rawData>66CCE95B01B820FC7C06000501B7C7FC7C510006FFFFFFFFFFFF00000001E5</rawData></collect></message><message><bestDate>2024-08-26T20:51:35.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-26T20:51:35.000Z</date><level>-132.0</level><doppler>-8925.778</doppler><rawData>66CCE95B01B820FC7C06000501B7C7FC7C510006FFFD5C0005DE0073FFB394</rawData></collect></message></satellitePass><satellitePass><satellite>SR</satellite><bestMsgDate>2024-08-26T20:57:21.000Z</bestMsgDate><duration>442</duration><nbMessage>6</nbMessage><message120>0</message120><bestLevel>-130</bestLevel><frequency>4.0165000743E8</frequency><message><bestDate>2024-08-26T20:49:59.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-26T20:49:59.000Z</date><level>-131.0</level><doppler>4664.468</doppler><rawData>66CCE95B01B820FC7C06000521B7C7FC7C510006FFFFFFFFFFFF00000001E5</rawData></collect></message><message><bestDate>2024-08-26T20:57:21.000Z</bestDate><compression>5</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-26T20:51:35.000Z</date><level>-132.0</level><doppler>2690.258</doppler><rawData>66CCE95B01B820FC7C06000501B7C7FC7C510006FFFFFFFFFFFF00000001E5</rawData></collect><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-26T20:53:01.000Z</date><level>-130.0</level><doppler>458.873</doppler><rawData>66CCE95B01B820FC7C06000501B7C7FC7C510006FFFFFFFFFFFF00000001E5</rawData></collect><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-26T20:54:33.000Z</date><level>-130.0</level><doppler>-1967.587</doppler><rawData>66CCE95B01B820FC7C06000501B7C7FC7C510006FFFFFFFFFFFF00000001E5</rawData></collect><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-26T20:55:57.000Z</date><level>-132.0</level><doppler>-3885.517</doppler><rawData>66CCE95B01B820FC7C06000501B7C7FC7C510006FFFFFFFFFFFF00000001E5</rawData></collect><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-26T20:57:21.000Z</date><level>-137.0</level><doppler>-5303.842</doppler><rawData>66CCE95B01B820FC7C06000501B7C7FC7C510006FFFFFFFFFFFF00000001E5</rawData></collect></message></satellitePass><satellitePass><satellite>NP</satellite><bestMsgDate>2024-08-27T11:50:17.000Z</bestMsgDate><duration>724</duration><nbMessage>8</nbMessage><message120>0</message120><bestLevel>-122</bestLevel><frequency>4.016500191E8</frequency><message><bestDate>2024-08-27T11:47:17.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-27T11:47:17.000Z</date><level>-131.0</level><doppler>7787.56</doppler><rawData>66CDBC6C01BAEB7CD864902691B69AEC3C490604AFDBBFDBFFFB24C3481208</rawData></collect></message><message><bestDate>2024-08-27T11:50:17.000Z</bestDate><compression>2</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-27T11:48:45.000Z</date><level>-128.0</level><doppler>7100.905</doppler><rawData>66CDBCBD01BAEBFC7CE5000301BA9EFC7CC90005FFFFFFFFFFFF00000000B5</rawData></collect><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-27T11:50:17.000Z</date><level>-123.0</level><doppler>5765.095</doppler><rawData>66CDBCBD01BAEBFC7CE5000301BA9EFC7CC90005FFFFFFFFFFFF00000000B5</rawData></collect></message><message><bestDate>2024-08-27T11:51:57.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-27T11:51:57.000Z</date><level>-128.0</level><doppler>3149.53</doppler><rawData>66CDBDA501BAEBFC7CE5000701BA9EFC7CC90009FFFFFFFFFFFF00000000C4</rawData></collect></message><message><bestDate>2024-08-27T11:53:23.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-27T11:53:23.000Z</date><level>-128.0</level><doppler>-45.485</doppler><rawData>66CDBDD801BAEBFC7CE5000801BA9EFC7CC9000AFFFFFFFFFFFF000000008F</rawData></collect></message><message><bestDate>2024-08-27T11:54:58.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-27T11:54:58.000Z</date><level>-127.0</level><doppler>-3522.665</doppler><rawData>66CDBE2E01BAEBFC7CE5000901BA9EFC7CC9000BFFFFFFFFFFFF0000000036</rawData></collect></message><message><bestDate>2024-08-27T11:56:25.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-27T11:56:25.000Z</date><level>-128.0</level><doppler>-5686.49</doppler><rawData>66CDBE8B01BAEBFC7CE5000B01BA9EFC7CC9000DFFFFFFFFFFFF00000000D5</rawData></collect></message><message><bestDate>2024-08-27T11:59:21.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-27T11:59:21.000Z</date><level>-136.0</level><doppler>-7657.7</doppler><rawData>66CDBEE301BAEBFC7CE5000C01BA9EFC7CC9000EFFFFFFFFFFFF000000007B</rawData></collect></message></satellitePass><satellitePass><satellite>O3</satellite><bestMsgDate>2024-08-27T14:53:18.000Z</bestMsgDate><duration>543</duration><nbMessage>7</nbMessage><frequency>4.0165E8</frequency><message><bestDate>2024-08-27T14:45:41.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-27T14:45:41.000Z</date><level>-133.0</level><doppler>6239.14</doppler><rawData>010203</rawData></collect></message><message><bestDate>2024-08-27T14:47:12.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-27T14:47:12.000Z</date><level>-128.0</level><doppler>4728.1</doppler><rawData>66CDE69101BACDFC8D3E000001BAF5FC7D110002FFFFFFFFFFFF000000FFD2</rawData></collect></message><message><bestDate>2024-08-27T14:48:38.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-27T14:48:38.000Z</date><level>-127.0</level><doppler>2634.04</doppler><rawData>66CDE6EA01BACDFC8D3E000201BAF5FC7D110003FFFFFFFFFFFF000000FF76</rawData></collect></message><message><bestDate>2024-08-27T14:53:18.000Z</bestDate><compression>3</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-27T14:50:06.000Z</date><level>-130.0</level><doppler>-41.96</doppler><rawData>66CDE74201BACDFC8D3E000301BAF5FC7D110005FFFFFFFFFFFF000000FF1A</rawData></collect><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-27T14:51:38.000Z</date><level>-129.0</level><doppler>-2825.3</doppler><rawData>66CDE74201BACDFC8D3E000301BAF5FC7D110005FFFFFFFFFFFF000000FF1A</rawData></collect><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-27T14:53:18.000Z</date><level>-133.0</level><doppler>-5099.54</doppler><rawData>66CDE74201BACDFC8D3E000301BAF5FC7D110005FFFFFFFFFFFF000000FF1A</rawData></collect></message><message><bestDate>2024-08-27T14:54:44.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-27T14:54:44.000Z</date><level>-136.0</level><doppler>-6345.56</doppler><rawData>66CDE89D01BACDFC8D3E000901BBF4FC7D11000BBFFFFFFEC008F00030D74D</rawData></collect></message></satellitePass><satellitePass><satellite>SR</satellite><bestMsgDate>2024-08-28T05:43:14.000Z</bestMsgDate><duration>268</duration><nbMessage>3</nbMessage><message120>0</message120><bestLevel>-130</bestLevel><frequency>4.0165001807E8</frequency><message><bestDate>2024-08-28T05:41:48.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-28T05:41:48.000Z</date><level>-131.0</level><doppler>3314.623</doppler><rawData>66CEB78001B94BFC8F97000301B9CAFC8F8B0005FFFFFFFFFFFF00000000D2</rawData></collect></message><message><bestDate>2024-08-28T05:43:14.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-28T05:43:14.000Z</date><level>-132.0</level><doppler>1562.953</doppler><rawData>66CEB8E201B94BFC8F97000901B9CAFC8F8B000BFFFFFFFFFFFF0000000063</rawData></collect></message><message><bestDate>2024-08-28T05:46:16.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-28T05:46:16.000Z</date><level>-130.0</level><doppler>-2536.247</doppler><rawData>66CEB94B01B94BFC8F97002B01B9CAFC8F8B000DFFFFFFFFFFFF00000000F5</rawData></collect></message></satellitePass><satellitePass><satellite>CS</satellite><bestMsgDate>2024-08-28T05:44:49.000Z</bestMsgDate><duration>182</duration><nbMessage>3</nbMessage><message120>0</message120><bestLevel>-126</bestLevel><frequency>4.0165000156E8</frequency><message><bestDate>2024-08-28T05:43:14.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-28T05:43:14.000Z</date><level>-126.0</level><doppler>5505.704</doppler><rawData>66CEB8E201B94BFC8F97000901B9CAFC8F8B000BFFFFFFFFFFFF0000000063</rawData></collect></message><message><bestDate>2024-08-28T05:44:49.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-28T05:44:49.000Z</date><level>-132.0</level><doppler>3295.844</doppler><rawData>66CE296D44AD4BF48F97000A01B9CAFC9F8BD68BFFFDFFFFFFFF0000000057</rawData></collect></message><message><bestDate>2024-08-28T05:46:16.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-28T05:46:16.000Z</date><level>-128.0</level><doppler>493.604</doppler><rawData>66CEB94B01B94BFC8F97000B01B9CAFC8F8B000DFFFFFFFFFFFF00000000F5</rawData></collect></message></satellitePass><satellitePass><satellite>NK</satellite><bestMsgDate>2024-08-28T08:48:47.000Z</bestMsgDate><duration>442</duration><nbMessage>4</nbMessage><message120>2</message120><bestLevel>-119</bestLevel><frequency>4.0165001469E8</frequency><message><bestDate>2024-08-28T08:44:13.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-28T08:44:13.000Z</date><level>-126.0</level><doppler>8884.791</doppler><rawData>66CEE1E801B8A5FC8F86000301B938FC8F930005FFFDFFEFFDEF0000040082</rawData></collect></message><message><bestDate>2024-08-28T08:47:15.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-28T08:47:15.000Z</date><level>-120.0</level><doppler>7738.047</doppler><rawData>66CEE1E801B8A5FC8F86000301B938FC8F930005FFFFFFFFFFFF0000000082</rawData></collect></message><message><bestDate>2024-08-28T08:48:47.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-28T08:48:47.000Z</date><level>-119.0</level><doppler>5053.401</doppler><rawData>66CEE1E801B8A5FC8F86000301B938F88F81FFFE467EFFFFFFFE0000000104</rawData></collect></message><message><bestDate>2024-08-28T08:51:35.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-28T08:51:35.000Z</date><level>-121.0</level><doppler>-5987.401</doppler><rawData>66CEE4BD01B8A5FC8F86000F01B938FC8F930011FFFFFFFFFFFF0000000092</rawData></collect></message></satellitePass><satellitePass><satellite>NP</satellite><bestMsgDate>2024-08-28T11:42:40.000Z</bestMsgDate><duration>543</duration><nbMessage>6</nbMessage><message120>0</message120><bestLevel>-124</bestLevel><frequency>4.0165003148E8</frequency><message><bestDate>2024-08-28T11:36:43.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-28T11:36:43.000Z</date><level>-131.0</level><doppler>7504.585</doppler><rawData>010203</rawData></collect></message><message><bestDate>2024-08-28T11:38:14.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-28T11:38:14.000Z</date><level>-125.0</level><doppler>6172.66</doppler><rawData>66CF0BC501B7F8FC8F5C000001B88EFC8F7D0002FFFFFFFFFFFF000000FF1A</rawData></collect></message><message><bestDate>2024-08-28T11:42:40.000Z</bestDate><compression>2</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-28T11:39:40.000Z</date><level>-125.0</level><doppler>3737.275</doppler><rawData>66CF0C1D01B7F8FC8F5C000201B88EFC8F7D0004FFFFFFFFFFFF000000FFBD</rawData></collect><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-28T11:42:40.000Z</date><level>-126.0</level><doppler>-4067.06</doppler><rawData>66CF0C1D01B7F8FC8F5C000201B88EFC8F7D0004FFFFFFFFFFFF000000FFBD</rawData></collect></message><message><bestDate>2024-08-28T11:44:20.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-28T11:44:20.000Z</date><level>-131.0</level><doppler>-6561.86</doppler><rawData>66CF0C1D01B7F8FC8F5C031E619CE30E71C77BF700001030E4207FD6FE0086</rawData></collect></message><message><bestDate>2024-08-28T11:45:46.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-28T11:45:46.000Z</date><level>-134.0</level><doppler>-7586.165</doppler><rawData>66CF0DB601B7F8FC8F5C000901B88EFC8F7D000AFFFFFFFFFFFF000000FF16</rawData></collect></message></satellitePass><satellitePass><satellite>NN</satellite><bestMsgDate>2024-08-28T23:45:14.000Z</bestMsgDate><duration>637</duration><nbMessage>5</nbMessage><message120>1</message120><bestLevel>-119</bestLevel><frequency>4.0165002551E8</frequency><message><bestDate>2024-08-28T23:39:00.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-28T23:39:00.000Z</date><level>-130.0</level><doppler>8733.865</doppler><rawData>66CFB45F01B72CFC8D89000201B723FC8E2F0004FFFFFFFFFFFF0081FD10AE</rawData></collect></message><message><bestDate>2024-08-28T23:40:33.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-28T23:40:33.000Z</date><level>-135.0</level><doppler>8566.297</doppler><rawData>66CFB45F01B72CFC8D89000201B723FC8E2F0004FFFFFFFFFFFF0000FF002F</rawData></collect></message><message><bestDate>2024-08-28T23:43:39.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-28T23:43:39.000Z</date><level>-121.0</level><doppler>7042.651</doppler><rawData>66CFB5CE01B72CFC8D89000801B723FC8E2F000AFFFFFFFFFFFF0000FF00B3</rawData></collect></message><message><bestDate>2024-08-28T23:45:14.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-28T23:45:14.000Z</date><level>-127.0</level><doppler>4120.51</doppler><rawData>66CFB62501B72CFC8D89000901B723FC8E2F000BFFFFFFFFFFFF0000FF0059</rawData></collect></message><message><bestDate>2024-08-28T23:49:37.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-28T23:49:37.000Z</date><level>-120.0</level><doppler>-7410.968</doppler><rawData>66CFB76201B72CFC8D89000F01B723FC8E2F0010FFFFFFFFFFFF0000FF0010</rawData></collect></message></satellitePass><satellitePass><satellite>MC</satellite><bestMsgDate>2024-08-28T23:49:37.000Z</bestMsgDate><duration>168</duration><nbMessage>3</nbMessage><frequency>4.0165E8</frequency><message><bestDate>2024-08-28T23:48:12.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-28T23:48:12.000Z</date><level>-127.0</level><doppler>6941.332</doppler><rawData>66CFB6DA01B72CFC8D89000D01B7E3FC8E2F000EFFFFFFFFFFFF0000FF009D</rawData></collect></message><message><bestDate>2024-08-28T23:49:37.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-28T23:49:37.000Z</date><level>-126.0</level><doppler>5879.947</doppler><rawData>66CFB76201B72CFC8D89000F01B723FC8E2F0010FFFFFFFFFFFF0000FF0010</rawData></collect></message><message><bestDate>2024-08-28T23:51:00.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-28T23:51:00.000Z</date><level>-128.0</level><doppler>4174.852</doppler><rawData>66CFB78901B72CFC8F8F1DBC7E3B33F0D62FFA37D7CCF37CBFEF1458EE0BA7</rawData></collect></message></satellitePass><satellitePass><satellite>O3</satellite><bestMsgDate>2024-08-29T02:39:49.000Z</bestMsgDate><duration>264</duration><nbMessage>4</nbMessage><message120>0</message120><bestLevel>-128</bestLevel><frequency>4.016500331E8</frequency><message><bestDate>2024-08-29T02:36:53.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-29T02:36:53.000Z</date><level>-132.0</level><doppler>1519.376</doppler><rawData>010203</rawData></collect></message><message><bestDate>2024-08-29T02:38:24.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-29T02:38:24.000Z</date><level>-130.0</level><doppler>-1215.244</doppler><rawData>66CFDEC001B754FC7D41000001B733FC8D760002FFFFFFFFFFFF0000000081</rawData></collect></message><message><bestDate>2024-08-29T02:39:49.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-29T02:39:49.000Z</date><level>-128.0</level><doppler>-3515.404</doppler><rawData>66CFDF1901B754FC7D41000201B733FC8D760003FFFFFFFFFFFF0000000024</rawData></collect></message><message><bestDate>2024-08-29T02:41:17.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-29T02:41:17.000Z</date><level>-136.0</level><doppler>-5252.344</doppler><rawData>66CFDF7101B754FC7D41000301B733FC8D760145FFDDFFFFFFFF00000000C9</rawData></collect></message></satellitePass><satellitePass><satellite>SR</satellite><bestMsgDate>2024-08-29T08:35:08.000Z</bestMsgDate><duration>0</duration><nbMessage>1</nbMessage><message120>0</message120><bestLevel>-137</bestLevel><frequency>4.0165004707E8</frequency><message><bestDate>2024-08-29T08:35:08.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-29T08:35:08.000Z</date><level>-137.0</level><doppler>-5620.312</doppler><rawData>010203</rawData></collect></message></satellitePass><satellitePass><satellite>MB</satellite><bestMsgDate>2024-08-29T11:36:52.000Z</bestMsgDate><duration>92</duration><nbMessage>2</nbMessage><message120>0</message120><bestLevel>-127</bestLevel><frequency>4.0165004215E8</frequency><message><bestDate>2024-08-29T11:36:52.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-29T11:36:52.000Z</date><level>-128.0</level><doppler>-7057.697</doppler><rawData>010203</rawData></collect></message><message><bestDate>2024-08-29T11:38:24.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-29T11:38:24.000Z</date><level>-133.0</level><doppler>-7943.057</doppler><rawData>66D05D5001B85BFC7C16008001BF839C0B9F8001FFFFFFFEFFFF0045F37FD0</rawData></collect></message></satellitePass><satellitePass><satellite>O3</satellite><bestMsgDate>2024-08-29T15:01:26.000Z</bestMsgDate><duration>0</duration><nbMessage>1</nbMessage><message120>0</message120><bestLevel>-135</bestLevel><frequency>4.0165002075E8</frequency><message><bestDate>2024-08-29T15:01:26.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-29T15:01:26.000Z</date><level>-135.0</level><doppler>-5239.349</doppler><rawData>010203</rawData></collect></message></satellitePass><satellitePass><satellite>CS</satellite><bestMsgDate>2024-08-29T17:44:15.000Z</bestMsgDate><duration>531</duration><nbMessage>7</nbMessage><message120>0</message120><bestLevel>-124</bestLevel><frequency>4.016499796E8</frequency><message><bestDate>2024-08-29T17:36:53.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-29T17:36:53.000Z</date><level>-136.0</level><doppler>6854.939</doppler><rawData>66D0B15A01B99FFC7C8B000101B979FC7C7F000AFFFFFDFFFFFF0000010231</rawData></collect></message><message><bestDate>2024-08-29T17:38:29.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-29T17:38:29.000Z</date><level>-125.0</level><doppler>5197.979</doppler><rawData>66D0B1AD01B9A4FC7C8E000001B9A1FC7C8C0001FFFFFFFFFFFF00000102AB</rawData></collect></message><message><bestDate>2024-08-29T17:39:55.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-29T17:39:55.000Z</date><level>-124.0</level><doppler>2617.319</doppler><rawData>66D0B20E01B9A6FC7C8E000001B9A1FCFC8C0002FFFFFFFFEFFB2200010246</rawData></collect></message><message><bestDate>2024-08-29T17:41:27.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-29T17:41:27.000Z</date><level>-129.0</level><doppler>-999.241</doppler><rawData>66D0B26601B9AAFC7C91000001B9A1FC7C8C0004FFFFFFFFFFFF0000030264</rawData></collect></message><message><bestDate>2024-08-29T17:42:51.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-29T17:42:51.000Z</date><level>-128.0</level><doppler>-4041.421</doppler><rawData>66D0B2C001B9ACFC7C92000001B9A1FC7C8C0005FFFFFFFFFFFF0000010287</rawData></collect></message><message><bestDate>2024-08-29T17:44:15.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-29T17:44:15.000Z</date><level>-124.0</level><doppler>-6060.361</doppler><rawData>66D0B31601B9B0FC7C95000001B9A1FC7C8C0007FFFFFFFFFFFF0000010227</rawData></collect></message><message><bestDate>2024-08-29T17:45:44.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-29T17:45:44.000Z</date><level>-128.0</level><doppler>-7298.221</doppler><rawData>66D0B36801B9B2FC7C96000001B9A1FC7C8C0008FFFFFFFFFFFF00000102D1</rawData></collect></message></satellitePass><satellitePass><satellite>MC</satellite><bestMsgDate>2024-08-31T10:04:13.000Z</bestMsgDate><duration>0</duration><nbMessage>1</nbMessage><message120>0</message120><bestLevel>-129</bestLevel><frequency>4.0165E8</frequency><message><bestDate>2024-08-31T10:04:13.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-31T10:04:13.000Z</date><level>-130.0</level><doppler>3318.447</doppler><rawData>010203</rawData></collect></message></satellitePass><satellitePass><satellite>MC</satellite><bestMsgDate>2024-08-31T11:38:49.000Z</bestMsgDate><duration>0</duration><nbMessage>1</nbMessage><message120>0</message120><bestLevel>-132</bestLevel><frequency>4.0165E8</frequency><message><bestDate>2024-08-31T11:38:49.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-31T11:38:49.000Z</date><level>-133.0</level><doppler>8395.006</doppler><rawData>66D30466FFFFFFFFFFFF100005B9F5FC7CC80400FFFFFFFFFFFF000000007E</rawData></collect></message></satellitePass><satellitePass><satellite>MC</satellite><bestMsgDate>2024-08-31T22:50:30.000Z</bestMsgDate><duration>0</duration><nbMessage>1</nbMessage><message120>0</message120><bestLevel>-127</bestLevel><frequency>4.0165E8</frequency><message><bestDate>2024-08-31T22:50:30.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-08-31T22:50:30.000Z</date><level>-128.0</level><doppler>235.673</doppler><rawData>66D39DD8FFFFFFFFFFFF000001B9F5FC7CC80000FFFFFFFFFFFF000000006F</rawData></collect></message></satellitePass><satellitePass><satellite>O3</satellite><bestMsgDate>2024-09-01T00:21:28.000Z</bestMsgDate><duration>0</duration><nbMessage>1</nbMessage><message120>0</message120><bestLevel>-138</bestLevel><frequency>4.0165E8</frequency><message><bestDate>2024-09-01T00:21:28.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-09-01T00:21:28.000Z</date><level>-138.0</level><doppler>-442.404</doppler><rawData>66DF03C606D5C56F39F95B18F1B32D7B2C056415E2F604182DBC3EF840F36F</rawData></collect></message></satellitePass><satellitePass><satellite>NP</satellite><bestMsgDate>2024-09-05T11:49:10.000Z</bestMsgDate><duration>0</duration><nbMessage>1</nbMessage><message120>0</message120><bestLevel>-135</bestLevel><frequency>4.0165E8</frequency><message><bestDate>2024-09-05T11:49:10.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-09-05T11:49:10.000Z</date><level>-135.0</level><doppler>-8589.931</doppler><rawData>010203</rawData></collect></message></satellitePass><satellitePass><satellite>MC</satellite><bestMsgDate>2024-09-05T11:49:10.000Z</bestMsgDate><duration>0</duration><nbMessage>1</nbMessage><message120>0</message120><bestLevel>-126</bestLevel><frequency>4.0165E8</frequency><message><bestDate>2024-09-05T11:49:10.000Z</bestDate><compression>1</compression><collect><type>L</type><alarm>N</alarm><concatenated>N</concatenated><date>2024-09-05T11:49:10.000Z</date><level>-126.0</level><doppler>-8695.302</doppler><rawData>010203</rawData></collect></message></satellitePass></platform></program></data>'}
         return data[platformId]
 
+class ArgosProgramInfoNoDownload(ArgosProgramInfo):
+    def service_factory(self, wsdl):
+        return self._service
+
+    def _service(self, username=None, password=None):
+        return ('<?xml version="1.0" encoding="ISO-8859-1"?><data version="1.0"><program>'
+                '<programNumber>3932</programNumber>'
+                '<platform><platformId>27011</platformId><platformType>GLIDER</platformType></platform>'
+                '<platform><platformId>260603</platformId><platformType>GLIDER</platformType></platform>'
+                '<platform><platformId>30649</platformId><platformType>GLIDER</platformType></platform>'
+                '</program></data>')
+
+class ArgosFleetClientNoDownload(ArgosFleetClient):
+    latency = 0.2
+    
+    def service_factory(self, wsdl):
+        return self._service
+
+    def _service(self, platformId=None, **kwds):
+        time.sleep(self.latency)
+        return ArgosPlatformInfoNoDownload._service(None, platformId=platformId, **kwds)
+
 def test_ArgosMessageDecoder_amadeus(load_hexstring_data):
     amd = ArgosMessageDecoder()
     data = load_hexstring_data["amadeus"]
@@ -96,6 +154,92 @@ def test_ArgosMessageDecoder_260603(load_hexstring_data):
     decoded = amd(encoded)
     assert decoded == data["decoded"]
 
+def test_ArgosMessageDecoder_decode_batch(load_hexstring_data):
+    amd = ArgosMessageDecoder()
+    messages = [data["encoded"] for data in load_hexstring_data.values()]
+    decoded = amd.decode_batch(messages)
+    assert len(decoded) == len(messages)
+    for message, record in zip(messages, decoded):
+        for k, v in amd(message).items():
+            assert record[k] == v
+
+def test_ArgosMessageDecoder_decode_batch_malformed(load_hexstring_data):
+    amd = ArgosMessageDecoder()
+    encoded = load_hexstring_data["260603"]["encoded"]
+    decoded = amd.decode_batch([encoded[:-2], encoded[:-1]+"G", encoded])
+    assert list(decoded['crc']) == [False, False, True]
+    assert list(decoded['date'][:2]) == ['', '']
+    assert decoded['lat'][2] == 1126.72
+
+def test_ArgosMessageDecoder_not_hexadecimal(load_hexstring_data):
+    amd = ArgosMessageDecoder()
+    encoded = load_hexstring_data["260603"]["encoded"]
+    assert amd(encoded.lower()) == amd(encoded)
+    for message in [encoded[:-2] + "_1", " " + encoded[1:], encoded[:20] + " ", "0x" + encoded[2:]]:
+        with pytest.raises(ValueError):
+            amd(message)
+        with pytest.raises(ValueError):
+            amd.parseHex(message, fields=("lat",))
+
+def test_ArgosMessageDecoder_fields(load_hexstring_data):
+    amd = ArgosMessageDecoder()
+    messages = [data["encoded"] for data in load_hexstring_data.values()]
+    for fields in [('lat', 'lon'), ('date',), ('V', 'crc', 'present_time')]:
+        decoded = amd.decode_batch(messages, fields)
+        assert decoded.dtype.names == tuple(k for k in amd.fields if k in fields)
+        for message, record in zip(messages, decoded):
+            expected = dict((k, v) for k, v in amd(message).items() if k in fields)
+            assert amd.parseHex(message, fields=fields) == expected
+            assert dict((k, record[k]) for k in decoded.dtype.names) == expected
+    with pytest.raises(ValueError):
+        amd.parseHex(messages[0], fields=('ctime',))
+
+def test_ArgosMessageDecoder_checksum(load_hexstring_data):
+    amd = ArgosMessageDecoder()
+    for data in load_hexstring_data.values():
+        encoded = data["encoded"]
+        crc = data["decoded"]["crc"]
+        assert amd.checksum_8bit(encoded) == crc
+        assert amd.checksum_8bit(bytes.fromhex(encoded)) == crc
+        assert amd.checksum_8bit(memoryview(encoded.encode('ascii'))) == crc
+    assert amd.checksum_8bit("ZZ"*31) == False
+
+def test_ArgosMessageDecoder_checksum_batch(load_hexstring_data):
+    amd = ArgosMessageDecoder()
+    messages = [data["encoded"] for data in load_hexstring_data.values()]
+    expected = [data["decoded"]["crc"] for data in load_hexstring_data.values()]
+    mask = amd.checksum_batch(messages + ["", "ZZ"*31])
+    assert list(mask) == expected + [False, False]
+
+def test_codec_profile():
+    profile = argosCodec.CodecProfile("test", (argosCodec.CodecField("time", 8, False, 1., 86400),
+                                               argosCodec.CodecField("depth", 4, True, 0.1)))
+    argosCodec.register_profile(profile)
+    amd = ArgosMessageDecoder("test")
+    assert amd.codec is argosCodec.compile_profile(argosCodec.get_profile("test"))
+    message = "66CCE95BFF9C" + "EF"
+    decoded = amd(message)
+    assert decoded == {'time': 1724705115.0, 'depth': -10.0, 'crc': True, 'date': '2024-08-27T20:45:15Z'}
+    batch = amd.decode_batch([message])
+    assert batch['depth'][0] == -10.0 and batch['date'][0] == decoded['date']
+    argosCodec.set_platform_profile('12345', "test")
+    try:
+        assert ArgosPlatformInfoNoDownload().decoder_factory('12345').codec is amd.codec
+        assert ArgosPlatformInfoNoDownload().decoder_factory('260603').codec.profile == argosCodec.GLIDER
+    finally:
+        argosCodec.set_platform_profile('12345', None)
+
+def test_decode_only_imports(load_hexstring_data):
+    encoded = load_hexstring_data["260603"]["encoded"]
+    code = ("import sys\n"
+            "from argos.argosMessage import ArgosMessageDecoder\n"
+            "import argos.argosClient\n"
+            f"ArgosMessageDecoder()('{encoded}')\n"
+            "print(' '.join(m for m in ['zeep', 'requests', 'arrow', 'numpy'] if m in sys.modules))\n")
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    p = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    assert p.stdout.strip() == ""
+
 def test_ArgosProgramInfo():
     api = ArgosProgramInfo(credentials='argos_login.txt')
     api.retrieve()
@@ -107,6 +251,82 @@ def test_ArgosProgramInfo_missing_credentials():
     with pytest.raises(FileNotFoundError):
         api = ArgosProgramInfo(credentials='no_argos_login.txt')
 
+class AsyncArgosFleetClientNoDownload(argosAsync.AsyncArgosFleetClient):
+    latency = 0.2
+    in_flight = max_in_flight = 0
+
+    def service_factory(self, wsdl):
+        self.wsdl = wsdl
+        return self._service
+
+    async def _service(self, platformId=None, **kwds):
+        AsyncArgosFleetClientNoDownload.in_flight += 1
+        AsyncArgosFleetClientNoDownload.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.latency)
+        AsyncArgosFleetClientNoDownload.in_flight -= 1
+        return ArgosPlatformInfoNoDownload._service(None, platformId=platformId, **kwds)
+
+def test_ArgosCatalogue(tmp_path):
+    filename = tmp_path / "catalogue.json"
+    program_info = ArgosProgramInfoNoDownload()
+    catalogue = ArgosCatalogue(program_info, filename=filename, username='user', password='secret')
+    assert catalogue.get_platforms('3932') == ['27011', '30649', '260603']
+    assert catalogue.get_program('30649') == '3932' and catalogue.get_program('12345') is None
+    assert catalogue.find_platforms('platformType', 'GLIDER') == ['27011', '30649', '260603']
+    assert catalogue.get_platform_info('27011') == dict(platformType='GLIDER')
+    assert (catalogue.fetches, catalogue.rebuilds) == (1, 1)
+    # A second catalogue uses the file, without calling the webservice.
+    catalogue = ArgosCatalogue(program_info, filename=filename, username='user', password='secret')
+    assert catalogue.get_programs() == ['3932'] and catalogue.fetches == 0
+    # Stale information is served while it is refreshed in the background.
+    catalogue.ttl = 0
+    assert catalogue.get_platforms('3932') == ['27011', '30649', '260603']
+    catalogue.wait()
+    assert (catalogue.fetches, catalogue.unchanged, catalogue.rebuilds) == (1, 1, 0)
+    program_info.service = lambda **kwds: argosTesting.synthetic_platform_list({'4000': ['1', '2']})
+    assert catalogue.refresh() is True
+    assert catalogue.get_program('2') == '4000' and catalogue.rebuilds == 1
+
+def test_ArgosCatalogue_default_filename(tmp_path, monkeypatch):
+    monkeypatch.setattr(argosClient, "CACHE_PATH", str(tmp_path))
+    program_info = ArgosProgramInfoNoDownload(wsdl="https://example.org/argos?wsdl")
+    catalogue = ArgosCatalogue(program_info, username='user', password='secret')
+    assert os.path.dirname(catalogue.filename) == str(tmp_path)
+    assert ArgosCatalogue(program_info, username='user').filename == catalogue.filename
+    assert ArgosCatalogue(program_info, username='other').filename != catalogue.filename
+    other_wsdl = ArgosProgramInfoNoDownload(wsdl="https://example.org/test?wsdl")
+    assert ArgosCatalogue(other_wsdl, username='user').filename != catalogue.filename
+
+def test_ResponseCache(tmp_path):
+    filename = str(tmp_path / "responses.sqlite")
+    cache = ResponseCache(ttl=60, filename=filename)
+    fleet = ArgosFleetClientNoDownload(max_workers=4, response_cache=cache)
+    calls = []
+    service = fleet.service
+    fleet.service = lambda **kwds: (calls.append(kwds['platformId']), service(**kwds))[1]
+    platform_infos = [fleet.platform_info_factory() for i in range(4)]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for f in [executor.submit(api.retrieve, '260603', 'user', 'secret') for api in platform_infos]:
+            f.result()
+    assert calls == ['260603']
+    assert all(api.response == platform_infos[0].response for api in platform_infos)
+    # A wrong password is not answered from the cache.
+    fleet.platform_info_factory().retrieve('260603', 'user', 'other password')
+    fleet.platform_info_factory().retrieve('260603', 'user', 'secret', number_of_days_from_now=2)
+    assert calls == ['260603', '260603', '260603']
+    stats = cache.stats()
+    assert (stats['misses'], stats['saved_round_trips'], stats['hit_ratio']) == (3, 3, 3/6)
+    assert 'secret' not in json.dumps(cache.key('user', 'secret', '260603', 1))
+    # Another process finds the responses in the database.
+    other = ResponseCache(ttl=60, filename=filename)
+    assert other.get(other.key('user', 'secret', '260603', 1), lambda: None) == platform_infos[0].response
+    assert other.stats()['disk_hits'] == 1
+    with pytest.raises(KeyError):
+        other.get(other.key('user', 'secret', '12345', 1), lambda: {}['12345'])
+    assert other.stats()['misses'] == 0
+    cache.close()
+    other.close()
+
 def test_ArgosPlatformInfo_amadeus(load_xml_data):
     api = ArgosPlatformInfoNoDownload(credentials='argos_login.txt')
     info = api.retrieve('27011', number_of_days_from_now=20)
@@ -117,6 +337,755 @@ def test_ArgosPlatformInfo_260603(load_xml_data):
     info = api.retrieve('260603', number_of_days_from_now=15)
     assert info == load_xml_data['260603']
 
+
+def test_ArgosPlatformInfo_iter_info():
+    api = ArgosPlatformInfoNoDownload()
+    api.retrieve('260603', username='user', password='secret', number_of_days_from_now=15)
+    satellitePasses = api.root.find("program").find("platform").findall("satellitePass")
+    expected = [api._pass_info(sp) for sp in satellitePasses]
+    assert list(api.iter_info(minimum_quality_flag=0)) == expected
+    source = io.BytesIO(api.response.encode('ISO-8859-1'))
+    assert list(api.iter_info(minimum_quality_flag=0, source=source)) == expected
+    info = api.get_info(minimum_quality_flag=CRC)
+    assert info == [i for i in reversed(expected) if i['gps_location_qf'] >= CRC]
+    assert api.get_info(latest_only=True) == info[0]
+
+
+def test_get_info_output():
+    response = argosTesting.synthetic_response('260603', 50, bad_crc_fraction=0.8)
+    api = ArgosPlatformInfo(service=lambda **kwds: response)
+    api.retrieve('260603', username='user', password='secret')
+    expected = api.get_info(minimum_quality_flag=0)
+    assert any(i['argos_location'] for i in expected) and any(not i['argos_location'] for i in expected)
+    records = api.get_info(minimum_quality_flag=0, output="records")
+    assert [r.to_dict() for r in records] == expected
+    assert all(isinstance(r.argos_location.latitude, float) for r in records if r.argos_location)
+    assert records[0].gps_location.date == expected[0]['gps_location']['date']
+    columns = api.get_info(minimum_quality_flag=0, output="columns")
+    assert len(columns) == 50 and columns.to_dicts() == expected
+    assert columns[-1] == records[-1]
+    assert list(columns['gps_location_qf']) == [i['gps_location_qf'] for i in expected]
+    assert api.get_info(latest_only=True, output="columns").to_dicts() == [api.get_info(latest_only=True)]
+    no_fix = dict(argos_location=None, gps_location={}, gps_location_qf=0)
+    assert FixColumns.from_passes([(None, None, 0)], api.decoder).to_dicts() == [no_fix]
+    with pytest.raises(ValueError):
+        api.get_info(output="frame")
+
+def test_get_info_fields():
+    requests = []
+    def service(platformId=None, displayRawData=True, displayLocation=True, **kwds):
+        requests.append((displayRawData, displayLocation))
+        return argosTesting.synthetic_response(platformId, 50, displayRawData=displayRawData,
+                                               displayLocation=displayLocation)
+    api = ArgosPlatformInfo(service=service, payload_cache=PayloadCache(maxsize=0))
+    api.retrieve('260603', username='user', password='secret')
+    full = api.get_info(minimum_quality_flag=0)
+    api.retrieve('260603', username='user', password='secret', fields=('lat', 'lon'))
+    assert requests == [(True, True), (True, False)]
+    info = api.get_info(minimum_quality_flag=0)
+    assert info == [dict(argos_location=None, gps_location=dict((k, i['gps_location'][k]) for k in ('lat', 'lon')),
+                         gps_location_qf=i['gps_location_qf']) for i in full]
+    assert api.get_info(latest_only=True, minimum_quality_flag=0) == info[0]
+    columns = api.get_info(minimum_quality_flag=0, output="columns")
+    assert columns.names == ('lat', 'lon') and columns.to_dicts() == info
+    assert [fix.to_dict() for fix in api.get_info(minimum_quality_flag=0, output="records")] == info
+    response = argosTesting.synthetic_response('260603', 50)
+    assert list(api.iter_info(0, io.StringIO(response), ('lat', 'lon')))[::-1] == info
+    api.retrieve('260603', username='user', password='secret', fields=['argos_location'])
+    assert requests[-1] == (False, True)
+    info = api.get_info(minimum_quality_flag=0)
+    assert [i['argos_location'] for i in info] == [i['argos_location'] for i in full]
+    assert all(i['gps_location'] == {} and i['gps_location_qf'] == 0 for i in info)
+    # A selection given to get_info() applies to the response retrieved.
+    api.retrieve('260603', username='user', password='secret')
+    assert api.get_info(fields=('date', 'crc')) == [
+        dict(argos_location=None, gps_location=dict(crc=i['gps_location']['crc'], date=i['gps_location']['date']),
+             gps_location_qf=i['gps_location_qf']) for i in full if i['gps_location_qf'] >= CRC]
+    with pytest.raises(ValueError):
+        api.get_info(fields=('altitude',))
+    # An empty location does not take the elements following it along.
+    response = re.sub(r"<location>.*?</location>", "<location/>", argosTesting.synthetic_response('260603', 50),
+                      count=1, flags=re.DOTALL)
+    api = ArgosPlatformInfo(service=lambda **kwds: response, payload_cache=PayloadCache(maxsize=0))
+    api.retrieve('260603', username='user', password='secret')
+    assert api.get_info(minimum_quality_flag=0, fields=('lat', 'lon')) == [
+        dict(argos_location=None, gps_location=dict((k, i['gps_location'][k]) for k in ('lat', 'lon')),
+             gps_location_qf=i['gps_location_qf']) for i in full]
+
+def test_get_frame():
+    pytest.importorskip("pyarrow")
+    response = argosTesting.synthetic_response('260603', 50, bad_crc_fraction=0.8)
+    api = ArgosPlatformInfo(service=lambda **kwds: response)
+    api.retrieve('260603', username='user', password='secret')
+    expected = api.get_info(minimum_quality_flag=0)
+    table = api.get_frame(minimum_quality_flag=0, library="arrow")
+    assert table.num_rows == 50
+    assert table.column_names[:4] == ['platformId', 'argos_latitude', 'argos_longitude', 'argos_date']
+    assert table.column_names[-2:] == ['date', 'gps_location_qf']
+    rows = table.to_pylist()
+    assert {r['platformId'] for r in rows} == {'260603'}
+    epoch = datetime.datetime(1970, 1, 1)
+    for row, info in zip(rows, expected):
+        assert row['gps_location_qf'] == info['gps_location_qf']
+        if info['argos_location']:
+            assert row['argos_latitude'] == float(info['argos_location']['latitude'])
+            assert row['argos_date'].isoformat(timespec='milliseconds') + 'Z' == info['argos_location']['date']
+        else:
+            assert row['argos_latitude'] is None and row['argos_date'] is None
+        if info['gps_location']:
+            assert row['lat'] == info['gps_location']['lat'] and row['crc'] == info['gps_location']['crc']
+            assert (row['date'] - epoch).total_seconds() == info['gps_location']['present_time']
+        else:
+            assert row['lat'] is None and row['date'] is None
+    latest = api.get_frame(latest_only=True, fields=('lat', 'lon'), library="arrow")
+    assert latest.num_rows == 1 and latest.column_names == ['platformId', 'argos_latitude', 'argos_longitude',
+                                                            'argos_date', 'lat', 'lon', 'gps_location_qf']
+    with pytest.raises(ValueError):
+        api.get_frame(library="polars")
+    fleet = ArgosFleetClientNoDownload(max_workers=4)
+    fleet.latency = 0
+    table = fleet.retrieve_frame(['27011', '260603', '12345'], username='user', password='secret',
+                                 minimum_quality_flag=0, library="arrow")
+    counts = table.group_by('platformId').aggregate([('gps_location_qf', 'count')]).to_pylist()
+    api = ArgosPlatformInfoNoDownload()
+    for platformId in ['27011', '260603']:
+        api.retrieve(platformId, username='user', password='secret')
+        n = len(api.get_info(minimum_quality_flag=0))
+        assert {'platformId': platformId, 'gps_location_qf_count': n} in counts
+    assert len(counts) == 2
+    # The asyncio fleet client gives the same frame.
+    async_fleet = AsyncArgosFleetClientNoDownload(max_workers=2)
+    async_fleet.latency = 0
+    async_table = asyncio.run(async_fleet.retrieve_frame(['27011', '260603', '12345'], username='user',
+                                                         password='secret', minimum_quality_flag=0, library="arrow"))
+    assert async_table.equals(table)
+
+def test_get_frame_pandas():
+    pytest.importorskip("pandas")
+    api = ArgosPlatformInfoNoDownload()
+    api.retrieve('260603', username='user', password='secret')
+    expected = api.get_info(minimum_quality_flag=0)
+    frame = api.get_frame(minimum_quality_flag=0)
+    assert len(frame) == len(expected)
+    assert str(frame['argos_date'].dtype).startswith('datetime64')
+    assert list(frame['gps_location_qf']) == [i['gps_location_qf'] for i in expected]
+    assert list(frame['platformId'].cat.categories) == ['260603']
+
+def test_ArgosFleetClient_retrieve_many():
+    fleet = ArgosFleetClientNoDownload(max_workers=4)
+    t0 = time.perf_counter()
+    results = fleet.retrieve_many(['27011', '260603', '12345'], username='user', password='secret')
+    elapsed = time.perf_counter() - t0
+    assert elapsed < 2 * fleet.latency
+    assert list(results.keys()) == ['27011', '260603', '12345']
+    api = ArgosPlatformInfoNoDownload()
+    for platformId in ['27011', '260603']:
+        api.retrieve(platformId, username='user', password='secret')
+        assert results[platformId].error is None
+        assert results[platformId].info == api.get_info()
+    assert results['12345'].info is None
+    assert isinstance(results['12345'].error, KeyError)
+
+def test_ArgosFleetClient_retrieve_program():
+    program_info = ArgosProgramInfoNoDownload()
+    program_info.retrieve()
+    fleet = ArgosFleetClientNoDownload()
+    results = fleet.retrieve_program(program_info, '3932', username='user', password='secret')
+    assert list(results.keys()) == ['27011', '30649', '260603']
+    assert results['30649'].error is not None
+    assert results['260603'].error is None
+
+
+def test_async_clients():
+    async def program_service(**kwds):
+        return ArgosProgramInfoNoDownload._service(None, **kwds)
+    async def main():
+        fleet = AsyncArgosFleetClientNoDownload(max_workers=2)
+        t0 = time.perf_counter()
+        results = await fleet.retrieve_many(['27011', '260603', '12345', '260603'], 'user', 'secret',
+                                            latest_only=True)
+        elapsed = time.perf_counter() - t0
+        program_info = argosAsync.AsyncArgosProgramInfo(service=program_service)
+        await program_info.retrieve('user', 'secret')
+        api = fleet.platform_info_factory()
+        info = await api.retrieve_info('260603', 'user', 'secret', minimum_quality_flag=0)
+        return results, elapsed, program_info, info
+    results, elapsed, program_info, info = asyncio.run(main())
+    assert list(results) == ['27011', '260603', '12345']
+    assert isinstance(results['12345'].error, KeyError)
+    assert AsyncArgosFleetClientNoDownload.max_in_flight == 2
+    assert elapsed < 3*AsyncArgosFleetClientNoDownload.latency
+    api = ArgosPlatformInfoNoDownload()
+    api.retrieve('260603', username='user', password='secret')
+    assert results['260603'].info == api.get_info(latest_only=True)
+    assert info == api.get_info(minimum_quality_flag=0)
+    assert program_info.get_platforms('3932') == ['27011', '30649', '260603']
+
+def test_async_poll(tmp_path):
+    requested_days = []
+    class AsyncArgosPlatformInfoPolled(argosAsync.AsyncArgosPlatformInfo):
+        async def _service(self, nbDaysFromNow=20, **kwds):
+            requested_days.append(nbDaysFromNow)
+            return ArgosPlatformInfoNoDownload._service(None, nbDaysFromNow=nbDaysFromNow, **kwds)
+        def service_factory(self, wsdl):
+            return self._service
+    async def program_service(**kwds):
+        return ArgosProgramInfoNoDownload._service(None, **kwds)
+    store = ArgosPassStore(str(tmp_path / "passes.db"))
+    api = AsyncArgosPlatformInfoPolled()
+    async def main():
+        new = await api.poll('260603', store, username='user', password='secret')
+        again = await api.poll('260603', store, username='user', password='secret')
+        program_info = argosAsync.AsyncArgosProgramInfo(service=program_service)
+        response = await program_info.fetch('user', 'secret')
+        return new, again, response
+    new, again, response = asyncio.run(main())
+    expected = ArgosPlatformInfoNoDownload()
+    expected.retrieve('260603', username='user', password='secret')
+    assert new == expected.get_info() and again == []
+    assert requested_days == [argosClient.MAX_DAYS_FROM_NOW, 1]
+    assert response == ArgosProgramInfoNoDownload._service(None)
+    pytest.importorskip("pyarrow")
+    frame = asyncio.run(api.get_frame(minimum_quality_flag=0, library="arrow"))
+    assert frame.num_rows == len(expected.get_info(minimum_quality_flag=0))
+
+def test_async_response_cache(tmp_path):
+    cache = ResponseCache(ttl=60, filename=str(tmp_path / "responses.sqlite"))
+    calls = []
+    async def main():
+        fleet = AsyncArgosFleetClientNoDownload(max_workers=4, response_cache=cache)
+        service = fleet.service
+        async def counted(**kwds):
+            calls.append(kwds['platformId'])
+            return await service(**kwds)
+        fleet.service = counted
+        platform_infos = [fleet.platform_info_factory() for i in range(4)]
+        await asyncio.gather(*[api.retrieve('260603', 'user', 'secret') for api in platform_infos])
+        results = await fleet.retrieve_many(['260603', '27011'], 'user', 'secret')
+        return platform_infos, results
+    platform_infos, results = asyncio.run(main())
+    assert calls == ['260603', '27011']
+    assert all(api.response == platform_infos[0].response for api in platform_infos)
+    assert results['260603'].error is None
+    # The synchronous clients share the responses.
+    api = ArgosPlatformInfoNoDownload()
+    api.response_cache, api.service = cache, None
+    api.retrieve('27011', 'user', 'secret')
+    stats = cache.stats()
+    assert (stats['misses'], stats['coalesced'], stats['hits']) == (2, 3, 2)
+    cache.close()
+
+def test_async_resilience():
+    failures = iter([ConnectionResetError()])
+    class AsyncArgosFleetClientFlaky(AsyncArgosFleetClientNoDownload):
+        latency = 0
+        async def _service(self, **kwds):
+            error = next(failures, None)
+            if error is not None:
+                raise error
+            return await super()._service(**kwds)
+    async def program_service(**kwds):
+        return ArgosProgramInfoNoDownload._service(None, **kwds)
+    async def hang(**kwds):
+        await asyncio.sleep(1)
+    resilience = Resilience(deadline=10, retries=2, backoff=0.01)
+    async def main():
+        fleet = AsyncArgosFleetClientFlaky(resilience=resilience)
+        results = await fleet.retrieve_many(['260603', '27011'], 'user', 'secret')
+        program_info = argosAsync.AsyncArgosProgramInfo(service=program_service, resilience=resilience)
+        await program_info.retrieve('user', 'secret')
+        t0 = time.monotonic()
+        with pytest.raises(DeadlineExceeded):
+            await Resilience(deadline=0.1, retries=0).wrap_async(hang, "hang")()
+        return results, program_info, time.monotonic() - t0
+    results, program_info, elapsed = asyncio.run(main())
+    assert all(r.error is None for r in results.values())
+    assert program_info.get_platforms('3932') == ['27011', '30649', '260603']
+    assert elapsed < 0.5
+    stats = resilience.stats()
+    assert (stats['getXml']['successes'], stats['getXml']['retries']) == (2, 1)
+    assert stats['getPlatformList']['successes'] == 1
+    resilience.close()
+    # A trial call of a half-open circuit that is cancelled opens it again.
+    resilience = Resilience(deadline=None, retries=0, failure_threshold=1, reset_timeout=0.05)
+    service = resilience.wrap_async(hang, "hang")
+    service.breaker.record_failure()
+    async def cancel_trial():
+        await asyncio.sleep(0.05)
+        task = asyncio.ensure_future(service())
+        await asyncio.sleep(0.01)
+        assert service.breaker.state == "half-open"
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert service.breaker.state == "open" and not service.breaker.allow()
+        await asyncio.sleep(0.05)
+        assert service.breaker.allow()
+    asyncio.run(cancel_trial())
+
+def test_async_response_cache_many_waiters(tmp_path):
+    # More requests wait for the one in flight than the default executor
+    # has threads, which the request in flight needs itself.
+    async def fetch():
+        await asyncio.to_thread(time.sleep, 0.05)
+        return "response"
+    async def main(cache):
+        requests = [cache.aget(cache.key('user', 'secret', '260603', 1), fetch) for i in range(64)]
+        return await asyncio.wait_for(asyncio.gather(*requests), timeout=10)
+    for filename in [None, str(tmp_path / "responses.sqlite")]:
+        cache = ResponseCache(ttl=60, filename=filename)
+        assert asyncio.run(main(cache)) == ["response"]*64
+        assert (cache.stats()['misses'], cache.stats()['coalesced']) == (1, 63)
+        cache.close()
+
+def test_async_resilience_SoapStandin(tmp_path, monkeypatch):
+    pytest.importorskip("httpx")
+    monkeypatch.setattr(argosClient, "CACHE_PATH", str(tmp_path))
+    response = argosTesting.synthetic_response('260603', 20)
+    faults = iter(["reset", "unavailable"])
+    latencies = iter([0, 0, 0, 2.0])
+    resilience = Resilience(deadline=10, retries=2, backoff=0.01, hedge=True)
+    resilience.breaker('getXml')
+    resilience._stats['getXml'].attempt_latencies.extend([0.05]*50)
+    async def main(wsdl):
+        api = argosAsync.AsyncArgosPlatformInfo(wsdl=wsdl, resilience=resilience)
+        try:
+            # A reset connection and an unavailable service are retried.
+            await api.retrieve('260603', 'user', 'secret')
+            # A slow request is hedged.
+            t0 = time.monotonic()
+            await api.retrieve('260603', 'user', 'secret')
+            elapsed = time.monotonic() - t0
+        finally:
+            await argosAsync.close_async_clients()
+        return api, elapsed
+    with argosTesting.SoapStandin(responses={'260603': response}, latency=lambda: next(latencies, 0),
+                                  faults=lambda operation, parameters: next(faults, None)) as standin:
+        api, elapsed = asyncio.run(main(standin.wsdl_url))
+        assert api.response == response and elapsed < 1.5
+        assert standin.faults_injected == dict(unavailable=1, reset=1, fault=0)
+    stats = resilience.stats('getXml')
+    assert (stats['successes'], stats['retries'], stats['hedged']) == (2, 2, 1)
+    # A server resetting every connection opens the circuit.
+    resilience = Resilience(deadline=10, retries=0, failure_threshold=2)
+    async def refused(wsdl):
+        api = argosAsync.AsyncArgosPlatformInfo(wsdl=wsdl, resilience=resilience)
+        errors = []
+        try:
+            for i in range(3):
+                try:
+                    await api.retrieve('260603', 'user', 'secret')
+                except Exception as e:
+                    errors.append(e)
+        finally:
+            await argosAsync.close_async_clients()
+        return errors
+    with argosTesting.SoapStandin(responses={'260603': response},
+                                  faults=lambda operation, parameters: "reset") as standin:
+        errors = asyncio.run(refused(standin.wsdl_url))
+    assert [type(e) for e in errors][2:] == [CircuitOpenError]
+    assert resilience.stats('getXml')['state'] == "open"
+    resilience.close()
+
+def test_async_SoapStandin(tmp_path, monkeypatch):
+    pytest.importorskip("httpx")
+    monkeypatch.setattr(argosClient, "CACHE_PATH", str(tmp_path))
+    response = argosTesting.synthetic_response('260603', 20)
+    async def main(wsdl):
+        api = argosAsync.AsyncArgosPlatformInfo(wsdl=wsdl)
+        program_info = argosAsync.AsyncArgosProgramInfo(wsdl=wsdl)
+        try:
+            info = await api.retrieve_info('260603', 'user', 'secret', minimum_quality_flag=0)
+            await program_info.retrieve('user', 'secret')
+        finally:
+            await argosAsync.close_async_clients()
+        return api, info, program_info
+    with argosTesting.SoapStandin(responses={'260603': response}) as standin:
+        api, info, program_info = asyncio.run(main(standin.wsdl_url))
+        assert api.response == response
+        assert len(info) == 20
+        assert program_info.get_platforms('3932') == ['260603']
+        assert standin.calls == dict(getXml=1, getPlatformList=1)
+
+def test_ArgosPlatformInfo_poll(tmp_path):
+    requested_days = []
+    class ArgosPlatformInfoPolled(ArgosPlatformInfoNoDownload):
+        def _service(self, nbDaysFromNow=20, **kwds):
+            requested_days.append(nbDaysFromNow)
+            return super()._service(nbDaysFromNow=nbDaysFromNow, **kwds)
+    api = ArgosPlatformInfoPolled()
+    store = ArgosPassStore(str(tmp_path / "passes.db"))
+    new = api.poll('260603', store, username='user', password='secret')
+    assert new == api.get_info()
+    assert store.get_passes('260603', CRC) == new
+    assert api.poll('260603', store, username='user', password='secret') == []
+    assert requested_days == [argosClient.MAX_DAYS_FROM_NOW, 1]
+    store.close()
+    store = ArgosPassStore(str(tmp_path / "passes.db"))
+    assert store.last_poll('260603') is not None
+    assert store.get_passes('27011') == []
+
+def test_ArgosDaemon():
+    fleet = ArgosFleetClientNoDownload()
+    fleet.latency = 0
+    fleet.username, fleet.password = 'user', 'secret'
+    fp = io.StringIO()
+    d = ArgosDaemon(fleet, ['260603', '12345'], JsonLinesSink(fp), interval=0.1, jitter=0.1,
+                    max_concurrency=2, max_backoff=0.2)
+    d.run(duration=1)
+    lines = [json.loads(line) for line in fp.getvalue().splitlines()]
+    expected = ArgosPlatformInfoNoDownload().poll('260603', ArgosPassStore(), username='user', password='secret')
+    assert lines == [dict(platformId='260603', **info) for info in reversed(expected)]
+    assert d.failures['260603'] == 0
+    assert d.failures['12345'] >= 2
+    assert d.number_of_polls > 5
+
+def test_reprocess(tmp_path, monkeypatch):
+    monkeypatch.setattr(argosReprocess, "MERGE_FANIN", 2)
+    api = ArgosPlatformInfoNoDownload()
+    expected = []
+    for i, platformId in enumerate(['27011', '260603', '260603']):
+        response = api._service(platformId=platformId)
+        with open(tmp_path / f"response{i}.xml", 'w', encoding='ISO-8859-1') as fp:
+            fp.write(response)
+        if i < 2:
+            api.retrieve(platformId, username='user', password='secret')
+            expected += [dict(platformId=platformId, **info) for info in api.iter_info()]
+    output = tmp_path / "fixes.jsonl"
+    stats = argosReprocess.reprocess(str(tmp_path / "*.xml"), str(output), max_workers=2, chunksize=1)
+    with open(output) as fp:
+        records = [json.loads(line) for line in fp]
+    keys = [(r['platformId'], r.pop('bestMsgDate')) for r in records]
+    assert keys == sorted(keys)
+    assert records == sorted(expected, key=lambda r: r['platformId'])
+    assert stats['files'] == 3
+    assert stats['records'] == len(expected)
+
+def test_export(tmp_path):
+    response = argosTesting.synthetic_response('260603', 30)
+    api = ArgosPlatformInfo(service=lambda **kwds: response)
+    api.retrieve('260603', username='user', password='secret')
+    info = api.get_info(minimum_quality_flag=0)
+    rows = [argosExport.flatten(i, argosExport.gps_fields(), '260603') for i in info]
+    assert argosExport.export(iter(info), str(tmp_path / "fixes.jsonl"), platformId='260603') == 30
+    with open(tmp_path / "fixes.jsonl") as fp:
+        assert list(argosExport.iter_json_lines(fp)) == [dict(platformId='260603', **i) for i in info]
+    argosExport.export(api.get_info(minimum_quality_flag=0, output="records"), str(tmp_path / "fixes.csv"),
+                       platformId='260603')
+    with open(tmp_path / "fixes.csv", newline='') as fp:
+        csv_rows = list(csv.DictReader(fp))
+    assert [float(r['lat']) for r in csv_rows] == [r['lat'] for r in rows]
+    assert [r['argos_date'] or None for r in csv_rows] == [r['argos_date'] for r in rows]
+    argosExport.export(iter(info), str(tmp_path / "fixes.geojson"), platformId='260603')
+    with open(tmp_path / "fixes.geojson") as fp:
+        features = json.load(fp)['features']
+    assert len(features) == 30 and all(f['properties']['position_source'] == "gps" for f in features)
+    latitude = argosMessage.ddmm_to_degrees(info[0]['gps_location']['lat'])
+    assert features[0]['geometry']['coordinates'][1] == latitude
+    assert abs(latitude - 54) < 1
+    assert math.isnan(argosMessage.ddmm_to_degrees(-0.01))
+    with pytest.raises(ValueError):
+        argosExport.export(iter(info), str(tmp_path / "fixes.xls"))
+
+def test_export_batched(tmp_path):
+    response = argosTesting.synthetic_response('260603', 25)
+    api = ArgosPlatformInfo(service=lambda **kwds: response)
+    api.retrieve('260603', username='user', password='secret')
+    info = api.get_info(minimum_quality_flag=0)
+    rows = [argosExport.flatten(i, argosExport.gps_fields(), '260603') for i in info]
+    pq = pytest.importorskip("pyarrow.parquet")
+    argosExport.export(iter(info), str(tmp_path / "fixes.parquet"), platformId='260603', batch_size=10)
+    table = pq.read_table(tmp_path / "fixes.parquet")
+    assert table.num_rows == 25 and pq.ParquetFile(tmp_path / "fixes.parquet").num_row_groups == 3
+    assert table.to_pylist() == rows
+    netCDF4 = pytest.importorskip("netCDF4")
+    argosExport.export(iter(info), str(tmp_path / "fixes.nc"), platformId='260603', batch_size=10)
+    with netCDF4.Dataset(tmp_path / "fixes.nc") as dataset:
+        assert list(dataset['lat'][:]) == [r['lat'] for r in rows]
+        assert list(dataset['argos_date'][:]) == [r['argos_date'] or "" for r in rows]
+        assert list(dataset['crc'][:]) == [int(r['crc']) for r in rows]
+
+def test_ArgosArchive(tmp_path):
+    full = argosTesting.synthetic_response('260603', 40)
+    pieces = re.split(r"(<satellitePass>.*?</satellitePass>)", full)
+    head, passes, tail = pieces[0], pieces[1:-1:2], pieces[-1]
+    # The first response holds satellite pass 20 before its last message was received.
+    incomplete = re.sub(r"<message>(?!.*<message>).*?</message>", "", passes[20])
+    responses = [head + "".join(passes[:20] + [incomplete] + passes[21:30]) + tail,
+                 head + "".join(passes[10:]) + tail]
+    archive = ArgosArchive(str(tmp_path / "archive.sqlite"), compression="gzip")
+    for response in responses:
+        api = ArgosPlatformInfo(service=lambda **kwds: response, archive=archive)
+        api.retrieve('260603', username='user', password='secret', number_of_days_from_now=3)
+    listed = archive.responses('260603')
+    assert [r[3] for r in listed] == [3, 3]
+    assert [archive.get_response(r[0]) for r in listed] == responses
+    stats = archive.stats()
+    assert stats['passes'] == 40 and stats['stored_bytes'] < stats['chunk_bytes'] < stats['response_bytes']
+    assert [p for _, _, p in archive.iter_passes('260603')] == passes
+    # A response archived late, but retrieved earlier, does not replace satellite passes.
+    archive.add_response(responses[0], '260603', retrieved=listed[0][2] - 1)
+    assert [p for _, _, p in archive.iter_passes('260603')] == passes
+    dates = [d for _, d, _ in archive.iter_passes()]
+    assert [d for _, d, _ in archive.iter_passes(start=dates[5], end=dates[8])] == dates[5:8]
+    api = ArgosPlatformInfo(service=lambda **kwds: full)
+    api.retrieve('260603', username='user', password='secret')
+    replayed = list(archive.replay_info('260603', minimum_quality_flag=0))
+    assert [r.pop('platformId') for r in replayed] == ['260603']*40
+    assert [r.pop('bestMsgDate') for r in replayed] == dates
+    assert replayed == list(api.iter_info(minimum_quality_flag=0))
+    archive.close()
+    # Level 0 stores the pieces uncompressed.
+    archive = ArgosArchive(compression="gzip", level=0)
+    archive.add_response(full, '260603')
+    stats = archive.stats()
+    assert stats['stored_bytes'] > stats['chunk_bytes']
+    assert archive.get_response(1) == full
+    archive.close()
+
+def test_FixIndex():
+    index = FixIndex(cell_size=0.05)
+    fixes = []
+    for seed, platformId in enumerate(['260603', '27011']):
+        response = argosTesting.synthetic_response(platformId, 200, seed=seed, start=1.7e9 + 1800*seed)
+        api = ArgosPlatformInfo(service=lambda **kwds: response)
+        api.retrieve(platformId, username='user', password='secret')
+        info = api.get_info(minimum_quality_flag=0)
+        fixes += [(platformId, i) for i in info]
+        # Latest first: fixes arrive out of order.
+        assert index.add_many(info, platformId) == 200
+    assert len(index) == 400 and index.platforms() == ['260603', '27011']
+    located = [(platformId, index.locate(i), i) for platformId, i in fixes]
+    t0, t1 = 1.7e9 + 3600*20, 1.7e9 + 3600*50
+    expected = sorted([(l[0], i) for p, l, i in located if p == '27011' and t0 <= l[0] < t1], key=lambda x: x[0])
+    assert index.between('27011', t0, t1) == [i for t, i in expected]
+    assert index.between('27011', argosMessage.format_date(t0), None)[0] is expected[0][1]
+    assert index.latest('260603') is fixes[0][1]
+    assert index.between('12345') == [] and index.latest('12345') is None
+    lat_min, lat_max, lon_min, lon_max = 54.0, 54.1, 6.9, 7.05
+    inside = lambda l: lat_min <= l[1] <= lat_max and lon_min <= l[2] <= lon_max and t0 <= l[0] < t1
+    expected = sorted([(p, l[0], id(i)) for p, l, i in located if inside(l)])
+    found = index.within(lat_min, lat_max, lon_min, lon_max, t0, t1)
+    assert 0 < len(found) < 60
+    assert [(p, index.locate(i)[0], id(i)) for p, i in found] == expected
+    assert index.platforms_within(lat_min, lat_max, lon_min, lon_max, t0, t1) == sorted(set(p for p, _, _ in expected))
+    assert index.within(lat_min, lat_max, 179, -179) == []
+    # The time of a payload of low quality, or left out by a selection of
+    # fields, is not used; the date of the Argos location is.
+    argos_location = dict(latitude='54.0', longitude='7.0', date='2024-01-01T00:00:00.000Z')
+    corrupt = dict(argos_location=argos_location, gps_location=dict(present_time=-1e9, lat=5401.0, lon=701.0),
+                   gps_location_qf=1)
+    assert index.locate(corrupt) == (to_seconds(argos_location['date']), 54.0, 7.0)
+    projected = dict(argos_location=argos_location, gps_location=dict(lat=5430.0, lon=730.0), gps_location_qf=3)
+    assert index.locate(projected) == (to_seconds(argos_location['date']), 54.5, 7.5)
+    # Used as the sink of a daemon, the index is filled and queried by several threads.
+    shared = FixIndex(cell_size=0.05)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        added = [executor.submit(shared, platformId, i) for platformId, i in fixes]
+        queried = [executor.submit(shared.between, '27011', t0, t1) for k in range(20)]
+        [f.result() for f in added + queried]
+    assert len(shared) == 400 and shared.between('27011', t0, t1) == index.between('27011', t0, t1)
+
+def test_trajectory():
+    codec = argosCodec.compile_profile(argosCodec.get_profile())
+    columns = FixColumns(np.zeros(6, dtype=FixColumns.dtype(codec)), codec)
+    columns['present_time'][:] = 1.7e9 + 3600*np.array([5, 4, 3, 2, 1, 0]) # latest first, as get_info()
+    columns['lat'][:] = [5406.0, 5404.0, 5500.0, 5402.0, 5401.0, 5400.0]   # a spike at 3 hours
+    columns['lon'][:] = [700.0, 700.0, 700.0, 700.0, 700.0, 700.0]
+    columns['U'][:] = [0.1, 0.1, 0.1, 0.1, 3.0, 0.1]
+    columns['gps_location_qf'][:] = [3, 1, 3, 3, 3, 3]
+    columns['argos_latitude'][:] = np.nan
+    columns['argos_longitude'][:] = np.nan
+    columns['argos_date'][1] = argosMessage.format_date(1.7e9 + 3600*4) # no position
+    trajectory = argosTrajectory.analyse(columns, '260603')
+    assert list(trajectory['time']) == sorted(columns['present_time'])
+    assert np.isnan(trajectory['latitude'][4]) and list(trajectory['gps']) == [True]*4 + [False, True]
+    assert trajectory['distance'][1] == pytest.approx(1852, rel=0.01)
+    assert trajectory['speed'][1] == pytest.approx(1852/3600, rel=0.01)
+    assert trajectory['bearing'][1] == pytest.approx(0, abs=1e-6)
+    assert trajectory['time_step'][5] == 7200 and trajectory['time_since_fix'][4] == 3600
+    assert list(trajectory['spike']) == [False, False, False, True, False, False]
+    assert list(trajectory['current_outlier']) == [False, True] + [False]*4
+    statistics = trajectory.current_statistics()['260603']
+    assert statistics['n'] == 4 and statistics['mean_U'] == pytest.approx(0.1)
+    fleet = ArgosFleetClientNoDownload()
+    fleet.latency = 0
+    results = fleet.retrieve_many(['27011', '12345'], username='user', password='secret', output="columns")
+    assert isinstance(results['27011'].info, FixColumns)
+    assert argosTrajectory.analyse_fleet(results).platform_ids == ['27011']
+    # A fleet is processed at once, with the same result per platform.
+    results = dict()
+    for seed, platformId in enumerate(['260603', '27011', '30649']):
+        response = argosTesting.synthetic_response(platformId, 100, seed=seed)
+        api = ArgosPlatformInfo(service=lambda **kwds: response)
+        api.retrieve(platformId, username='user', password='secret')
+        results[platformId] = api.get_info(minimum_quality_flag=0, output="columns")
+    trajectory = argosTrajectory.analyse_fleet(results)
+    assert trajectory.platform_ids == ['260603', '27011', '30649'] and len(trajectory) == 300
+    for platformId in trajectory.platform_ids:
+        single = argosTrajectory.analyse(results[platformId], platformId).data
+        combined = trajectory.platform(platformId).data
+        assert all(np.array_equal(single[k], combined[k], equal_nan=single[k].dtype.kind == 'f')
+                   for k in single.dtype.names)
+        # The positions and speeds are those computed fix by fix.
+        gps = sorted((f.gps_location for f in results[platformId] if f.gps_location_qf >= CRC),
+                     key=lambda r: r.present_time)
+        assert list(combined['latitude'][combined['gps']]) == [argosMessage.ddmm_to_degrees(r.lat) for r in gps]
+        t, lat, lon = [combined[k][~np.isnan(combined['latitude'])] for k in ('time', 'latitude', 'longitude')]
+        speeds = [argosTrajectory.distance(lat[i-1], lon[i-1], lat[i], lon[i])/(t[i] - t[i-1])
+                  for i in range(1, len(t))]
+        assert np.allclose(combined['speed'][~np.isnan(combined['latitude'])][1:], speeds)
+
+def test_SoapStandin(tmp_path, monkeypatch):
+    monkeypatch.setattr(argosClient, "CACHE_PATH", str(tmp_path))
+    response = argosTesting.synthetic_response('260603', 20)
+    with argosTesting.SoapStandin(responses={'260603': response}) as standin:
+        api = ArgosPlatformInfo(wsdl=standin.wsdl_url)
+        api.retrieve('260603', username='user', password='secret')
+        assert api.response == response
+        assert len(api.get_info(minimum_quality_flag=0)) == 20
+        program_info = ArgosProgramInfo(wsdl=standin.wsdl_url)
+        program_info.retrieve('user', 'secret')
+        assert program_info.get_platforms('3932') == ['260603']
+        with pytest.raises(Exception):
+            api.retrieve('12345', username='user', password='secret')
+        assert standin.calls == dict(getXml=2, getPlatformList=1)
+    argosClient.clear_client_cache()
+
+def test_resilience(tmp_path, monkeypatch):
+    monkeypatch.setattr(argosClient, "CACHE_PATH", str(tmp_path))
+    response = argosTesting.synthetic_response('260603', 20)
+    faults = iter(["reset", "unavailable"])
+    metrics = MetricsRecorder()
+    resilience = Resilience(deadline=10, retries=2, backoff=0.01, metrics=metrics)
+    with argosTesting.SoapStandin(responses={'260603': response},
+                                  faults=lambda operation, parameters: next(faults, None)) as standin:
+        api = ArgosPlatformInfo(wsdl=standin.wsdl_url, resilience=resilience)
+        api.retrieve('260603', username='user', password='secret')
+        assert api.response == response
+        assert standin.faults_injected == dict(unavailable=1, reset=1, fault=0)
+        with pytest.raises(Exception) as e:
+            api.retrieve('12345', username='user', password='secret')
+        assert not isinstance(e.value, (CircuitOpenError, DeadlineExceeded))
+        assert standin.calls == dict(getXml=2, getPlatformList=0)
+    stats = resilience.stats('getXml')
+    assert (stats['calls'], stats['successes'], stats['failures'], stats['retries']) == (2, 1, 1, 2)
+    assert stats['state'] == "closed" and stats['p50'] > 0
+    assert metrics.counters['resilience.retries'] == 2
+    argosClient.clear_client_cache()
+    # A slow request is hedged, and the duplicate answers first.
+    latencies = iter([2.0])
+    resilience = Resilience(deadline=10, hedge=True)
+    resilience.breaker('getXml')
+    resilience._stats['getXml'].attempt_latencies.extend([0.01]*50)
+    with argosTesting.SoapStandin(responses={'260603': response},
+                                  latency=lambda: next(latencies, 0)) as standin:
+        api = ArgosPlatformInfo(wsdl=standin.wsdl_url, resilience=resilience)
+        t0 = time.monotonic()
+        api.retrieve('260603', username='user', password='secret')
+        assert time.monotonic() - t0 < 1.5
+        assert api.response == response
+    stats = resilience.stats('getXml')
+    assert stats['hedged'] == stats['hedge_wins'] == 1
+    argosClient.clear_client_cache()
+    # Deadlines and the circuit breaker
+    def hang(**kwds):
+        time.sleep(0.5)
+    def refuse(**kwds):
+        raise ConnectionRefusedError()
+    resilience = Resilience(deadline=0.1, retries=0, failure_threshold=2, reset_timeout=0.2)
+    with pytest.raises(DeadlineExceeded):
+        resilience.wrap(hang, "hang")()
+    service = resilience.wrap(refuse, "refuse")
+    for i in range(2):
+        with pytest.raises(ConnectionRefusedError):
+            service()
+    with pytest.raises(CircuitOpenError):
+        service()
+    assert resilience.stats('refuse')['state'] == "open"
+    time.sleep(0.2)
+    service.service = lambda **kwds: "ok"
+    assert service() == "ok"
+    assert resilience.stats('refuse')['state'] == "closed"
+    assert resilience.stats('refuse')['rejected'] == 1
+    resilience.close()
+
+def test_profile(tmp_path, capsys):
+    result = argosProfile.profile(number_of_passes=20, repeat=2, top=3)
+    assert result['parameters']['passes'] == 20
+    assert set(result['stages']) == set(argosProfile.STAGES)
+    assert result['stages']['get_info']['median'] >= result['stages']['get_info']['min'] > 0
+    assert result['memory']['tracemalloc_peak'] > 0 and 0 < len(result['top_allocators']) <= 3
+    filename = str(tmp_path / "profile.json")
+    assert argosProfile.store_results(result, "base", filename) == "base"
+    slower = json.loads(json.dumps(result))
+    slower['stages']['get_info']['median'] += 1.
+    slower['stages']['retrieve']['median'] *= 2
+    argosProfile.store_results(slower, "slower", filename)
+    assert list(argosProfile.load_results(filename)) == ["base", "slower"]
+    flagged = [name for name, *_, f in argosProfile.compare(result, slower) if f]
+    assert flagged == ['get_info']
+    assert argosCli.main(["profile", "compare", "base", "--results", filename]) == 1
+    assert argosCli.main(["profile", "compare", "slower", "base", "--results", filename]) == 0
+    assert "get_info (ms)" in capsys.readouterr().out
+
+def test_metrics():
+    api = ArgosPlatformInfoNoDownload()
+    expected = (api.retrieve('260603', username='user', password='secret'), api.get_info())[1]
+    api.metrics = metrics = MetricsRecorder()
+    api.retrieve('260603', username='user', password='secret')
+    assert api.get_info() == expected
+    counters = metrics.counters
+    assert counters['platform_info.response_bytes'] == len(api.response)
+    assert counters['platform_info.passes'] == 46
+    assert sum(counters.get(f'platform_info.quality_flag.{i}', 0) for i in range(4)) == 46
+    assert counters['platform_info.messages'] > counters['platform_info.crc_failures'] > 0
+    assert set(metrics.timings) == {'platform_info.soap', 'platform_info.parse',
+                                    'platform_info.select', 'platform_info.decode'}
+    text = metrics.prometheus_text()
+    assert "argos_platform_info_passes_total 46" in text
+    assert "argos_platform_info_parse_seconds_count 46" in text
+    decoded = sum(1 for info in expected if info['gps_location_qf'])
+    assert 0 < decoded < 46
+    assert metrics.timings['platform_info.decode'][0] == decoded
+    # Columns are decoded in one go, all passes selected at once.
+    columns = api.get_info(output="columns")
+    assert metrics.timings['platform_info.decode'][0] == decoded + len(columns)
+    program_info = ArgosProgramInfoNoDownload(metrics=metrics)
+    program_info.retrieve()
+    assert counters['program_info.platforms'] == 3
+
+def test_payload_cache():
+    api = ArgosPlatformInfoNoDownload()
+    api.payload_cache = cache = PayloadCache()
+    api.retrieve('260603', username='user', password='secret')
+    expected = api.get_info(minimum_quality_flag=0)
+    misses = cache.misses
+    assert api.get_info(minimum_quality_flag=0) == expected
+    assert cache.misses == misses and cache.hits > 0
+    expected[0]['gps_location']['lat'] = None
+    assert api.get_info(minimum_quality_flag=0)[0]['gps_location']['lat'] is not None
+    small = PayloadCache(maxsize=2)
+    decoder = ArgosMessageDecoder()
+    for payload in ['66CCE95B01B820FC7C06000501B7C7FC7C510006FFFFFFFFFFFF00000001E5',
+                    '66D30466FFFFFFFFFFFF100005B9F5FC7CC80400FFFFFFFFFFFF000000007E',
+                    '66CCE95B01B820FC7C06000501B7C7FC7C510006FFFFFFFFFFFF00000001E5']:
+        assert small.decode(decoder, payload) == decoder.parseHex(payload)
+    assert len(small) == 2 and small.stats()['misses'] == 2
+
+def test_get_client_is_shared(tmp_path, monkeypatch):
+    monkeypatch.setattr(argosClient, "CACHE_PATH", str(tmp_path))
+    argosClient.clear_client_cache()
+    client = argosClient.get_client(WSDL)
+    assert argosClient.get_client(WSDL) is client
+    assert os.path.exists(tmp_path / "wsdl.sqlite")
+    platform_info = ArgosPlatformInfo(wsdl=WSDL)
+    program_info = ArgosProgramInfo(wsdl=WSDL)
+    assert platform_info.service._proxy._client is client
+    assert program_info.service._proxy._client is client
+    argosClient.clear_client_cache()
+    assert argosClient.get_client(WSDL) is not client
+
     
 if __name__ == "__main__":
     #test_ArgosMessageDecoder_amadeus(load_hexstring_data)